@@ -12,14 +12,6 @@ class UserAchievements(commands.Cog):
         self.bot = bot
         self.pool = pool
 
-    async def cog_load(self):
-        print("🔄 Syncing slash commands for UserAchievements Cog...")
-        try:
-            await self.bot.tree.sync()
-            print("✅ Slash commands synced successfully.")
-        except Exception as e:
-            print(f"❌ Error syncing slash commands: {e}")
-
     @app_commands.command(name="achievements", description="Show your achievements")
     async def achievements(self, interaction: discord.Interaction):
         print(f"🏁 Achievements command invoked by {interaction.user} (ID: {interaction.user.id})")
@@ -1,12 +1,48 @@
 import discord
 from discord import app_commands, Interaction
 from db_user import get_user_finances, upsert_user_finances
+from finance import deposit_to_savings, withdraw_from_savings
+from ledger import ledger, fetch_ledger_page
 from utilities import embed_message, parse_amount
 from defaults import DEFAULT_USER
 from config import COLOR_RED, COLOR_GREEN
-import globals  
+from db_pool import get_pool
 from discord.ext import commands
 
+LEDGER_PAGE_SIZE = 10
+
+
+class LedgerHistoryView(discord.ui.View):
+    """Pages backwards through user_ledger using the last shown id as the cursor."""
+
+    def __init__(self, user_id: int, rows):
+        super().__init__(timeout=120)
+        self.user_id = user_id
+        self.rows = rows
+        self.older_button.disabled = len(rows) < LEDGER_PAGE_SIZE
+
+    async def interaction_check(self, interaction: Interaction) -> bool:
+        return interaction.user.id == self.user_id
+
+    def build_embed(self, display_name: str):
+        if not self.rows:
+            return embed_message("📜 Transaction History", "> No transactions recorded yet.", COLOR_GREEN)
+
+        lines = []
+        for row in self.rows:
+            sign = "+" if row["delta"] >= 0 else "-"
+            when = discord.utils.format_dt(row["created_at"], style="R")
+            lines.append(f"`{sign}${abs(row['delta']):,.2f}` **{row['reason']}** {when} → ${row['balance_after']:,.2f}")
+        return embed_message(f"📜 {display_name}'s Transaction History", "\n".join(lines), COLOR_GREEN)
+
+    @discord.ui.button(label="Older", style=discord.ButtonStyle.secondary)
+    async def older_button(self, interaction: Interaction, button: discord.ui.Button):
+        rows = await fetch_ledger_page(get_pool(), self.user_id, before_id=self.rows[-1]["id"], limit=LEDGER_PAGE_SIZE)
+        if rows:
+            self.rows = rows
+        button.disabled = len(rows) < LEDGER_PAGE_SIZE
+        await interaction.response.edit_message(embed=self.build_embed(interaction.user.display_name), view=self)
+
 
 class Bank(commands.Cog):
     def __init__(self, bot):
@@ -20,7 +56,7 @@ class Bank(commands.Cog):
         print(f"[bank view] Invoked by {user_id} ({interaction.user.display_name})")
 
         # Check if user finances exist
-        user = await get_user_finances(globals.pool, user_id)
+        user = await get_user_finances(get_pool(), user_id)
         print(f"[bank view] Retrieved finances: {user}")
 
         if user is None:
@@ -31,7 +67,7 @@ class Bank(commands.Cog):
                 'debt_balance': 0,
                 'last_paycheck_claimed': None
             }
-            await upsert_user_finances(globals.pool, user_id, user)
+            await upsert_user_finances(get_pool(), user_id, user)
             print("[bank view] Inserted default finances")
 
         checking = user.get('checking_account_balance', 0)
@@ -63,7 +99,7 @@ class Bank(commands.Cog):
             return
 
         user_id = interaction.user.id
-        user = await get_user_finances(globals.pool, user_id)
+        user = await get_user_finances(get_pool(), user_id)
         if user is None:
             user = DEFAULT_USER.copy()
 
@@ -81,16 +117,21 @@ class Bank(commands.Cog):
             )
             return
 
-        user['savings_account_balance'] -= amount_int
-        user['checking_account_balance'] = user.get('checking_account_balance', 0) + amount_int
-        await upsert_user_finances(globals.pool, user_id, user)
+        balances = await withdraw_from_savings(get_pool(), user_id, amount_int, source=__name__)
+        if balances is None:
+            await interaction.response.send_message(
+                embed=embed_message("❌ Invalid Amount", "> Your savings changed before the withdrawal went through. Try again.", COLOR_RED),
+                ephemeral=True
+            )
+            return
+        checking, savings = balances
 
         await interaction.response.send_message(
             embed=embed_message(
                 "✅ Withdrawal Complete",
                 f"> Moved ${amount_int:,} from savings to checking.\n"
-                f"\u200B💰 Checking: ${user['checking_account_balance']:,}\n"
-                f"\u200B🏦 Savings: ${user['savings_account_balance']:,}",
+                f"\u200B💰 Checking: ${checking:,}\n"
+                f"\u200B🏦 Savings: ${savings:,}",
                 COLOR_GREEN
             )
         )
@@ -111,7 +152,7 @@ class Bank(commands.Cog):
             return
 
         user_id = interaction.user.id
-        user = await get_user_finances(globals.pool, user_id)
+        user = await get_user_finances(get_pool(), user_id)
         if user is None:
             user = DEFAULT_USER.copy()
 
@@ -129,20 +170,38 @@ class Bank(commands.Cog):
             )
             return
 
-        user['checking_account_balance'] -= amount_int
-        user['savings_account_balance'] = user.get('savings_account_balance', 0) + amount_int
-        await upsert_user_finances(globals.pool, user_id, user)
+        balances = await deposit_to_savings(get_pool(), user_id, amount_int, source=__name__)
+        if balances is None:
+            await interaction.response.send_message(
+                embed=embed_message("❌ Invalid Amount", "> Your checking balance changed before the deposit went through. Try again.", COLOR_RED),
+                ephemeral=True
+            )
+            return
+        checking, savings = balances
 
         await interaction.response.send_message(
             embed=embed_message(
                 "✅ Deposit Complete",
                 f"> Moved ${amount_int:,} to savings.\n"
-                f"\u200B💰 Checking: ${user['checking_account_balance']:,}\n"
-                f"\u200B🏦 Savings: ${user['savings_account_balance']:,}",
+                f"\u200B💰 Checking: ${checking:,}\n"
+                f"\u200B🏦 Savings: ${savings:,}",
                 COLOR_GREEN
             )
         )
 
+    @bank_group.command(name="history", description="View your recent checking account transactions")
+    async def history(self, interaction: Interaction):
+        user_id = interaction.user.id
+        # Make sure anything still buffered for this user shows up
+        await ledger.flush()
+        rows = await fetch_ledger_page(get_pool(), user_id, limit=LEDGER_PAGE_SIZE)
+        view = LedgerHistoryView(user_id, rows)
+        await interaction.response.send_message(
+            embed=view.build_embed(interaction.user.display_name),
+            view=view if rows else discord.utils.MISSING,
+            ephemeral=True
+        )
+
 async def setup(bot):
     bank_cog = Bank(bot)
     await bot.add_cog(bank_cog)
@@ -1,18 +1,21 @@
 from collections import defaultdict, Counter
-import random
 import traceback
 import asyncio
 import defaults
 import discord
 from discord import app_commands, Interaction
 
-from vehicle_logic import generate_random_plate
 
 
-import globals
+from db_pool import get_pool
 
 from datetime import datetime, timezone, timedelta   
-from db_user import get_user_finances, upsert_user_finances, can_user_own_vehicle
+from db_user import get_user_finances
+from finance import credit
+from ledger import ledger
+from reference_data import catalog
+from vehicle_purchase import purchase_vehicle
+from grocery_logic.grocery_catalog import get_grocery_items
 from utilities import parse_amount, embed_message, normalize
 from shop_items import TransportationShopButtons
 
@@ -56,110 +59,40 @@ class PurchaseVehicleView(discord.ui.View):
  
 async def handle_vehicle_purchase(interaction: discord.Interaction, item: dict, cost: int):
     print(f"[handle_vehicle_purchase] Start purchase attempt: user={interaction.user.id}, item={item}, cost={cost}")
-    pool = globals.pool
+    pool = get_pool()
     try:
         await interaction.response.defer(ephemeral=True)
         user_id = interaction.user.id
 
-        async with pool.acquire() as conn:
-            # 1. Ownership limit check
-            can_buy = await can_user_own_vehicle(user_id, item["vehicle_type_id"], conn)
-            print(f"[handle_vehicle_purchase] Ownership limit check result: can_buy={can_buy}")
-            if not can_buy:
-                await interaction.followup.send(
-                    embed=embed_message(
-                        "🚫 Vehicle Limit Reached",
-                        "> You have reached your vehicle limit! Purchase garage space to store more.",
-                        COLOR_RED
-                    ),
-                    ephemeral=True
-                )
-                return
-
-            # 2. Check finances
-            finances = await get_user_finances(pool, user_id)
-            if finances is None:
-                finances = {
-                    "checking_account_balance": 0,
-                    "savings_account_balance": 0,
-                    "debt_balance": 0,
-                    "last_paycheck_claimed": datetime.fromtimestamp(0, tz=timezone.utc)
-                }
-            checking = finances.get("checking_account_balance", 0)
-            print(f"[handle_vehicle_purchase] Current checking balance: {checking}")
-            if checking < cost:
-                print(f"[handle_vehicle_purchase] Insufficient funds: need {cost}, have {checking}")
-                await interaction.followup.send(
-                    embed=embed_message(
-                        "❌ Insufficient Funds",
-                        f"> You need ${cost:,} but only have ${checking:,} in checking.",
-                        COLOR_RED
-                    ),
-                    ephemeral=True
-                )
-                return
+        # Limit check, debit, insert and last_used_vehicle all happen in one statement
+        purchase = await purchase_vehicle(pool, user_id, item, cost)
+        print(f"[handle_vehicle_purchase] Purchase result: {purchase}")
 
-            # Deduct cost
-            finances["checking_account_balance"] -= cost
-            await upsert_user_finances(pool, user_id, finances)
-
-            # 3. Prepare vehicle info (your existing logic)
-            if item["type"] == "Beater Car":
-                condition = "4"
-                travel_count = random.randint(151, 195)
-                resale_percent = 0.3
-            else:
-                condition = "1"
-                travel_count = 0
-                resale_percent = 0.85
-
-            print(f"[handle_vehicle_purchase] Inserting vehicle with condition '{condition}', travel_count '{travel_count}', resale_percent {resale_percent}")
-
-            # 4. Get random color and plate number
-            color_row = await conn.fetchrow("SELECT description FROM cd_vehicle_colors ORDER BY random() LIMIT 1")
-            color = color_row["description"] if color_row else "Unknown"
-            if item["type"] == "Bike":
-                funny_suffixes = ["ZOOM", "WHOAH", "SPOKEME", "TIRED-LOL", "RIDEME", "SLOWAF", "WHEEE", "B-ROKE", "RDHOG", "2POOR4CAR"]
-                plate_number = random.choice(funny_suffixes)
-            else:
-                plate_number = generate_random_plate()
-
-            condition_int = int(condition)
-
-            condition_desc_row = await conn.fetchrow(
-                "SELECT description FROM cd_vehicle_condition WHERE condition_id = $1",
-                condition_int
-            )
-            condition_desc = condition_desc_row["description"] if condition_desc_row else "Unknown"
-
-            appearance_row = await conn.fetchrow("""
-                SELECT description
-                FROM cd_vehicle_appearance
-                WHERE vehicle_type_id = $1 AND condition_id = $2
-                ORDER BY random()
-                LIMIT 1
-            """, item["vehicle_type_id"], condition_int)
-
-            appearance_description = appearance_row["description"] if appearance_row else "No description available"
-
-            # 5. Insert new vehicle and get vehicle_id
-            insert_query = """
-                INSERT INTO user_vehicle_inventory (
-                    user_id, vehicle_type_id, color, appearance_description, plate_number, condition, travel_count, created_at, resale_percent
-                )
-                VALUES ($1, $2, $3, $4, $5, $6, $7, NOW(), $8)
-                RETURNING id
-            """
-            vehicle_id = await conn.fetchval(
-                insert_query,
-                user_id, item["vehicle_type_id"], color, appearance_description, plate_number, condition_desc, travel_count, resale_percent
+        if purchase["status"] == "limit":
+            await interaction.followup.send(
+                embed=embed_message(
+                    "🚫 Vehicle Limit Reached",
+                    "> You have reached your vehicle limit! Purchase garage space to store more.",
+                    COLOR_RED
+                ),
+                ephemeral=True
             )
+            return
 
-            # 6. Update user's last_used_vehicle
-            await conn.execute(
-                "UPDATE users SET last_used_vehicle = $1 WHERE user_id = $2",
-                vehicle_id, user_id
+        if purchase["status"] == "funds":
+            await interaction.followup.send(
+                embed=embed_message(
+                    "❌ Insufficient Funds",
+                    f"> You need ${cost:,} but only have ${purchase['balance']:,} in checking.",
+                    COLOR_RED
+                ),
+                ephemeral=True
             )
+            return
+
+        color = purchase["color"]
+        appearance_description = purchase["appearance_description"]
+        new_balance = purchase["balance"]
 
         await interaction.followup.send(
             embed=embed_message(
@@ -167,7 +100,7 @@ async def handle_vehicle_purchase(interaction: discord.Interaction, item: dict,
                 f"You bought a **{item['type']}** for ${cost:,}.\n"
                 f"🎨 Color: {color}\n"
                 f"📝 Description: {appearance_description}\n"
-                f"💰 Remaining Checking Balance: ${finances['checking_account_balance']:,}",
+                f"💰 Remaining Checking Balance: ${new_balance:,}",
                 COLOR_GREEN
             ),
             ephemeral=True
@@ -199,10 +132,8 @@ def register_commands(tree: app_commands.CommandTree):
     ])
     async def shop(interaction: Interaction, category: app_commands.Choice[str]):
         await interaction.response.defer(ephemeral=True)
-        from globals import pool
         if category.value == "transportation":
-            async with pool.acquire() as conn:
-                vehicles = await conn.fetch("SELECT id, emoji, name, cost FROM cd_vehicle_type ORDER BY cost")
+            vehicles = sorted(catalog.rows("cd_vehicle_type"), key=lambda v: v["cost"])
 
             if not vehicles:
                 await interaction.followup.send("No vehicles available in the shop right now.", ephemeral=True)
@@ -219,8 +150,7 @@ def register_commands(tree: app_commands.CommandTree):
             await interaction.followup.send(embed=embed, view=view, ephemeral=True)
 
         elif category.value == "groceries":
-            async with pool.acquire() as conn:
-                groceries = await conn.fetch("SELECT id, emoji, name, cost FROM cd_grocery_type ORDER BY name")
+            groceries = get_grocery_items()
 
             if not groceries:
                 await interaction.followup.send("No grocery items available right now.", ephemeral=True)
@@ -239,13 +169,7 @@ def register_commands(tree: app_commands.CommandTree):
 
     @tree.command(name="needfunds", description=f"Claim your guberment cheese (${PAYCHECK_AMOUNT:,}) every 24h")
     async def needfunds(interaction: Interaction):
-        from globals import pool
-        if pool is None:
-            await interaction.response.send_message(
-                "Database is not ready yet. Please try again in a moment.",
-                ephemeral=True
-            )
-            return
+        pool = get_pool()
 
         user_id = interaction.user.id
         now = datetime.now(timezone.utc)
@@ -288,13 +212,18 @@ def register_commands(tree: app_commands.CommandTree):
         else:
             payout = PAYCHECK_AMOUNT
 
-        finances['checking_account_balance'] += payout
-        finances['last_paycheck_claimed'] = now
-        await upsert_user_finances(pool, user_id, finances)
+        async with pool.acquire() as conn:
+            async with conn.transaction():
+                new_balance = await credit(conn, user_id, payout, reason="paycheck", source=__name__, record=False)
+                await conn.execute(
+                    "UPDATE user_finances SET last_paycheck_claimed = $1 WHERE user_id = $2",
+                    now, user_id
+                )
+        ledger.record(user_id, payout, new_balance, "paycheck", __name__)
 
         await interaction.response.send_message(embed=embed_message(
             "💵 Paycheck Claimed",
-            f"> You got ${payout:,}!\n💰 New Balance: ${finances['checking_account_balance']:,}",
+            f"> You got ${payout:,}!\n💰 New Balance: ${new_balance:,}",
             COLOR_GREEN
         ), ephemeral=True)
 
@@ -308,7 +237,7 @@ def register_commands(tree: app_commands.CommandTree):
         app_commands.Choice(name="Groceries", value="groceries")
     ])
     async def stash(interaction: discord.Interaction, category: app_commands.Choice[str]):
-        from globals import pool
+        pool = get_pool()
         await interaction.response.defer()
 
         try:
@@ -323,7 +252,7 @@ def register_commands(tree: app_commands.CommandTree):
                 async with pool.acquire() as conn:
                     vehicles = await conn.fetch("""
                         SELECT
-                            uvi.id, uvi.color, uvi.appearance_description, uvi.condition,
+                            uvi.id, uvi.vehicle_type_id, uvi.color, uvi.appearance_description, uvi.condition,
                             uvi.travel_count, uvi.created_at, uvi.resale_percent,
                             cvt.name AS type, uvi.plate_number, cvt.emoji
                         FROM user_vehicle_inventory uvi
@@ -1,93 +1,18 @@
 import discord
 from discord.ext import commands
 import datetime
-import random
-import globals  # your global DB pool
-
-
-# Helper functions you already have (keep these as is)
-def c_to_f(c):
-    return c * 9 / 5 + 32
-
-def get_temp_range(month, weather_type):
-    if month in [12,1,2]:  # Winter
-        base_min, base_max = -10, 5
-    elif month in [3,4,5]:  # Spring
-        base_min, base_max = 5, 15
-    elif month in [6,7,8]:  # Summer
-        base_min, base_max = 15, 30
-    elif month in [9,10,11]:  # Fall
-        base_min, base_max = 5, 20
-    else:
-        base_min, base_max = 0, 20
-
-    if weather_type == "Sunny":
-        base_min += 5
-        base_max += 7
-    elif weather_type == "Cloudy":
-        base_min -= 2
-        base_max -= 1
-    elif weather_type == "Rain":
-        base_min -= 3
-        base_max -= 3
-    elif weather_type == "Snow":
-        base_min -= 8
-        base_max -= 5
-    elif weather_type == "Clear Night":
-        base_min -= 5
-        base_max -= 5
-
-    return base_min, base_max
-
-def get_weather_for_date(date: datetime.date):
-    month = date.month
-    base_weathers = ["Sunny", "Cloudy", "Rain"]
-    if month in [11, 12, 1, 2]:
-        base_weathers.append("Snow")
-    night_weather_desc = "Clear Night"
-    night_weather_emoji = "🌙"
-
-    seed = int(date.strftime("%Y%m%d"))
-    rnd = random.Random(seed)
-
-    def pick_weather():
-        w = rnd.choice(base_weathers)
-        emoji_map = {
-            "Sunny": "☀️",
-            "Cloudy": "⛅",
-            "Rain": "🌧️",
-            "Snow": "❄️"
-        }
-        base_min, base_max = get_temp_range(month, w)
-        temp_c = rnd.uniform(base_min, base_max)
-        temp_f = c_to_f(temp_c)
-        return (w, emoji_map[w], round(temp_c,1), round(temp_f,1))
-
-    morning = pick_weather()
-    afternoon = pick_weather()
-
-    night_base_min, night_base_max = get_temp_range(month, night_weather_desc)
-    night_temp_c = (night_base_min + night_base_max) / 2 - 2
-    night_temp_f = c_to_f(night_temp_c)
-    night = (night_weather_desc, night_weather_emoji, round(night_temp_c,1), round(night_temp_f,1))
-
-    return morning, afternoon, night
-
-def get_mock_weather_dynamic(now=None):
-    if now is None:
-        now = datetime.datetime.utcnow()
-
-    morning, afternoon, night = get_weather_for_date(now.date())
-
-    hour = now.hour
-    if 0 <= hour < 6:
-        return night
-    elif 6 <= hour < 12:
-        return morning
-    elif 12 <= hour < 18:
-        return afternoon
-    else:
-        return night
+from db_pool import get_pool
+from shift_log import shifts_on
+from weather import get_mock_weather_dynamic
+
+VEHICLE_IN_USE_SQL = """
+    SELECT vt.name AS vehicle_name, uvi.color, uvi.plate_number
+    FROM user_vehicle_inventory uvi
+    JOIN cd_vehicle_type vt ON vt.id = uvi.vehicle_type_id
+    WHERE uvi.user_id = $1 AND uvi.vehicle_status = 'in use'
+    LIMIT 1
+"""
+
 
 async def get_user_checking_account_balance(user_id):
     query = """
@@ -95,7 +20,7 @@ async def get_user_checking_account_balance(user_id):
     FROM user_finances
     WHERE user_id = $1
     """
-    pool = globals.pool
+    pool = get_pool()
     async with pool.acquire() as connection:
         result = await connection.fetchrow(query, user_id)
     if result and result['checking_account_balance'] is not None:
@@ -115,7 +40,7 @@ async def register_commands(bot: discord.Client):
         weather_desc, weather_emoji, temp_c, temp_f = get_mock_weather_dynamic(now_utc)
         checking_account_balance = await get_user_checking_account_balance(interaction.user.id)
 
-        pool = globals.pool
+        pool = get_pool()
         async with pool.acquire() as conn:
             # Get occupation and shift info
             user_job = await conn.fetchrow('''
@@ -133,13 +58,7 @@ async def register_commands(bot: discord.Client):
                 required_shifts = user_job['required_shifts_per_day'] or 0
                 occupation_name = user_job['job_title'] or "Unknown"
 
-                shifts_worked = await conn.fetchval('''
-                    SELECT COUNT(*)
-                    FROM user_work_log
-                    WHERE user_id = $1
-                    AND work_timestamp >= date_trunc('day', NOW() AT TIME ZONE 'UTC')
-                ''', interaction.user.id)
-                shifts_worked = shifts_worked or 0
+                shifts_worked = await shifts_on(conn, interaction.user.id)
 
             # ✅ Current Location
             location_name = await conn.fetchval('''
@@ -151,13 +70,7 @@ async def register_commands(bot: discord.Client):
             location_name = location_name or "Unknown"
 
             # ✅ Current Vehicle
-            vehicle_result = await conn.fetchrow('''
-                SELECT vt.name AS vehicle_name, uvi.color, uvi.plate_number
-                FROM user_vehicle_inventory uvi
-                JOIN cd_vehicle_type vt ON vt.id = uvi.vehicle_type_id
-                WHERE uvi.user_id = $1 AND uvi.vehicle_status = 'in use'
-                LIMIT 1
-            ''', interaction.user.id)
+            vehicle_result = await conn.fetchrow(VEHICLE_IN_USE_SQL, interaction.user.id)
 
             if vehicle_result:
                 vehicle_str = f"{vehicle_result['color']} {vehicle_result['vehicle_name']} (Plate: `{vehicle_result['plate_number']}`)"
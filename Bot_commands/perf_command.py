@@ -0,0 +1,82 @@
+from discord import app_commands, Interaction
+
+import metrics
+from perf import set_tag
+
+PERF_TOP_SITES = 12
+
+
+class TaggedCommandTree(app_commands.CommandTree):
+    async def interaction_check(self, interaction: Interaction) -> bool:
+        # Runs in the same task as the command callback, so every query the
+        # command makes is recorded under its name (see perf.py)
+        if interaction.command is not None:
+            set_tag(interaction.command.qualified_name)
+        return True
+
+
+def _ms(seconds: float) -> str:
+    return f"{seconds * 1000:.1f}"
+
+
+def _table(title: str, header: str, rows: list[str]) -> str:
+    if not rows:
+        return f"{title}\n  (no data yet)\n"
+    return f"{title}\n{header}\n" + "\n".join(rows) + "\n"
+
+
+def build_perf_report(tag: str | None = None) -> str:
+    queries = [(labels, hist) for labels, hist in metrics.histograms("db_query_seconds")
+               if tag is None or labels["tag"] == tag]
+    queries.sort(key=lambda item: item[1].total, reverse=True)
+    query_rows = [
+        f"{labels['tag'][:12]:12} {labels['site'][-34:]:34} {hist.count:>7} {_ms(hist.total / hist.count):>7} "
+        f"{_ms(hist.quantile(0.99)):>7} {_ms(hist.total):>9}"
+        for labels, hist in queries[:PERF_TOP_SITES]
+    ]
+
+    def per_tag(name):
+        rows = []
+        for labels, hist in sorted(metrics.histograms(name), key=lambda item: item[1].total, reverse=True):
+            if tag is not None and labels["tag"] != tag:
+                continue
+            rows.append(
+                f"{labels['tag'][:20]:20} {hist.count:>7} {_ms(hist.quantile(0.5)):>7} "
+                f"{_ms(hist.quantile(0.99)):>7} {_ms(hist.max):>8}"
+            )
+        return rows
+
+    in_use = int(metrics.get("db_pool_in_use"))
+    size = int(metrics.get("db_pool_size"))
+    report = f"Pool: {in_use}/{size} connections in use\n\n"
+    report += _table(
+        "Queries by call site (ms, p99 is a bucket bound)",
+        f"{'tag':12} {'site':34} {'calls':>7} {'avg':>7} {'p99':>7} {'total':>9}",
+        query_rows,
+    )
+    report += "\n" + _table(
+        "Waiting for a connection (ms)",
+        f"{'tag':20} {'count':>7} {'p50':>7} {'p99':>7} {'max':>8}",
+        per_tag("db_pool_acquire_wait_seconds"),
+    )
+    report += "\n" + _table(
+        "Holding a connection (ms)",
+        f"{'tag':20} {'count':>7} {'p50':>7} {'p99':>7} {'max':>8}",
+        per_tag("db_pool_hold_seconds"),
+    )
+    return report
+
+
+def register_commands(tree: app_commands.CommandTree):
+    @tree.command(name="perf", description="Owner only: database time per command and call site")
+    @app_commands.describe(tag="Only show one command (e.g. travel, clockin, market)")
+    async def perf(interaction: Interaction, tag: str | None = None):
+        if not await interaction.client.is_owner(interaction.user):
+            await interaction.response.send_message("This command is for the bot owner.", ephemeral=True)
+            return
+
+        report = build_perf_report(tag)
+        # Discord caps messages at 2000 characters
+        if len(report) > 1980:
+            report = report[:1980].rsplit("\n", 1)[0]
+        await interaction.response.send_message(f"```\n{report}\n```", ephemeral=True)
@@ -4,31 +4,32 @@ import random
 import string
 import discord
 import unicodedata
-import globals
+from db_pool import get_pool
 import datetime
 
 from embeds import COLOR_GREEN, COLOR_RED
 from discord import app_commands, Interaction
 from discord.ext import commands
-from db_user import get_user, upsert_user, get_user_finances, fetch_vehicle_with_pricing, update_last_used_vehicle
+from db_user import get_user, upsert_user, fetch_vehicle_with_pricing, update_last_used_vehicle
 from vehicle_logic import ConfirmSellView, sell_all_vehicles
-from .lifecheck_command import get_mock_weather_dynamic
+from weather import get_mock_weather_dynamic
 from Travel_commands.Repair_options import RepairOptionsView
 from Travel_commands.travel_minigames.dodge_pedestrian import TravelMiniGameView
 
 
-from utilities import (
-    charge_user,
-    update_vehicle_condition_and_description,
-    reward_user
-)
+from finance import credit, debit
+from utilities import update_vehicle_condition_and_description
 from vehicle_logic import get_user_vehicles
+from unit_of_work import for_interaction
+from reference_data import catalog
 from embeds import embed_message, COLOR_GREEN
 from views import select_weighted_travel_outcome, VehicleUseView, TravelButtons
+from travel_service import TRANSIT_FARES, location_name, transit_trip
 
 user_travel_location = {}
 HOME_LOCATION_ID = 3
 
+
 def condition_from_usage(travel_count: int, breakdown_threshold: int = 200) -> str:
     if 0 <= travel_count < 50:
         return "Brand New"
@@ -97,12 +98,7 @@ class LocationTravelView(discord.ui.View):
 def register_commands(tree: app_commands.CommandTree):
     @tree.command(name="travel", description="Travel to a different location")
     async def travel(interaction: Interaction):
-        pool = globals.pool
-        if pool is None:
-            await interaction.response.send_message(
-                "⚠️ The database isn’t ready yet. Try again in a moment.", ephemeral=True
-            )
-            return
+        pool = get_pool()
 
         user_id = interaction.user.id
         user = await get_user(pool, user_id)
@@ -118,14 +114,10 @@ def register_commands(tree: app_commands.CommandTree):
         current_location = user.get("current_location")
         print(f"[DEBUG] current_location (type {type(current_location)}): {current_location}")
 
-        results = await pool.fetch(
-            """
-            SELECT cd_location_id, location_name, location_description
-            FROM cd_locations
-            WHERE active = true AND cd_location_id != $1
-            """,
-            current_location,
-        )
+        results = [
+            loc for loc in catalog.rows("cd_locations")
+            if loc["active"] and loc["cd_location_id"] != current_location
+        ]
 
         print(f"[DEBUG] Found {len(results)} locations available for travel.")
         if not results:
@@ -152,8 +144,9 @@ def register_commands(tree: app_commands.CommandTree):
 
 async def show_vehicle_selection(interaction, user_id, vehicles, method, user_travel_location, previous_location):
     print(f"[DEBUG] show_vehicle_selection called with method={method} and {len(vehicles)} vehicles")
-    pool = globals.pool
-    user = await get_user(pool, user_id)
+    pool = get_pool()
+    uow = for_interaction(interaction)
+    user = await get_user(pool, user_id, uow=uow)
     current_location = user.get("current_location")
     current_vehicle_id = user.get("current_vehicle_id")
 
@@ -179,7 +172,7 @@ async def show_vehicle_selection(interaction, user_id, vehicles, method, user_tr
         filtered_vehicles = [v for v in vehicles if v["id"] == current_vehicle_id]
         restricted = True
 
-    view = await VehicleUseView.create(user_id, filtered_vehicles, method, user_travel_location)
+    view = await VehicleUseView.create(user_id, filtered_vehicles, method, user_travel_location, uow=uow)
 
     description = (
         "> You have multiple vehicles. Please choose one to travel with:"
@@ -201,15 +194,20 @@ async def show_vehicle_selection(interaction, user_id, vehicles, method, user_tr
 
 
 async def handle_travel(interaction: Interaction, method: str, user_travel_location: int):
-    pool = globals.pool
+    pool = get_pool()
     user_id = interaction.user.id
+    uow = for_interaction(interaction)
+
+    if method in TRANSIT_FARES:
+        await handle_transit_travel(interaction, method, user_travel_location, uow)
+        return
 
-    user = await get_user(pool, user_id)
+    user = await get_user(pool, user_id, uow=uow)
     current_location = user.get("current_location")
     current_vehicle_id = user.get("current_vehicle_id")
     previous_location = current_location  
 
-    vehicles = await get_user_vehicles(pool, user_id)
+    vehicles = await get_user_vehicles(pool, user_id, uow=uow)
     working_vehicles = [v for v in vehicles if v.get("condition") != "Broken Down"]
 
     print(f"[DEBUG] Total vehicles: {len(vehicles)}")
@@ -251,7 +249,7 @@ async def handle_travel(interaction: Interaction, method: str, user_travel_locat
             return
 
         if len(cars) == 1:
-            view = await VehicleUseView.create(user_id, cars, "car", user_travel_location)
+            view = await VehicleUseView.create(user_id, cars, "car", user_travel_location, uow=uow)
             msg = await interaction.followup.send("Choose your car for travel:", view=view, ephemeral=True)
             view.message = msg
         else:
@@ -275,7 +273,7 @@ async def handle_travel(interaction: Interaction, method: str, user_travel_locat
             return
 
         if len(bikes) == 1:
-            view = await VehicleUseView.create(user_id, bikes, "bike", user_travel_location)
+            view = await VehicleUseView.create(user_id, bikes, "bike", user_travel_location, uow=uow)
             msg = await interaction.followup.send("Choose your bike for travel:", view=view, ephemeral=True)
             view.message = msg
         else:
@@ -283,91 +281,57 @@ async def handle_travel(interaction: Interaction, method: str, user_travel_locat
             await show_vehicle_selection(interaction, user_id, bikes, method, user_travel_location, previous_location)
         return
 
-    elif method in ['subway', 'bus']:
-        cost = 10 if method == 'subway' else 5
-        finances = await get_user_finances(pool, user_id)
-        print(f"[DEBUG] User finances: {finances.get('checking_account_balance', 0)}")
-        if finances.get("checking_account_balance", 0) < cost:
-            await interaction.followup.send(
-                embed=embed_message(
-                    "❌ Insufficient Funds",
-                    f"> You need ${cost} to travel by {method}, but your balance is ${finances.get('checking_account_balance', 0)}.",
-                    discord.Color.red()
-                ),
-                ephemeral=True
-            )
-            return
-
-        await charge_user(pool, user_id, cost)
-
-        outcome = await select_weighted_travel_outcome(pool, method)
-        updated_finances = await get_user_finances(pool, user_id)
-        updated_balance = updated_finances.get("checking_account_balance", 0)
-
-        old_location_id = user.get("current_location")
-        old_loc = await pool.fetchrow("SELECT location_name FROM cd_locations WHERE cd_location_id = $1", old_location_id)
-        old_location_name = old_loc["location_name"] if old_loc else f"Location {old_location_id}"
-
-        new_loc = await pool.fetchrow("SELECT location_name FROM cd_locations WHERE cd_location_id = $1", user_travel_location)
-        new_location_name = new_loc["location_name"] if new_loc else f"Location {user_travel_location}"
-
-        embed_text = (
-            f"> You traveled from **{old_location_name}** to **{new_location_name}** by **{method.title()}** for ${cost}.\n"
-            f"> Your updated balance is: **${updated_balance:,}**."
-        )
-
-        if outcome:
-            desc = outcome.get("description", "")
-            effect = outcome.get("effect_amount", 0)
-
-            if effect < 0 and updated_balance >= -effect:
-                await charge_user(pool, user_id, -effect)
-                updated_balance -= -effect
-            elif effect > 0:
-                await reward_user(pool, user_id, effect)
-                updated_balance += effect
-
-            embed_text += f"\n\n🎲 Outcome: {desc}\n💰 Balance Impact +/-: ${effect}"
-
-        # Determine vehicle_id_used for car/bike; for subway/bus this is None
-        vehicle_id_used = None
-        if method in ['car', 'bike']:
-            vehicle_id_used = last_used_vehicle or current_vehicle_id
-
-        location_id = user_travel_location if isinstance(user_travel_location, int) else user_travel_location.get("cd_location_id")
-
-        await pool.execute(
-            "UPDATE users SET current_location = $1 WHERE user_id = $2",
-            location_id,
-            user_id
-        )
-
-        user_after_update = await get_user(pool, user_id)
-        print(f"[DEBUG] After UPDATE, current_location in DB: {user_after_update.get('current_location')}")
-
+    else:
         await interaction.followup.send(
             embed=embed_message(
-                f"{'🚇' if method == 'subway' else '🚌'} Travel Summary",
-                embed_text,
-                COLOR_GREEN
+                "❌ Invalid Travel Method",
+                "> Are you hacking us?! How did you select this as a travel option 🤔? Pick one of these: drive, bike, subway, or bus.",
+                discord.Color.red()
             ),
-            ephemeral=False
+            ephemeral=True
         )
-        return
 
-    else:
+
+async def handle_transit_travel(interaction: Interaction, method: str, user_travel_location, uow):
+    # Subway/bus: the whole trip is one statement (see travel_service.py)
+    user_id = interaction.user.id
+    location_id = user_travel_location if isinstance(user_travel_location, int) else user_travel_location.get("cd_location_id")
+    outcome = select_weighted_travel_outcome(method)
+
+    trip = await transit_trip(get_pool(), user_id, method, location_id, outcome)
+    uow.invalidate("user", user_id)
+
+    if not trip["charged"]:
         await interaction.followup.send(
             embed=embed_message(
-                "❌ Invalid Travel Method",
-                "> Are you hacking us?! How did you select this as a travel option 🤔? Pick one of these: drive, bike, subway, or bus.",
+                "❌ Insufficient Funds",
+                f"> You need ${trip['fare']} to travel by {method}, but your balance is ${trip['balance']}.",
                 discord.Color.red()
             ),
             ephemeral=True
         )
+        return
+
+    embed_text = (
+        f"> You traveled from **{trip['old_location_name']}** to **{trip['new_location_name']}** by **{method.title()}** for ${trip['fare']}.\n"
+        f"> Your updated balance is: **${trip['balance'] - trip['applied_effect']:,}**."
+    )
+    if outcome:
+        embed_text += f"\n\n🎲 Outcome: {outcome.get('description', '')}\n💰 Balance Impact +/-: ${outcome.get('effect_amount', 0)}"
+
+    print(f"[DEBUG] Transit trip for {user_id}: {trip}")
+    await interaction.followup.send(
+        embed=embed_message(
+            f"{'🚇' if method == 'subway' else '🚌'} Travel Summary",
+            embed_text,
+            COLOR_GREEN
+        ),
+        ephemeral=False
+    )
 
 
 async def handle_travel_with_vehicle(interaction, vehicle, method, user_travel_location, previous_location, vehicles):
-    pool = globals.pool
+    pool = get_pool()
     user_id = interaction.user.id
 
     if method == "car":
@@ -381,8 +345,8 @@ async def handle_travel_with_vehicle(interaction, vehicle, method, user_travel_l
     else:
         cost = 0  # default cost if needed
 
-    user = await get_user(pool, user_id)
-    finances = await get_user_finances(pool, user_id) 
+    uow = for_interaction(interaction)
+    user = await get_user(pool, user_id, uow=uow)
 
     current_location = user.get("current_location")
     last_used_vehicle = user.get("last_used_vehicle")
@@ -428,11 +392,7 @@ async def handle_travel_with_vehicle(interaction, vehicle, method, user_travel_l
 
     vehicle_location_id = vehicle.get("location_id")
     if vehicle_location_id != current_location:
-        vehicle_loc_row = await pool.fetchrow(
-            "SELECT location_name FROM cd_locations WHERE cd_location_id = $1",
-            vehicle_location_id
-        )
-        vehicle_location_name = vehicle_loc_row["location_name"] if vehicle_loc_row else "an unknown location"
+        vehicle_location_name = location_name(vehicle_location_id, default="an unknown location")
 
         class RetrieveView(discord.ui.View):
             def __init__(self, user_id, vehicle_id, destination_location, vehicle_location_name):
@@ -448,8 +408,8 @@ async def handle_travel_with_vehicle(interaction, vehicle, method, user_travel_l
 
             @discord.ui.button(label="🚚 Retrieve Vehicle ($200)", style=discord.ButtonStyle.red)
             async def retrieve_button(self, interaction: discord.Interaction, button: discord.ui.Button):
-                balance = (await get_user_finances(globals.pool, self.user_id)).get("checking_account_balance", 0)
-                if balance < 200:
+                balance = await debit(get_pool(), self.user_id, 200, require_funds=True, reason="vehicle_retrieval", source=__name__)
+                if balance is None:
                     await interaction.response.send_message(
                         embed=embed_message(
                             "❌ Not Enough Funds",
@@ -462,9 +422,7 @@ async def handle_travel_with_vehicle(interaction, vehicle, method, user_travel_l
                     self.stop()
                     return
 
-                await charge_user(globals.pool, self.user_id, 200)
-
-                await globals.pool.execute(
+                await get_pool().execute(
                     "UPDATE user_vehicle_inventory SET location_id = $1 WHERE id = $2",
                     self.destination_location,
                     self.vehicle_id
@@ -504,6 +462,7 @@ async def handle_travel_with_vehicle(interaction, vehicle, method, user_travel_l
 
         if not getattr(view, "value", False):
             return
+        uow.invalidate("vehicles", user_id)
 
     if current_location == HOME_LOCATION_ID and vehicle.get("location_id") != HOME_LOCATION_ID:
         await interaction.followup.send(
@@ -533,8 +492,8 @@ async def handle_travel_with_vehicle(interaction, vehicle, method, user_travel_l
         elif mini_game_view.passed:
             reward_amount = 1000 * multiplier
             try:
-                await reward_user(pool, user_id, reward_amount)
-                
+                await credit(pool, user_id, reward_amount, reason="minigame_reward", source=__name__)
+
                 # Update the user's location
                 await pool.execute(
                     "UPDATE users SET current_location = $1 WHERE user_id = $2",
@@ -548,9 +507,11 @@ async def handle_travel_with_vehicle(interaction, vehicle, method, user_travel_l
                     user_travel_location,
                     user_id
                 )
+                uow.invalidate("user", user_id)
+                uow.invalidate("vehicles", user_id)
 
             except Exception as e:
-                print(f"[ERROR] reward_user or location update failed: {e}")
+                print(f"[ERROR] credit or location update failed: {e}")
 
             mini_game_view.result_message = (
                 f"You safely navigated all obstacles like a caffeinated squirrel on roller skates and earned **${reward_amount:,.2f}**! 🎉"
@@ -562,12 +523,12 @@ async def handle_travel_with_vehicle(interaction, vehicle, method, user_travel_l
 
 
     # If not car or mini-game not triggered, charge normal cost
-    await charge_user(pool, user_id, cost)
-    current_balance = finances.get("checking_account_balance", 0) - cost
+    # Negative cost (bike) credits the user
+    current_balance = await debit(pool, user_id, cost, reason="travel_fuel", source=__name__) or 0
 
     vehicle_status = "stored" if user_travel_location == 3 else "in use"
 
-    outcome = await select_weighted_travel_outcome(pool, method)
+    outcome = select_weighted_travel_outcome(method)
     outcome_desc = "No special events today."
     effect = 0
 
@@ -576,11 +537,9 @@ async def handle_travel_with_vehicle(interaction, vehicle, method, user_travel_l
         effect = outcome.get("effect_amount", 0)
         outcome_desc = outcome.get("description", "")
         if effect < 0 and current_balance >= -effect:
-            await charge_user(pool, user_id, -effect)
-            current_balance -= -effect
+            current_balance = await debit(pool, user_id, -effect, reason="travel_outcome", source=__name__)
         elif effect > 0:
-            await reward_user(pool, user_id, effect)
-            current_balance += effect
+            current_balance = await credit(pool, user_id, effect, reason="travel_outcome", source=__name__)
 
     async with pool.acquire() as conn:
         updated_vehicle = await conn.fetchrow(
@@ -592,6 +551,7 @@ async def handle_travel_with_vehicle(interaction, vehicle, method, user_travel_l
             """,
             user_id, vehicle.get("plate_number")
         )
+    uow.invalidate("vehicles", user_id)
 
     if updated_vehicle:
         updated_info = await update_vehicle_condition_and_description(
@@ -605,8 +565,8 @@ async def handle_travel_with_vehicle(interaction, vehicle, method, user_travel_l
         )
 
         if updated_info["condition"] == "Broken Down":
-            vehicle_full = await fetch_vehicle_with_pricing(globals.pool, user_id, updated_vehicle["id"])
-            view = RepairOptionsView(globals.pool, vehicle_full, user_id)
+            vehicle_full = await fetch_vehicle_with_pricing(get_pool(), user_id, updated_vehicle["id"])
+            view = RepairOptionsView(get_pool(), vehicle_full, user_id)
 
             msg = await interaction.followup.send(
                 embed=embed_message(
@@ -642,15 +602,13 @@ async def handle_travel_with_vehicle(interaction, vehicle, method, user_travel_l
         location_id,
         user_id
     )
+    uow.invalidate("user", user_id)
 
-    user_after_update = await get_user(pool, user_id)
+    user_after_update = await get_user(pool, user_id, uow=uow)
     print(f"[DEBUG] After UPDATE, current_location in DB: {user_after_update.get('current_location')}")
 
-    old_loc = await pool.fetchrow("SELECT location_name FROM cd_locations WHERE cd_location_id = $1", previous_location)
-    old_location_name = old_loc["location_name"] if old_loc else f"Location {previous_location}"
-
-    new_loc = await pool.fetchrow("SELECT location_name FROM cd_locations WHERE cd_location_id = $1", user_travel_location)
-    new_location_name = new_loc["location_name"] if new_loc else f"Location {user_travel_location}"
+    old_location_name = location_name(previous_location)
+    new_location_name = location_name(user_travel_location)
 
     embed = discord.Embed(
         title=f"{'🚗' if method == 'car' else '🚴'} Travel Summary",
@@ -678,6 +636,8 @@ async def handle_travel_with_vehicle(interaction, vehicle, method, user_travel_l
         vehicle_status_to_set = "stored"
 
     await update_last_used_vehicle(pool, user_id, vehicle["id"], vehicle_status_to_set, vehicle_location_to_set)
+    uow.invalidate("user", user_id)
+    uow.invalidate("vehicles", user_id)
 
     await interaction.followup.send(embed=embed, ephemeral=False)
 
@@ -695,7 +655,7 @@ async def on_sell_all_button_click(interaction: discord.Interaction, user_id, ve
     if confirm_view.value is None:
         await interaction.followup.send("⏳ Sale confirmation timed out.", ephemeral=True)
     elif confirm_view.value:
-        await sell_all_vehicles(interaction, user_id, vehicles)
+        await sell_all_vehicles(interaction, user_id, vehicles, get_pool())
 
 class Travel(commands.Cog):
     def __init__(self, bot):
@@ -1,24 +1,136 @@
-print("✅ DEBUG: Loaded career_path_command.py version 2025-07-06 18:45")
-
 import discord
-print(discord.__version__)
-
 from discord.ext import commands, tasks
+import asyncio
 import datetime
+import importlib
 import random
+import time
 from Bot_occupations.career_path_views import ConfirmResignView
+from finance import credit
+from reference_data import catalog
+import metrics
+from perf import set_tag
+from config import FIRED_DM_CONCURRENCY, WORK_LOG_RETENTION_MONTHS, DB_JOB_STATEMENT_TIMEOUT_MS
+from db_pool import statement_timeout
+from shift_log import record_shift, ensure_history_partitions, drop_expired_history_partitions, utc_today
 
 from embeds import COLOR_GREEN, COLOR_RED
 
-# Added imports for mini-games from occupation_mini_games folder
-from Bot_occupations.occupation_mini_games import whichdidthat
-from Bot_occupations.occupation_mini_games import snake_breakroom
-from Bot_occupations.occupation_mini_games.quickchange import run_quick_math_game
-from Bot_occupations.occupation_mini_games.shared import build_paystub_embed
-from Bot_occupations.occupation_mini_games.late_to_work import sneak_in_late_game
+# Mini-games from the occupation_mini_games folder, imported on first use so loading
+# this cog doesn't pull in every game: key -> (module, function or None for the module's play())
+MINIGAMES = {
+    "quick_math": ("Bot_occupations.occupation_mini_games.quickchange", "run_quick_math_game"),
+    "snake_breakroom": ("Bot_occupations.occupation_mini_games.snake_breakroom", None),
+    "whichdidthat": ("Bot_occupations.occupation_mini_games.whichdidthat", None),
+    "late_to_work": ("Bot_occupations.occupation_mini_games.late_to_work", "sneak_in_late_game"),
+}
+
+MINIGAMES_BY_OCCUPATION = {
+    1: ["quick_math", "snake_breakroom", "whichdidthat"],                   # Professional Cuddler
+    2: ["snake_breakroom", "whichdidthat"],                                 # Senior Bubble Wrap Popper
+    3: ["snake_breakroom", "whichdidthat"],                                 # Street Performer
+    4: ["quick_math", "snake_breakroom", "whichdidthat"],                   # Dog Walker
+    5: ["snake_breakroom", "whichdidthat"],                                 # Human Statue
+    11: ["quick_math", "snake_breakroom", "whichdidthat", "late_to_work"],  # Grocery Store Clerk
+    16: ["quick_math", "snake_breakroom", "whichdidthat", "late_to_work"],  # Ice Cream Truck Driver
+    19: ["late_to_work"],                                                   # Waiter/Waitress
+    61: ["snake_breakroom", "late_to_work"],                                # Animal Control only
+}
+
+
+def load_minigame(key: str):
+    module_name, attr = MINIGAMES[key]
+    module = importlib.import_module(module_name)  # sys.modules makes every call after the first free
+    return getattr(module, attr) if attr else module
+
+
+# Everyone employed who worked fewer than their required shifts yesterday gets a
+# failed day; reaching maxed_amount_failed_shifts fires them, otherwise they are
+# flagged for a warning on their next clock-in. The company name is returned
+# from the pre-update row so the fired DM can still name the old employer.
+DAILY_SHIFT_CHECK_SQL = """
+    WITH shifts_yesterday AS (
+        SELECT user_id, shifts AS shifts_worked
+        FROM user_shift_daily
+        WHERE day = $1
+    ), failed AS (
+        SELECT
+            u.user_id,
+            u.occupation_failed_days + 1 AS new_failed_days,
+            u.occupation_failed_days + 1 >= o.maxed_amount_failed_shifts AS fired,
+            o.company_name
+        FROM users u
+        JOIN cd_occupations o ON u.occupation_id = o.cd_occupation_id
+        LEFT JOIN shifts_yesterday sy ON sy.user_id = u.user_id
+        WHERE u.occupation_needs_warning = FALSE
+          AND u.occupation_failed_days < o.maxed_amount_failed_shifts
+          AND COALESCE(sy.shifts_worked, 0) < o.required_shifts_per_day
+    )
+    UPDATE users u
+    SET occupation_failed_days = f.new_failed_days,
+        occupation_id = CASE WHEN f.fired THEN NULL ELSE u.occupation_id END,
+        occupation_needs_warning = NOT f.fired
+    FROM failed f
+    WHERE u.user_id = f.user_id
+    RETURNING u.user_id, f.fired, f.company_name
+"""
+
+
+# Clock-in runs in three phases so no pool connection is held while the player
+# plays the mini-game; scripts/pool_starvation.py drives these same functions.
+async def start_shift(conn, user_id: int):
+    """
+    Phase 1, one short transaction: lock the user, clear a pending warning and log
+    the shift if they have a job. Returns (shift row or None, needs_warning).
+    """
+    async with conn.transaction():
+        shift = await conn.fetchrow(
+            """
+            SELECT u.occupation_needs_warning,
+                   o.cd_occupation_id, o.description, o.pay_rate, o.required_shifts_per_day, o.company_name
+            FROM users u
+            LEFT JOIN cd_occupations o ON u.occupation_id = o.cd_occupation_id
+            WHERE u.user_id = $1
+            FOR UPDATE OF u
+            """,
+            user_id
+        )
+        needs_warning = bool(shift and shift["occupation_needs_warning"])
+        if needs_warning:
+            await conn.execute(
+                "UPDATE users SET occupation_needs_warning = FALSE WHERE user_id = $1",
+                user_id
+            )
+            print("[clockin] Cleared occupation_needs_warning flag.")
+
+        if shift is None or shift["cd_occupation_id"] is None:
+            return None, needs_warning
 
+        shifts_today = await record_shift(conn, user_id)
+        print(f"[clockin] Shift logged. Shifts today: {shifts_today}")
+        return shift, needs_warning
 
 
+def shift_bonus(mini_game_result: dict):
+    result_type = mini_game_result.get('result', 'neutral')
+
+    # Pull bonus or fallback to penalty/dock if bonus is missing
+    if 'bonus' in mini_game_result:
+        return mini_game_result['bonus']
+    if result_type == 'timeout' and 'penalty' in mini_game_result:
+        return -abs(mini_game_result['penalty'])
+    if result_type in ('wrong', 'negative') and 'dock' in mini_game_result:
+        return -abs(mini_game_result['dock'])
+    return 0
+
+
+async def settle_shift(pool, user_id: int, pay_rate: float, bonus):
+    """Phase 3: pay base + bonus in one statement on a fresh checkout. Returns (total_pay, new_balance)."""
+    total_pay = pay_rate + bonus
+    print(f"[DEBUG] pay_rate: {pay_rate}, total_pay (base + bonus): {total_pay}")
+    new_balance = await credit(pool, user_id, total_pay, reason="shift_pay", source=__name__)
+    return total_pay, new_balance
+
 
 class CareerPath(commands.Cog):
     def __init__(self, bot, db_pool):
@@ -82,8 +194,8 @@ class CareerPath(commands.Cog):
 
         async def setup(self):
             # Fetch user job name from DB to get config
-            async with self.pool.acquire() as conn:
-                user_job = await conn.fetchval("SELECT description FROM cd_occupations WHERE cd_occupation_id = $1", self.user_occupation_id)
+            occupation = catalog.get("cd_occupations", "cd_occupation_id", self.user_occupation_id)
+            user_job = occupation["description"] if occupation else None
             if not user_job:
                 return False
             self.job_key = user_job.lower()
@@ -106,175 +218,94 @@ class CareerPath(commands.Cog):
         print(f"[clockin] Started for user_id: {user_id}")
 
         try:
+            # --- PHASE 1: validate and log the shift (short transaction, connection released before any UI) ---
             async with self.db_pool.acquire() as conn:
-                print("[clockin] Checking occupation_needs_warning...")
-                try:
-                    needs_warning = await conn.fetchval(
-                        "SELECT occupation_needs_warning FROM users WHERE user_id = $1",
-                        user_id
-                    )
-                    print(f"[clockin] occupation_needs_warning: {needs_warning}")
-                except Exception as e:
-                    print(f"[clockin] ERROR fetching occupation_needs_warning: {e}")
-                    raise
-
-                if needs_warning:
-                    print("[clockin] Sending warning message...")
-                    await self._send_warning_message(ctx)
-                    try:
-                        await conn.execute(
-                            "UPDATE users SET occupation_needs_warning = FALSE WHERE user_id = $1",
-                            user_id
-                        )
-                        print("[clockin] Cleared occupation_needs_warning flag.")
-                    except Exception as e:
-                        print(f"[clockin] ERROR clearing occupation_needs_warning: {e}")
-                        raise
-
-                print("[clockin] Fetching occupation info...")
-                occ_query = """
-                    SELECT o.cd_occupation_id, o.description, o.pay_rate, o.required_shifts_per_day, o.company_name
-                    FROM users u
-                    JOIN cd_occupations o ON u.occupation_id = o.cd_occupation_id
-                    WHERE u.user_id = $1
-                    AND u.occupation_id IS NOT NULL;
-                """
-                occupation = await conn.fetchrow(occ_query, user_id)
-                print(f"[clockin] Occupation row: {occupation}")
+                shift, needs_warning = await start_shift(conn, user_id)
 
-                if occupation is None:
-                    msg = "❌ You don't have a job yet. Use `/need_work` to get hired!"
-                    if hasattr(ctx, "interaction") and ctx.interaction is not None:
-                        await ctx.interaction.followup.send(msg)
-                    else:
-                        await ctx.send(msg)
+            if needs_warning:
+                print("[clockin] Sending warning message...")
+                await self._send_warning_message(ctx)
 
-                    return
+            if shift is None:
+                msg = "❌ You don't have a job yet. Use `/need_work` to get hired!"
+                if hasattr(ctx, "interaction") and ctx.interaction is not None:
+                    await ctx.interaction.followup.send(msg)
+                else:
+                    await ctx.send(msg)
 
-                occupation_id = occupation["cd_occupation_id"]
-                occupation_name = occupation["description"]
-                company_name = occupation["company_name"]
-                pay_rate = float(occupation["pay_rate"])
-                required_shifts_per_day = occupation["required_shifts_per_day"]
+                return
 
-                # Insert a new shift log
-                await conn.execute(
-                    "INSERT INTO user_work_log(user_id, work_timestamp) VALUES ($1, NOW())",
-                    user_id
+            occupation_id = shift["cd_occupation_id"]
+            occupation_name = shift["description"]
+            company_name = shift["company_name"]
+            pay_rate = float(shift["pay_rate"])
+            required_shifts_per_day = shift["required_shifts_per_day"]
+
+            # --- PHASE 2: mini-game (no connection held while the user thinks) ---
+            mini_game_keys = MINIGAMES_BY_OCCUPATION.get(occupation_id)
+            if not mini_game_keys:
+                no_minigame_msg = (
+                    f"🧹 You worked a shift as a **{occupation_name}**, "
+                    "but this job doesn't have a mini-game yet. No payout this time!"
                 )
-                print("[clockin] Shift log inserted.")
-
-                # --- MINI-GAME SELECTION ---
-                minigames_by_id = {
-                    1: [run_quick_math_game, snake_breakroom, whichdidthat],  # Professional Cuddler
-                    2: [snake_breakroom, whichdidthat],                      # Senior Bubble Wrap Popper
-                    3: [snake_breakroom, whichdidthat],                      # Street Performer
-                    4: [run_quick_math_game, snake_breakroom, whichdidthat], # Dog Walker
-                    5: [snake_breakroom, whichdidthat],                      # Human Statue
-                    11: [run_quick_math_game, snake_breakroom, whichdidthat, sneak_in_late_game], # Grocery Store Clerk
-                    16: [run_quick_math_game, snake_breakroom, whichdidthat, sneak_in_late_game], # Ice Cream Truck Driver
-                    19: [sneak_in_late_game], # Waiter/Waitress
-                    61: [snake_breakroom, sneak_in_late_game],               # Animal Control only
-                }
+                if hasattr(ctx, "interaction") and ctx.interaction is not None:
+                    await ctx.interaction.followup.send(no_minigame_msg)
+                else:
+                    await ctx.send(no_minigame_msg)
 
-                mini_game_modules = minigames_by_id.get(occupation_id)
-                if not mini_game_modules:
-                    no_minigame_msg = (
-                        f"🧹 You worked a shift as a **{occupation_name}**, "
-                        "but this job doesn't have a mini-game yet. No payout this time!"
-                    )
-                    if hasattr(ctx, "interaction") and ctx.interaction is not None:
-                        await ctx.interaction.followup.send(no_minigame_msg)
-                    else:
-                        await ctx.send(no_minigame_msg)
+                return
 
-                    return
+            minigame_key = random.choice(mini_game_keys)
+            minigame_module = load_minigame(minigame_key)
 
-                minigame_module = random.choice(mini_game_modules)
+            mini_game_result = None
+            message = None  # Track message for editing paystub later
 
-                mini_game_result = None
-                message = None  # Track message for editing paystub later
+            # Existing run_quick_math_game logic
+            if minigame_key == "quick_math":
+                mini_game_result = await minigame_module(ctx.interaction, job_key=occupation_name.lower())
+                message = None
 
-                # Existing run_quick_math_game logic
-                if minigame_module == run_quick_math_game:
-                    mini_game_result = await run_quick_math_game(ctx.interaction, job_key=occupation_name.lower())
-                    message = None
+            # Your new sneak_in_late_game logic
+            elif minigame_key == "late_to_work":
+                mini_game_result = await minigame_module(ctx, user_id, self.db_pool)
+                message = None  # The wrapper sends its own message
 
-                # Your new sneak_in_late_game logic
-                elif minigame_module == sneak_in_late_game:
-                    mini_game_result = await sneak_in_late_game(ctx, user_id, self.db_pool)
-                    message = None  # The wrapper sends its own message
+            # Existing .play() interface for other games
+            else:
+                embed, view = await minigame_module.play(
+                    self.db_pool,
+                    ctx.guild.id,
+                    user_id,
+                    occupation_id,
+                    pay_rate if minigame_key == "snake_breakroom" else None,
+                    None
+                )
+                message = await ctx.send(embed=embed, view=view)
+                await view.wait()
+                mini_game_result = {
+                    "result": getattr(view, "outcome_type", "neutral"),
+                    "bonus": getattr(view, "bonus_amount", 0),
+                    "message": getattr(view, "outcome_summary", None),
+                    "dock": getattr(view, "dock_amount", 0),
+                    "penalty": getattr(view, "penalty_amount", 0),
+                }
 
-                # Existing .play() interface for other games
+            if mini_game_result is None:
+                if hasattr(ctx, "interaction") and ctx.interaction is not None:
+                    await ctx.interaction.followup.send("❌ Mini-game did not complete correctly. Please try again.")
                 else:
-                    embed, view = await minigame_module.play(
-                        self.db_pool,
-                        ctx.guild.id,
-                        user_id,
-                        occupation_id,
-                        pay_rate if minigame_module == snake_breakroom else None,
-                        None
-                    )
-                    message = await ctx.send(embed=embed, view=view)
-                    await view.wait()
-                    mini_game_result = {
-                        "result": getattr(view, "outcome_type", "neutral"),
-                        "bonus": getattr(view, "bonus_amount", 0),
-                        "message": getattr(view, "outcome_summary", None),
-                        "dock": getattr(view, "dock_amount", 0),
-                        "penalty": getattr(view, "penalty_amount", 0),
-                    }
-
-                if mini_game_result is None:
-                    if hasattr(ctx, "interaction") and ctx.interaction is not None:
-                        await ctx.interaction.followup.send("❌ Mini-game did not complete correctly. Please try again.")
-                    else:
-                        await ctx.send("❌ Mini-game did not complete correctly. Please try again.")
-                    return
-                print(f"[DEBUG] mini_game_result raw: {mini_game_result}")
-
-                result_type = mini_game_result.get('result', 'neutral')
-
-                # Pull bonus or fallback to penalty/dock if bonus is missing
-                if 'bonus' in mini_game_result:
-                    bonus = mini_game_result['bonus']
-                elif result_type == 'timeout' and 'penalty' in mini_game_result:
-                    bonus = -abs(mini_game_result['penalty'])
-                elif result_type in ('wrong', 'negative') and 'dock' in mini_game_result:
-                    bonus = -abs(mini_game_result['dock'])
-                else:
-                    bonus = 0
-
-                print(f"[DEBUG] Calculated bonus: {bonus}")
-
-                outcome_summary = mini_game_result.get('message', "No mini-game outcome.")
-                total_pay = pay_rate + bonus
-                print(f"[DEBUG] pay_rate: {pay_rate}, total_pay (base + bonus): {total_pay}")
+                    await ctx.send("❌ Mini-game did not complete correctly. Please try again.")
+                return
+            print(f"[DEBUG] mini_game_result raw: {mini_game_result}")
 
-                # Count shifts today
-                shifts_today = await conn.fetchval(
-                    "SELECT COUNT(*) FROM user_work_log WHERE user_id = $1 AND work_timestamp >= CURRENT_DATE",
-                    user_id
-                )
-                print(f"[clockin] Shifts today: {shifts_today}")
+            bonus = shift_bonus(mini_game_result)
+            print(f"[DEBUG] Calculated bonus: {bonus}")
 
-                # Get new balance to show in embed
-                new_balance = await conn.fetchval(
-                    "SELECT checking_account_balance FROM user_finances WHERE user_id = $1",
-                    user_id
-                )
+            outcome_summary = mini_game_result.get('message', "No mini-game outcome.")
 
-            # Update user balance once here
-            async with self.db_pool.acquire() as conn:
-                await conn.execute(
-                    "UPDATE user_finances SET checking_account_balance = checking_account_balance + $1 WHERE user_id = $2",
-                    total_pay,
-                    user_id
-                )
-                new_balance = await conn.fetchval(
-                    "SELECT checking_account_balance FROM user_finances WHERE user_id = $1",
-                    user_id
-                )
+            # --- PHASE 3: settle pay (single atomic statement on a fresh pool checkout) ---
+            total_pay, new_balance = await settle_shift(self.db_pool, user_id, pay_rate, bonus)
 
             # Build the combined paystub description
             paystub_description = (
@@ -388,64 +419,56 @@ class CareerPath(commands.Cog):
 
     @tasks.loop(time=datetime.time(hour=0, minute=0, tzinfo=datetime.timezone.utc))
     async def daily_shift_check(self):
-        async with self.db_pool.acquire() as conn:
-            query = """
-            WITH shifts_yesterday AS (
-              SELECT user_id, COUNT(*) AS shifts_worked
-              FROM user_work_log
-              WHERE work_timestamp >= CURRENT_DATE - INTERVAL '1 day'
-                AND work_timestamp < CURRENT_DATE
-              GROUP BY user_id
-            )
-            SELECT
-              u.user_id,
-              o.required_shifts_per_day,
-              COALESCE(sy.shifts_worked, 0) AS shifts_worked,
-              u.occupation_failed_days,
-              o.maxed_amount_failed_shifts
-            FROM users u
-            JOIN cd_occupations o ON u.occupation_id = o.occupation_id
-            LEFT JOIN shifts_yesterday sy ON sy.user_id = u.user_id
-            WHERE u.occupation_needs_warning = FALSE
-              AND u.occupation_failed_days < o.maxed_amount_failed_shifts
-              AND COALESCE(sy.shifts_worked, 0) < o.required_shifts_per_day;
-            """
-
-            failed_users = await conn.fetch(query)
-
-            for record in failed_users:
-                user_id = record['user_id']
-                required = record['required_shifts_per_day']
-                worked = record['shifts_worked']
-                failed_days = record['occupation_failed_days']
-                max_failed = record['maxed_amount_failed_shifts']
-
-                new_failed_days = failed_days + 1
-
-                if new_failed_days >= max_failed:
-                    await conn.execute(
-                        "UPDATE users SET occupation_id = NULL, occupation_needs_warning = FALSE, occupation_failed_days = $1 WHERE user_id = $2",
-                        new_failed_days,
-                        user_id
-                    )
-                    await self._send_fired_message(user_id)
-                else:
-                    await conn.execute(
-                        "UPDATE users SET occupation_failed_days = $1, occupation_needs_warning = TRUE WHERE user_id = $2",
-                        new_failed_days,
-                        user_id
-                    )
-
-            await conn.execute(
-                """
-                DELETE FROM user_work_log
-                WHERE work_timestamp < CURRENT_DATE;
-                """
-            )
+        set_tag("daily_shift_check")
+        started = time.perf_counter()
+        try:
+            # Warn or fire everyone who missed yesterday's quota in one statement
+            today = utc_today()
+            # Nightly job: gets the longer job timeout instead of the interactive default
+            async with self.db_pool.acquire() as conn, statement_timeout(conn, DB_JOB_STATEMENT_TIMEOUT_MS):
+                results = await conn.fetch(DAILY_SHIFT_CHECK_SQL, today - datetime.timedelta(days=1))
+
+            # Retention: roll partitions forward/back and trim counters past the window
+            async with self.db_pool.acquire() as conn, statement_timeout(conn, DB_JOB_STATEMENT_TIMEOUT_MS):
+                await ensure_history_partitions(conn)
+                await drop_expired_history_partitions(conn, WORK_LOG_RETENTION_MONTHS)
+                await conn.execute(
+                    "DELETE FROM user_shift_daily WHERE day < $1",
+                    today - datetime.timedelta(days=31 * WORK_LOG_RETENTION_MONTHS)
+                )
+        except Exception as e:
+            metrics.inc("daily_shift_check_errors")
+            print(f"❌ daily_shift_check failed: {e}")
+            return
+
+        fired = [row for row in results if row["fired"]]
+        warned = len(results) - len(fired)
+        db_seconds = time.perf_counter() - started
+        metrics.inc("daily_shift_check_runs")
+        metrics.set_gauge("daily_shift_check_warned", warned)
+        metrics.set_gauge("daily_shift_check_fired", len(fired))
+        metrics.set_gauge("daily_shift_check_db_seconds", round(db_seconds, 3))
+        print(f"🗓️ daily_shift_check: warned {warned}, fired {len(fired)} in {db_seconds:.2f}s")
+
+        await self._notify_fired_users(fired)
+        metrics.set_gauge("daily_shift_check_total_seconds", round(time.perf_counter() - started, 3))
 
     @daily_shift_check.before_loop
     async def before_daily_shift_check(self):
         await self.bot.wait_until_ready()
+        # The bot may have been down across a month boundary; clock-ins need this month's partition
+        async with self.db_pool.acquire() as conn:
+            await ensure_history_partitions(conn)
+
+    async def _notify_fired_users(self, fired):
+        # discord.py already backs off on 429s; the semaphore keeps us from queueing thousands of DMs at once
+        semaphore = asyncio.Semaphore(FIRED_DM_CONCURRENCY)
+
+        async def notify(row):
+            async with semaphore:
+                await self._send_fired_message(row["user_id"], row["company_name"])
+
+        await asyncio.gather(*(notify(row) for row in fired))
 
     async def _get_company_name(self, user_id):
         async with self.db_pool.acquire() as conn:
@@ -453,7 +476,7 @@ class CareerPath(commands.Cog):
                 """
                 SELECT c.company_name
                 FROM users u
-                JOIN cd_occupations c ON u.occupation_id = c.occupation_id
+                JOIN cd_occupations c ON u.occupation_id = c.cd_occupation_id
                 WHERE u.user_id = $1
                 """,
                 user_id
@@ -472,24 +495,26 @@ class CareerPath(commands.Cog):
         )
         await ctx.send(msg)
 
-    async def _send_fired_message(self, user_id):
+    async def _send_fired_message(self, user_id, company_name="Your Company"):
         user = self.bot.get_user(user_id)
         if user is None:
             try:
                 user = await self.bot.fetch_user(user_id)
             except:
+                metrics.inc("fired_dm_failures")
                 return
 
         msg = (
-            f"**Message from {await self._get_company_name(user_id)} HQ 🚨**\n"
+            f"**Message from {company_name} HQ 🚨**\n"
             f"Hey {user.name},\n\n"
             f"You've been fired! The digital pink slip has arrived. "
             f"Thanks for your time with us. Better luck next time! 🎮👋"
         )
         try:
             await user.send(msg)
+            metrics.inc("fired_dm_sent")
         except:
-            pass
+            metrics.inc("fired_dm_failures")
 
 
 async def setup(bot):
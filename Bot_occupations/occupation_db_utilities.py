@@ -1,5 +1,7 @@
 import asyncpg
 
+from reference_data import catalog
+
 async def get_user(pool: asyncpg.pool.Pool, user_id: int):
     async with pool.acquire() as conn:
         return await conn.fetchrow('''
@@ -7,26 +9,21 @@ async def get_user(pool: asyncpg.pool.Pool, user_id: int):
         ''', user_id)
 
 async def get_eligible_occupations(pool: asyncpg.pool.Pool, user_education_level: int):
-    async with pool.acquire() as conn:
-        return await conn.fetch('''
-            SELECT cd_occupation_id, description
-            FROM cd_occupations
-            WHERE active = TRUE AND education_level_id <= $1
-            ORDER BY education_level_id, pay_rate DESC
-        ''', user_education_level)
+    # Served from the catalog cache; `pool` is kept for the existing call sites
+    eligible = [
+        row for row in catalog.rows("cd_occupations")
+        if row["active"] and row["education_level_id"] <= user_education_level
+    ]
+    eligible.sort(key=lambda row: (row["education_level_id"], -row["pay_rate"]))
+    return eligible
 
 async def assign_user_job(pool: asyncpg.pool.Pool, user_id: int, occupation_id: int):
-    async with pool.acquire() as conn:
-        # Validate the occupation exists and is active
-        valid = await conn.fetchval('''
-            SELECT EXISTS(
-                SELECT 1 FROM cd_occupations
-                WHERE cd_occupation_id = $1 AND active = TRUE
-            )
-        ''', occupation_id)
-        if not valid:
-            return False
+    # Validate the occupation exists and is active
+    occupation = catalog.get("cd_occupations", "cd_occupation_id", occupation_id)
+    if not occupation or not occupation["active"]:
+        return False
 
+    async with pool.acquire() as conn:
         await conn.execute('''
             UPDATE users
             SET occupation_id = $1,
@@ -2,7 +2,7 @@ import random
 from discord.ui import View, Button
 import discord
 import asyncio
-from utilities import reward_user, charge_user
+from finance import credit, debit
 
 class SneakInMiniGameView(View):
     def __init__(self, user_id, multiplier=1.0, pool=None):
@@ -57,9 +57,9 @@ class SneakInMiniGameView(View):
             self.passed = True
             reward_amount = 1000 * self.multiplier
             try:
-                await reward_user(self.pool, self.user_id, reward_amount)
+                await credit(self.pool, self.user_id, reward_amount, reason="minigame_reward", source=__name__)
             except Exception as e:
-                print(f"[ERROR] reward_user failed: {e}")
+                print(f"[ERROR] credit failed: {e}")
             self.result_message = f"You quietly slipped into your desk and earned ${reward_amount:,.2f}! 🎉"
             await self._message.edit(embed=self.get_embed(), view=None)
             self.stop()
@@ -110,9 +110,9 @@ class SneakInMiniGameView(View):
             self.failed = True
             penalty_amount = 1000 * self.multiplier
             try:
-                await charge_user(self.pool, self.user_id, penalty_amount)
+                await debit(self.pool, self.user_id, penalty_amount, reason="minigame_penalty", source=__name__)
             except Exception as e:
-                print(f"[ERROR] charge_user failed: {e}")
+                print(f"[ERROR] debit failed: {e}")
 
             pred = self.predicament_data[self.step]
             self.result_message = (
@@ -2,9 +2,56 @@ import discord
 from discord.ui import View, Button
 import random
 
+from finance import credit, debit
+from samplers import AliasSampler
+
+# Another Animal Control officer (occupation 61) in the same guild
+HELPER_LOOKUP_SQL = """
+    SELECT user_id FROM users
+    WHERE occupation_id = 61
+    AND guild_id = $1
+    AND user_id != $2
+    LIMIT 1
+"""
+
 # ------------------------------
 # Regular Snake Breakroom Minigame
 # ------------------------------
+# Each button draws one line from its own pool (uniform weights)
+CALL_ANIMAL_CONTROL_OUTCOMES = AliasSampler.uniform([
+    {"type": "positive", "text": "{helper} arrived just in time and saved the day. You earned a bonus of ${amount}."},
+    {"type": "positive", "text": "With {helper}'s help, the snake was removed safely. You got a bonus of ${amount}!"},
+    {"type": "neutral",  "text": "{helper} responded and handled the snake. No bonus, but no trouble either."},
+    {"type": "neutral",  "text": "You and {helper} watched the snake crawl away. Oddly peaceful. No bonus."},
+    {"type": "negative", "text": "{helper} showed up late to remove the snake, and your boss docked your pay by ${amount}."},
+    {"type": "negative", "text": "{helper} scared the snake into the vents. Chaos ensued. You were fined ${amount}."},
+])
+GRAB_BY_NECK_OUTCOMES = AliasSampler.uniform([
+    {"type": "positive", "text": "You grabbed the snake and danced with it. Somehow this earned you a bonus of ${amount}."},
+    {"type": "positive", "text": "You became a snake whisperer for a moment. Bonus: ${amount}."},
+    {"type": "neutral",  "text": "You missed, but no one saw. Just walk away."},
+    {"type": "neutral",  "text": "You lunged, it slithered. A draw. No pay changes."},
+    {"type": "negative", "text": "The snake bit you. You needed a tetanus shot. Pay docked by ${amount} for medical bills."},
+    {"type": "negative", "text": "HR saw you and thought it was animal cruelty. You were written up and fined ${amount}."},
+])
+PUT_BUCKET_OUTCOMES = AliasSampler.uniform([
+    {"type": "positive", "text": "Genius! The bucket trap worked. Bonus awarded: ${amount}."},
+    {"type": "positive", "text": "You saved the day with a bucket and got ${amount}. The janitor is proud."},
+    {"type": "neutral",  "text": "The bucket fell over. Snake vanished. Nobody knows, nobody cares."},
+    {"type": "neutral",  "text": "You put a bucket over something, but it wasn’t the snake. Oh well."},
+    {"type": "negative", "text": "Snake escaped and your boss blamed you. You’re down ${amount}."},
+    {"type": "negative", "text": "You used the good bucket. The janitor reported you. Pay docked ${amount}."},
+])
+DISTRACT_WITH_SNACKS_OUTCOMES = AliasSampler.uniform([
+    {"type": "positive", "text": "Snake loves chips! You bought time and earned a bonus of ${amount}."},
+    {"type": "positive", "text": "You fed it gummy worms and it fell asleep. ${amount} bonus!"},
+    {"type": "neutral",  "text": "The snake ignored the snacks. At least no one was hurt."},
+    {"type": "neutral",  "text": "You distracted the snake, but now it lives in the vending machine."},
+    {"type": "negative", "text": "Snake choked on snacks and your boss blamed you. Lost ${amount}."},
+    {"type": "negative", "text": "You dropped company snacks. Inventory fine: ${amount}."},
+])
+
+
 class SnakeBreakroomView(View):
     def __init__(self, pool, guild_id, user_id, user_occupation_id, pay_rate):
         super().__init__(timeout=60)
@@ -20,17 +67,7 @@ class SnakeBreakroomView(View):
 
     async def get_helper_name(self, interaction):
         async with self.pool.acquire() as conn:
-            helper = await conn.fetchrow(
-                """
-                SELECT user_id FROM users
-                WHERE occupation_id = 61
-                AND guild_id = $1
-                AND user_id != $2
-                LIMIT 1
-                """,
-                self.guild_id,
-                self.user_id,
-            )
+            helper = await conn.fetchrow(HELPER_LOOKUP_SQL, self.guild_id, self.user_id)
 
         if helper:
             member = interaction.guild.get_member(helper['user_id'])
@@ -48,25 +85,17 @@ class SnakeBreakroomView(View):
 
     async def apply_penalty(self, conn):
         penalty = random.randint(20, 100) * random.randint(1, 3)
-        await conn.execute(
-            "UPDATE user_finances SET checking_account_balance = checking_account_balance - $1 WHERE user_id = $2",
-            penalty,
-            self.user_id,
-        )
+        await debit(conn, self.user_id, penalty, reason="minigame_penalty", source=__name__)
         return penalty
 
     async def apply_bonus(self, conn):
         bonus = random.randint(20, 500) * random.randint(1, 4)
-        await conn.execute(
-            "UPDATE user_finances SET checking_account_balance = checking_account_balance + $1 WHERE user_id = $2",
-            bonus,
-            self.user_id,
-        )
+        await credit(conn, self.user_id, bonus, reason="minigame_reward", source=__name__)
         return bonus
 
     async def handle_outcome(self, interaction: discord.Interaction, outcomes):
         try:
-            choice = random.choices(outcomes, k=1)[0]
+            choice = outcomes.sample()
 
             await interaction.response.defer()  # Always defer early to avoid interaction timeout
 
@@ -101,51 +130,19 @@ class SnakeBreakroomView(View):
 
     @discord.ui.button(label="📱 Call Animal Control", style=discord.ButtonStyle.primary)
     async def call_animal_control(self, interaction: discord.Interaction, button: discord.ui.Button):
-        outcomes = [
-            {"type": "positive", "text": "{helper} arrived just in time and saved the day. You earned a bonus of ${amount}."},
-            {"type": "positive", "text": "With {helper}'s help, the snake was removed safely. You got a bonus of ${amount}!"},
-            {"type": "neutral",  "text": "{helper} responded and handled the snake. No bonus, but no trouble either."},
-            {"type": "neutral",  "text": "You and {helper} watched the snake crawl away. Oddly peaceful. No bonus."},
-            {"type": "negative", "text": "{helper} showed up late to remove the snake, and your boss docked your pay by ${amount}."},
-            {"type": "negative", "text": "{helper} scared the snake into the vents. Chaos ensued. You were fined ${amount}."},
-        ]
-        await self.handle_outcome(interaction, outcomes)
+        await self.handle_outcome(interaction, CALL_ANIMAL_CONTROL_OUTCOMES)
 
     @discord.ui.button(label="🤚 Grab it by the neck", style=discord.ButtonStyle.primary)
     async def grab_by_neck(self, interaction: discord.Interaction, button: discord.ui.Button):
-        outcomes = [
-            {"type": "positive", "text": "You grabbed the snake and danced with it. Somehow this earned you a bonus of ${amount}."},
-            {"type": "positive", "text": "You became a snake whisperer for a moment. Bonus: ${amount}."},
-            {"type": "neutral",  "text": "You missed, but no one saw. Just walk away."},
-            {"type": "neutral",  "text": "You lunged, it slithered. A draw. No pay changes."},
-            {"type": "negative", "text": "The snake bit you. You needed a tetanus shot. Pay docked by ${amount} for medical bills."},
-            {"type": "negative", "text": "HR saw you and thought it was animal cruelty. You were written up and fined ${amount}."},
-        ]
-        await self.handle_outcome(interaction, outcomes)
+        await self.handle_outcome(interaction, GRAB_BY_NECK_OUTCOMES)
 
     @discord.ui.button(label=" 🪣Put a bucket over it", style=discord.ButtonStyle.primary)
     async def put_bucket(self, interaction: discord.Interaction, button: discord.ui.Button):
-        outcomes = [
-            {"type": "positive", "text": "Genius! The bucket trap worked. Bonus awarded: ${amount}."},
-            {"type": "positive", "text": "You saved the day with a bucket and got ${amount}. The janitor is proud."},
-            {"type": "neutral",  "text": "The bucket fell over. Snake vanished. Nobody knows, nobody cares."},
-            {"type": "neutral",  "text": "You put a bucket over something, but it wasn’t the snake. Oh well."},
-            {"type": "negative", "text": "Snake escaped and your boss blamed you. You’re down ${amount}."},
-            {"type": "negative", "text": "You used the good bucket. The janitor reported you. Pay docked ${amount}."},
-        ]
-        await self.handle_outcome(interaction, outcomes)
+        await self.handle_outcome(interaction, PUT_BUCKET_OUTCOMES)
 
     @discord.ui.button(label="🥨 Distract it with snacks", style=discord.ButtonStyle.primary)
     async def distract_with_snacks(self, interaction: discord.Interaction, button: discord.ui.Button):
-        outcomes = [
-            {"type": "positive", "text": "Snake loves chips! You bought time and earned a bonus of ${amount}."},
-            {"type": "positive", "text": "You fed it gummy worms and it fell asleep. ${amount} bonus!"},
-            {"type": "neutral",  "text": "The snake ignored the snacks. At least no one was hurt."},
-            {"type": "neutral",  "text": "You distracted the snake, but now it lives in the vending machine."},
-            {"type": "negative", "text": "Snake choked on snacks and your boss blamed you. Lost ${amount}."},
-            {"type": "negative", "text": "You dropped company snacks. Inventory fine: ${amount}."},
-        ]
-        await self.handle_outcome(interaction, outcomes)
+        await self.handle_outcome(interaction, DISTRACT_WITH_SNACKS_OUTCOMES)
 
 async def play_snake_breakroom(pool, guild_id, user_id, user_occupation_id, pay_rate):
     embed = discord.Embed(
@@ -164,6 +161,40 @@ async def play_snake_breakroom(pool, guild_id, user_id, user_occupation_id, pay_
 # ------------------------------
 # Animal Control Snake Minigame Variant
 # ------------------------------
+SAFE_CAPTURE_OUTCOMES = AliasSampler.uniform([
+    ("positive", "You flawlessly capture the snake. Textbook execution."),
+    ("positive", "You gently relocate the snake to the wild. It winks at you. Weird."),
+    ("neutral", "You hesitated a little, but the snake cooperated. No harm done."),
+    ("neutral", "You used the capture pole slightly incorrectly, but it still worked."),
+    ("negative", "You botch the capture and the snake slithers into the vending machine."),
+    ("negative", "You forgot your gloves and got nipped. You're fine. Your pride isn't."),
+])
+CALM_EMPLOYEE_OUTCOMES = AliasSampler.uniform([
+    ("positive", "You bring calm with a clipboard and confidence. Bonus time."),
+    ("positive", "You distract the employee with a hilarious snake pun. They're fine."),
+    ("neutral", "The employee slowly calms down after you hand them a stress ball."),
+    ("neutral", "You just stand near them until they stop yelling. Effective? Sure."),
+    ("negative", "They scream louder after you mention how venom works. Whoops."),
+    ("negative", "You panic slightly and scream too. The supervisor is disappointed."),
+])
+CALL_BACKUP_OUTCOMES = AliasSampler.uniform([
+    ("positive", "Backup arrives and handles everything perfectly. Like clockwork."),
+    ("positive", "You and backup play rock-paper-scissors for who handles the snake. You win."),
+    ("neutral", "Backup arrives late, but everything still gets sorted."),
+    ("neutral", "The snake just chills while you wait for backup. It’s oddly patient."),
+    ("negative", "Backup trips on arrival and breaks the coffee machine. Yikes."),
+    ("negative", "You accidentally call pest control instead. They run screaming."),
+])
+PAPERWORK_OUTCOMES = AliasSampler.uniform([
+    ("positive", "You handle the backlog while someone else catches the snake. Genius."),
+    ("positive", "Your paperwork is so thorough, you get praised even with a loose snake."),
+    ("neutral", "You stay laser-focused while chaos unfolds around you."),
+    ("neutral", "You pretend to not notice the snake and finish a full report."),
+    ("negative", "Your boss finds out you ignored the snake. Not a great look."),
+    ("negative", "Snake climbs into your paperwork bin. You're startled. A report is ruined."),
+])
+
+
 class AnimalControlSnakeView(View):
     def __init__(self, pool, guild_id, user_id, user_occupation_id, pay_rate):
         super().__init__(timeout=60)
@@ -186,54 +217,22 @@ class AnimalControlSnakeView(View):
 
     @discord.ui.button(label="🪤 Safely capture the snake", style=discord.ButtonStyle.primary)
     async def safe_capture(self, interaction: discord.Interaction, button: discord.ui.Button):
-        outcomes = [
-            ("positive", "You flawlessly capture the snake. Textbook execution."),
-            ("positive", "You gently relocate the snake to the wild. It winks at you. Weird."),
-            ("neutral", "You hesitated a little, but the snake cooperated. No harm done."),
-            ("neutral", "You used the capture pole slightly incorrectly, but it still worked."),
-            ("negative", "You botch the capture and the snake slithers into the vending machine."),
-            ("negative", "You forgot your gloves and got nipped. You're fine. Your pride isn't."),
-        ]
-        await self.resolve(interaction, outcomes)
+        await self.resolve(interaction, SAFE_CAPTURE_OUTCOMES)
 
     @discord.ui.button(label="🧘 Calm the freaked out employee", style=discord.ButtonStyle.primary)
     async def calm_employee(self, interaction: discord.Interaction, button: discord.ui.Button):
-        outcomes = [
-            ("positive", "You bring calm with a clipboard and confidence. Bonus time."),
-            ("positive", "You distract the employee with a hilarious snake pun. They're fine."),
-            ("neutral", "The employee slowly calms down after you hand them a stress ball."),
-            ("neutral", "You just stand near them until they stop yelling. Effective? Sure."),
-            ("negative", "They scream louder after you mention how venom works. Whoops."),
-            ("negative", "You panic slightly and scream too. The supervisor is disappointed."),
-        ]
-        await self.resolve(interaction, outcomes)
+        await self.resolve(interaction, CALM_EMPLOYEE_OUTCOMES)
 
     @discord.ui.button(label="📱 Call for backup", style=discord.ButtonStyle.primary)
     async def call_backup(self, interaction: discord.Interaction, button: discord.ui.Button):
-        outcomes = [
-            ("positive", "Backup arrives and handles everything perfectly. Like clockwork."),
-            ("positive", "You and backup play rock-paper-scissors for who handles the snake. You win."),
-            ("neutral", "Backup arrives late, but everything still gets sorted."),
-            ("neutral", "The snake just chills while you wait for backup. It’s oddly patient."),
-            ("negative", "Backup trips on arrival and breaks the coffee machine. Yikes."),
-            ("negative", "You accidentally call pest control instead. They run screaming."),
-        ]
-        await self.resolve(interaction, outcomes)
+        await self.resolve(interaction, CALL_BACKUP_OUTCOMES)
 
     @discord.ui.button(label="📝 Focus on paperwork", style=discord.ButtonStyle.primary)
     async def paperwork(self, interaction: discord.Interaction, button: discord.ui.Button):
-        outcomes = [
-            ("positive", "You handle the backlog while someone else catches the snake. Genius."),
-            ("positive", "Your paperwork is so thorough, you get praised even with a loose snake."),
-            ("neutral", "You stay laser-focused while chaos unfolds around you."),
-            ("neutral", "You pretend to not notice the snake and finish a full report."),
-            ("negative", "Your boss finds out you ignored the snake. Not a great look."),
-            ("negative", "Snake climbs into your paperwork bin. You're startled. A report is ruined."),
-        ]
-        await self.resolve(interaction, outcomes)
+        await self.resolve(interaction, PAPERWORK_OUTCOMES)
 
     async def resolve(self, interaction, outcome_pool):
-        category, message = random.choice(outcome_pool)
+        category, message = outcome_pool.sample()
         bonus = penalty = 0
 
         if category == "positive":
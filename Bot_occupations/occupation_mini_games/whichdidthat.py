@@ -1,6 +1,9 @@
 import random
 import discord
 
+from reference_data import catalog
+from samplers import AliasSampler
+
 generic_roast_lines = [
     "How do you mess up *that* badly?",
     "The dogs are judging you. And they’re right.",
@@ -202,6 +205,18 @@ MINIGAME_CONFIGS = {
     },
 }
 
+# Outcome lines per job, built once at import
+OUTCOME_LINES = {
+    job_key: {
+        kind: AliasSampler.uniform(config[kind])
+        for kind in ("positive_outcomes", "neutral_outcomes", "negative_outcomes")
+    }
+    for job_key, config in MINIGAME_CONFIGS.items()
+}
+
+# A wrong guess is let off lightly a third of the time
+WRONG_GUESS_TYPES = AliasSampler.from_mapping({"neutral": 0.33, "negative": 0.67})
+
 
 def get_roast_line(job_name: str) -> str:
     job_lines = JOB_ROASTS.get(job_name.lower())
@@ -260,20 +275,22 @@ class WhichDidThatButton(discord.ui.Button):
         def random_multiplier(low, high):
             return round(random.uniform(low, high), 2)
 
+        lines = OUTCOME_LINES[self.parent_view.job_key]
+
         # Decide outcome
         if self.parent_view.choice == culprit:
-            outcome_text = random.choice(config["positive_outcomes"]).replace("{choice}", culprit)
+            outcome_text = lines["positive_outcomes"].sample().replace("{choice}", culprit)
             multiplier = random_multiplier(1.5, 9.3)
             bonus = round(55 * multiplier, 2)  # positive payout
             outcome_type = "positive"
         else:
-            if random.random() < 0.33:
-                outcome_text = random.choice(config["neutral_outcomes"]).replace("{choice}", culprit)
+            if WRONG_GUESS_TYPES.sample() == "neutral":
+                outcome_text = lines["neutral_outcomes"].sample().replace("{choice}", culprit)
                 multiplier = random_multiplier(1.3, 1.9)
                 bonus = round(20 * multiplier, 2)  # neutral payout
                 outcome_type = "neutral"
             else:
-                outcome_text = random.choice(config["negative_outcomes"]).replace("{choice}", culprit)
+                outcome_text = lines["negative_outcomes"].sample().replace("{choice}", culprit)
                 roast = get_roast_line(self.parent_view.job_key)
                 outcome_text += f" {roast}"
                 multiplier = random_multiplier(1.5, 9.3)
@@ -296,8 +313,8 @@ class WhichDidThatButton(discord.ui.Button):
 
 async def play(pool, guild_id, user_id, user_occupation_id, pay_rate, extra=None):
     # Fetch the user's job name from DB
-    async with pool.acquire() as conn:
-        user_job = await conn.fetchval("SELECT description FROM cd_occupations WHERE cd_occupation_id = $1", user_occupation_id)
+    occupation = catalog.get("cd_occupations", "cd_occupation_id", user_occupation_id)
+    user_job = occupation["description"] if occupation else None
 
     if not user_job:
         embed = discord.Embed(
@@ -3,6 +3,7 @@ from discord.ext import commands
 import discord
 
 from Bot_occupations.occupation_db_utilities import get_user, get_eligible_occupations
+from reference_data import catalog
 from Bot_occupations.occupations_views import JobSelectView  # Make sure this file exists and is correct!
 
 class ApplyJob(commands.Cog):
@@ -69,10 +70,7 @@ class JobStatus(commands.Cog):
                 await ctx.send("You currently have no job.")
                 return
 
-            occupation = await conn.fetchrow('''
-                SELECT description, pay_rate, required_shifts_per_day
-                FROM cd_occupations WHERE cd_occupation_id = $1
-            ''', user['occupation_id'])
+            occupation = catalog.get("cd_occupations", "cd_occupation_id", user['occupation_id'])
 
             embed = discord.Embed(title="Current Job Info", color=discord.Color.blue())
             embed.add_field(name="Job Title", value=occupation['description'], inline=False)
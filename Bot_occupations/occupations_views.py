@@ -4,6 +4,7 @@ import traceback
 
 from embeds import COLOR_GREEN, COLOR_RED
 from Bot_occupations.occupation_db_utilities import assign_user_job
+from reference_data import catalog
 
 class OfferConfirmationView(View):
     def __init__(self, pool, user_id, occupation):
@@ -72,14 +73,9 @@ class JobSelect(Select):
             print(f"[DEBUG] User {interaction.user.id} selected job {selected_id}")
 
             # Fetch occupation details
-            async with self.pool.acquire() as conn:
-                occupation = await conn.fetchrow('''
-                    SELECT cd_occupation_id, company_name, description, pay_rate, required_shifts_per_day
-                    FROM cd_occupations
-                    WHERE cd_occupation_id = $1 AND active = TRUE
-                ''', selected_id)
+            occupation = catalog.get("cd_occupations", "cd_occupation_id", selected_id)
 
-            if not occupation:
+            if not occupation or not occupation["active"]:
                 await interaction.response.send_message("⚠️ Selected occupation not found or inactive.", ephemeral=True)
                 return
 
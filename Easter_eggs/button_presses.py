@@ -0,0 +1,203 @@
+# button_presses.py
+# In-memory press counter for the secret button.
+#
+# The first press a user makes after startup loads their row once; after that
+# cooldowns are checked and presses counted in memory, and the accumulated
+# counts are written for all users with one unnest() upsert every
+# SECRET_BUTTON_FLUSH_INTERVAL_SECONDS. The press that reaches PRESS_GOAL is
+# flushed immediately with REWARD_SQL, which grants the achievement with
+# ON CONFLICT DO NOTHING and pays only if that insert happened, so the reward
+# is exactly-once even across restarts. Assumes one bot process owns the button.
+# main.py starts `presses` next to the ledger and stops it (final flush) on shutdown.
+
+import asyncio
+import datetime
+
+import metrics
+from config import SECRET_BUTTON_FLUSH_INTERVAL_SECONDS
+from ledger import ledger
+from perf import set_tag
+
+COOLDOWN_SECONDS = 3600
+REWARD_AMOUNT = 500_000
+PRESS_GOAL = 1000
+ACHIEVEMENT_ID = 1  # The achievement id in your cd_user_achievements table
+
+LOAD_SQL = """
+    SELECT
+        b.times_pressed,
+        b.last_used,
+        EXISTS (
+            SELECT 1 FROM user_achievements WHERE user_id = $1 AND achievement_id = $2
+        ) AS rewarded
+    FROM (SELECT 1) one
+    LEFT JOIN user_secret_button b ON b.user_id = $1
+"""
+
+FLUSH_SQL = """
+    INSERT INTO user_secret_button (user_id, times_pressed, last_used)
+    SELECT * FROM unnest($1::bigint[], $2::int[], $3::timestamp[])
+    ON CONFLICT (user_id) DO UPDATE SET
+        times_pressed = COALESCE(user_secret_button.times_pressed, 0) + EXCLUDED.times_pressed,
+        last_used = GREATEST(user_secret_button.last_used, EXCLUDED.last_used)
+"""
+
+# $1 user_id, $2 presses to add, $3 last_used, $4 achievement id, $5 guild id, $6 reward, $7 goal
+REWARD_SQL = """
+    WITH pressed AS (
+        INSERT INTO user_secret_button (user_id, times_pressed, last_used)
+        VALUES ($1, $2, $3)
+        ON CONFLICT (user_id) DO UPDATE SET
+            times_pressed = COALESCE(user_secret_button.times_pressed, 0) + EXCLUDED.times_pressed,
+            last_used = GREATEST(user_secret_button.last_used, EXCLUDED.last_used)
+        RETURNING times_pressed
+    ), unlocked AS (
+        INSERT INTO user_achievements (
+            user_id, achievement_id, achievement_name, achievement_description,
+            achievement_emoji, date_unlocked, guild_id
+        )
+        SELECT $1, cua.cd_achievement_id, cua.achievement_name, cua.achievement_description,
+               cua.achievement_emoji, CURRENT_DATE, $5
+        FROM cd_user_achievements cua, pressed
+        WHERE cua.cd_achievement_id = $4 AND pressed.times_pressed >= $7
+        ON CONFLICT (user_id, achievement_id) DO NOTHING
+        RETURNING achievement_id
+    ), paid AS (
+        INSERT INTO user_finances (user_id, checking_account_balance)
+        SELECT $1, $6 FROM unlocked
+        ON CONFLICT (user_id) DO UPDATE SET
+            checking_account_balance = user_finances.checking_account_balance + EXCLUDED.checking_account_balance
+        RETURNING checking_account_balance
+    )
+    SELECT
+        (SELECT times_pressed FROM pressed) AS times_pressed,
+        (SELECT checking_account_balance FROM paid) AS new_balance
+"""
+
+
+class UserPresses:
+    __slots__ = ("times_pressed", "pending", "last_used", "rewarded")
+
+    def __init__(self, times_pressed: int, last_used, rewarded: bool):
+        self.times_pressed = times_pressed  # includes pending
+        self.pending = 0
+        self.last_used = last_used
+        self.rewarded = rewarded
+
+
+class PressCounter:
+    def __init__(self, cooldown_seconds: int, goal: int, achievement_id: int, reward: int, flush_interval_seconds: int):
+        self.cooldown = datetime.timedelta(seconds=cooldown_seconds)
+        self.goal = goal
+        self.achievement_id = achievement_id
+        self.reward = reward
+        self.flush_interval = flush_interval_seconds
+        self.pool = None
+        self._users: dict[int, UserPresses] = {}
+        self._flush_lock = asyncio.Lock()
+        self._task = None
+
+    def start(self, pool):
+        self.pool = pool
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    async def _load(self, user_id: int) -> UserPresses:
+        state = self._users.get(user_id)
+        if state is not None:
+            return state
+        row = await self.pool.fetchrow(LOAD_SQL, user_id, self.achievement_id)
+        # Another press may have loaded the user while we were waiting
+        state = self._users.get(user_id)
+        if state is None:
+            state = self._users[user_id] = UserPresses(row["times_pressed"] or 0, row["last_used"], row["rewarded"])
+        return state
+
+    async def press(self, user_id: int, guild_id: int) -> dict:
+        """
+        Count one press. Returns {"status": "cooldown", "remaining": seconds},
+        {"status": "rewarded", "times_pressed", "balance"} for the press that earns
+        the reward, or {"status": "pressed", "times_pressed"}.
+        """
+        state = await self._load(user_id)
+        now = datetime.datetime.utcnow()
+
+        # No awaits from here until the counts change, so two quick presses can't both pass
+        if state.last_used and now - state.last_used < self.cooldown:
+            return {"status": "cooldown", "remaining": (self.cooldown - (now - state.last_used)).total_seconds()}
+
+        state.times_pressed += 1
+        state.pending += 1
+        state.last_used = now
+        metrics.inc("secret_button_presses")
+
+        if state.rewarded or state.times_pressed < self.goal:
+            return {"status": "pressed", "times_pressed": state.times_pressed}
+
+        # Goal reached: write this user's presses and settle the reward before answering
+        pending, state.pending = state.pending, 0
+        try:
+            row = await self.pool.fetchrow(
+                REWARD_SQL,
+                user_id, pending, now, self.achievement_id, guild_id, self.reward, self.goal
+            )
+        except Exception:
+            state.pending += pending
+            raise
+
+        state.rewarded = True
+        state.times_pressed = row["times_pressed"] + state.pending
+        if row["new_balance"] is None:
+            # Already had the achievement (or its catalog row is missing): nothing to pay
+            return {"status": "pressed", "times_pressed": state.times_pressed}
+
+        ledger.record(user_id, self.reward, row["new_balance"], "secret_button_reward", __name__)
+        metrics.inc("secret_button_rewards")
+        return {"status": "rewarded", "times_pressed": state.times_pressed, "balance": row["new_balance"]}
+
+    async def flush(self):
+        async with self._flush_lock:
+            if self.pool is None:
+                return 0
+            batch = [(user_id, state) for user_id, state in self._users.items() if state.pending]
+            if not batch:
+                return 0
+
+            counts = [state.pending for _, state in batch]
+            for _, state in batch:
+                state.pending = 0
+            try:
+                await self.pool.execute(
+                    FLUSH_SQL,
+                    [user_id for user_id, _ in batch],
+                    counts,
+                    [state.last_used for _, state in batch],
+                )
+            except Exception as e:
+                print(f"❌ Secret button flush of {len(batch)} users failed, will retry: {e}")
+                metrics.inc("secret_button_flush_errors")
+                for (_, state), count in zip(batch, counts):
+                    state.pending += count
+                return 0
+
+            metrics.inc("secret_button_rows_written", len(batch))
+            return len(batch)
+
+    async def _run(self):
+        set_tag("secret_button_flush")
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+
+presses = PressCounter(COOLDOWN_SECONDS, PRESS_GOAL, ACHIEVEMENT_ID, REWARD_AMOUNT, SECRET_BUTTON_FLUSH_INTERVAL_SECONDS)
@@ -3,9 +3,9 @@ from discord.ui import View, Button
 import random
 
 from embeds import embed_message, COLOR_RED, COLOR_GREEN
-from utilities import charge_user, update_vehicle_condition_and_description, reward_user
+from finance import credit, debit, transfer
+from utilities import update_vehicle_condition_and_description
 from vehicle_logic import remove_vehicle_by_id
-from db_user import get_user_finances
 
 def get_random_travel_count(vehicle_type_id: int) -> int | None:
     if vehicle_type_id == 1:
@@ -66,36 +66,49 @@ class RepairOptionsView(View):
         try:
             # Base total repair cost
             cost = int(50 * random.uniform(1.5, 5.5))
-            finances = await get_user_finances(self.pool, self.user_id)
 
-            if finances.get("checking_account_balance", 0) < cost:
-                embed = discord.Embed(
-                    description=f"🚫 You need ${cost:,} to pay the mechanic but don't have enough funds.",
-                    color=COLOR_RED
+            # Repair logic
+            new_travel_count = get_random_travel_count(self.vehicle["vehicle_type_id"])
+            if new_travel_count is None:
+                await interaction.response.send_message(
+                    "❌ This vehicle type cannot be repaired by mechanic.", ephemeral=False
                 )
-                await interaction.response.send_message(embed=embed, ephemeral=False)
                 return
+            new_breakdown_threshold = random.randint(200, 299)
 
-            # Check if the user is a mechanic
+            # Check if the user is a mechanic, or find another mechanic to pay
             async with self.pool.acquire() as conn:
                 user_record = await conn.fetchrow("SELECT occupation_id FROM users WHERE user_id = $1", self.user_id)
+                is_self_mechanic = user_record and user_record["occupation_id"] == 62
 
-            is_self_mechanic = user_record and user_record["occupation_id"] == 62
+                mechanic_record = None
+                if not is_self_mechanic:
+                    mechanic_record = await conn.fetchrow(
+                        "SELECT user_id FROM users WHERE occupation_id = 62 AND user_id != $1 LIMIT 1",
+                        self.user_id
+                    )
 
+            # Funds check and payment happen in a single statement
+            parts_cost = int(cost * 0.35)  # A mechanic pays only for parts
             if is_self_mechanic:
-                parts_cost = int(cost * 0.35)  # Pay only for parts
-                await charge_user(self.pool, self.user_id, parts_cost)
+                paid = await debit(self.pool, self.user_id, parts_cost, require_funds=True, reason="repair_parts", source=__name__)
+            elif mechanic_record:
+                paid = await transfer(self.pool, self.user_id, mechanic_record["user_id"], cost, reason="repair_mechanic", source=__name__)
             else:
-                await charge_user(self.pool, self.user_id, cost)
+                paid = await debit(self.pool, self.user_id, cost, require_funds=True, reason="repair_mechanic", source=__name__)
 
-            # Repair logic
-            new_travel_count = get_random_travel_count(self.vehicle["vehicle_type_id"])
-            if new_travel_count is None:
-                await interaction.response.send_message(
-                    "❌ This vehicle type cannot be repaired by mechanic.", ephemeral=False
+            if paid is None:
+                description = (
+                    f"🚫 You need ${parts_cost:,} for parts but don't have enough funds."
+                    if is_self_mechanic else
+                    f"🚫 You need ${cost:,} to pay the mechanic but don't have enough funds."
+                )
+                embed = discord.Embed(
+                    description=description,
+                    color=COLOR_RED
                 )
+                await interaction.response.send_message(embed=embed, ephemeral=False)
                 return
-            new_breakdown_threshold = random.randint(200, 299)
 
             await update_vehicle_condition_and_description(
                 self.pool,
@@ -114,20 +127,11 @@ class RepairOptionsView(View):
                     f"🎩 As a skilled mechanic yourself, you paid **${parts_cost:,}** for parts to fix your vehicle.\n"
                 )
             else:
-                # Look for another mechanic to pay
-                async with self.pool.acquire() as conn:
-                    mechanic_record = await conn.fetchrow(
-                        "SELECT user_id FROM users WHERE occupation_id = 62 AND user_id != $1 LIMIT 1",
-                        self.user_id
-                    )
-
                 if mechanic_record:
                     mechanic_user_id = mechanic_record["user_id"]
                     mechanic_member = interaction.guild.get_member(mechanic_user_id)
                     mechanic_mention = mechanic_member.mention if mechanic_member else "The Mechanic"
 
-                    await reward_user(self.pool, mechanic_user_id, cost)
-
                     embed_description = (
                         f"🎩 {mechanic_mention} fixed your vehicle and you paid them **${cost:,}**.\n"
                     )
@@ -168,9 +172,9 @@ class RepairOptionsView(View):
 
             if choice == "fix":
                 cost = int(20 * random.uniform(1.0, 9.5))
-                finances = await get_user_finances(self.pool, self.user_id)
+                balance = await debit(self.pool, self.user_id, cost, require_funds=True, reason="repair_uncle_bill", source=__name__)
 
-                if finances.get("checking_account_balance", 0) < cost:
+                if balance is None:
                     embed = discord.Embed(
                         description=f"🚫 You need ${cost:,} to pay Uncle Bill but don't have enough funds.",
                         color=COLOR_RED
@@ -178,8 +182,6 @@ class RepairOptionsView(View):
                     await interaction.response.send_message(embed=embed, ephemeral=False)
                     return
 
-                await charge_user(self.pool, self.user_id, cost)
-
                 new_travel_count = get_random_travel_count(self.vehicle["vehicle_type_id"])
                 if new_travel_count is None:
                     await interaction.response.send_message(
@@ -208,7 +210,7 @@ class RepairOptionsView(View):
 
             else:
                 cost = int(60 * random.uniform(3.0, 5.0))
-                await charge_user(self.pool, self.user_id, cost)
+                await debit(self.pool, self.user_id, cost, reason="repair_uncle_bill_drinks", source=__name__)
 
                 await update_vehicle_condition_and_description(
                     self.pool,
@@ -282,7 +284,7 @@ class RepairOptionsView(View):
         try:
             resale_value = self.get_resale_value(self.vehicle)
             await remove_vehicle_by_id(self.pool, self.vehicle["id"])
-            await reward_user(self.pool, self.user_id, resale_value)
+            await credit(self.pool, self.user_id, resale_value, reason="vehicle_sale", source=__name__)
 
             embed = discord.Embed(
                 title="Vehicle Sold",
@@ -2,8 +2,7 @@ import random
 from discord.ui import View, Button
 import discord
 import asyncio
-from utilities import reward_user, charge_user
-from globals import pool
+from finance import credit, debit
 
 class TravelMiniGameView(View):
     def __init__(self, user_id, multiplier=1.0, pool=None):
@@ -58,9 +57,9 @@ class TravelMiniGameView(View):
             self.passed = True
             reward_amount = 1000 * self.multiplier
             try:
-                await reward_user(self.pool, self.user_id, reward_amount)
+                await credit(self.pool, self.user_id, reward_amount, reason="minigame_reward", source=__name__)
             except Exception as e:
-                print(f"[ERROR] reward_user failed: {e}")
+                print(f"[ERROR] credit failed: {e}")
             self.result_message = f"You safely navigated all obstacles and earned ${reward_amount:,.2f}! 🎉"
             await self._message.edit(embed=self.get_embed(), view=None)
             self.stop()
@@ -105,7 +104,7 @@ class TravelMiniGameView(View):
             self.step += 1
             if self.step >= len(self.predicaments):
                 self.passed = True
-                # Removed reward_user call here to avoid double rewards/messages
+                # Removed credit call here to avoid double rewards/messages
                 self.result_message = "You safely navigated all obstacles! 🎉"
                 await self._message.edit(embed=self.get_embed(), view=None)
                 self.stop()
@@ -116,9 +115,9 @@ class TravelMiniGameView(View):
             self.failed = True
             penalty_amount = 1000 * self.multiplier
             try:
-                await charge_user(self.pool, self.user_id, penalty_amount)
+                await debit(self.pool, self.user_id, penalty_amount, reason="minigame_penalty", source=__name__)
             except Exception as e:
-                print(f"[ERROR] charge_user failed: {e}")
+                print(f"[ERROR] debit failed: {e}")
 
             obstacle_name, fine_reason = self.get_failure_details(self.step, obstacles)
             self.result_message = (
@@ -0,0 +1,55 @@
+# command_sync.py
+# Sync the slash command tree only when it actually changed.
+#
+# Syncing is a slow, rate-limited HTTP call, so at startup we hash the
+# serialized tree and compare it with the hash stored in bot_state by the last
+# successful sync. With DEV_GUILD_ID set, global commands are copied to that
+# guild and synced there instead (guild syncs show up immediately).
+# Deleting the bot_state row forces the next boot to sync.
+
+import hashlib
+import json
+
+import discord
+
+
+def serialize_tree(tree: discord.app_commands.CommandTree, guild: discord.abc.Snowflake | None = None) -> list:
+    payload = []
+    for command in tree.get_commands(guild=guild):
+        try:
+            payload.append(command.to_dict(tree))
+        except TypeError:
+            # discord.py < 2.4 takes no tree argument
+            payload.append(command.to_dict())
+    return sorted(payload, key=lambda c: (c.get("type", 1), c["name"]))
+
+
+def tree_hash(tree: discord.app_commands.CommandTree, guild: discord.abc.Snowflake | None = None) -> str:
+    encoded = json.dumps(serialize_tree(tree, guild), sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+async def sync_command_tree(tree: discord.app_commands.CommandTree, pool, dev_guild_id: int = 0) -> bool:
+    """Sync if the tree differs from the last synced one. Returns True if a sync ran."""
+    guild = discord.Object(id=dev_guild_id) if dev_guild_id else None
+    if guild is not None:
+        tree.copy_global_to(guild=guild)
+
+    current = tree_hash(tree, guild)
+    key = f"command_tree_hash:{tree.client.application_id}:{dev_guild_id or 'global'}"
+    stored = await pool.fetchval("SELECT value FROM bot_state WHERE key = $1", key)
+    if stored == current:
+        print(f"⏭️ Slash commands unchanged ({current[:12]}), skipping sync.")
+        return False
+
+    synced = await tree.sync(guild=guild)
+    await pool.execute(
+        """
+        INSERT INTO bot_state (key, value, updated_at) VALUES ($1, $2, NOW())
+        ON CONFLICT (key) DO UPDATE SET value = EXCLUDED.value, updated_at = EXCLUDED.updated_at
+        """,
+        key, current
+    )
+    target = f"guild {dev_guild_id}" if guild is not None else "globally"
+    print(f"✅ Synced {len(synced)} slash commands {target} ({current[:12]}).")
+    return True
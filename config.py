@@ -27,6 +27,43 @@ DISCORD_BOT_TOKEN = get_env_str("DISCORD_BOT_TOKEN")
 
 # Optional environment variables with defaults
 DISCORD_CHANNEL_ID = get_env_int("DISCORD_CHANNEL_ID", default=0)
+# Development: sync slash commands to this guild only (instant updates); 0 syncs globally
+DEV_GUILD_ID = get_env_int("DEV_GUILD_ID", default=0)
+
+# Database pool (see db_pool.py)
+DB_POOL_MIN_SIZE = get_env_int("DB_POOL_MIN_SIZE", default=2)
+DB_POOL_MAX_SIZE = get_env_int("DB_POOL_MAX_SIZE", default=20)
+DB_POOL_MAX_INACTIVE_SECONDS = get_env_int("DB_POOL_MAX_INACTIVE_SECONDS", default=300)
+DB_STATEMENT_CACHE_SIZE = get_env_int("DB_STATEMENT_CACHE_SIZE", default=256)
+# Client-side safety net for a hung connection; the server-side limit is what normally fires
+DB_COMMAND_TIMEOUT_SECONDS = get_env_int("DB_COMMAND_TIMEOUT_SECONDS", default=180)
+DB_STATEMENT_TIMEOUT_MS = get_env_int("DB_STATEMENT_TIMEOUT_MS", default=5_000)
+# Nightly jobs touch every employed user, so they get a longer server-side limit
+DB_JOB_STATEMENT_TIMEOUT_MS = get_env_int("DB_JOB_STATEMENT_TIMEOUT_MS", default=120_000)
+
+# Local Prometheus-style text endpoint (metrics.start_server); 0 turns it off
+METRICS_PORT = get_env_int("METRICS_PORT", default=9108)
+
+# Known-user cache (ensure_user_exists hot path)
+KNOWN_USER_CACHE_SIZE = get_env_int("KNOWN_USER_CACHE_SIZE", default=50_000)
+KNOWN_USER_CACHE_TTL_SECONDS = get_env_int("KNOWN_USER_CACHE_TTL_SECONDS", default=6 * 3600)
+
+# Money ledger (buffered COPY into user_ledger)
+LEDGER_FLUSH_INTERVAL_MS = get_env_int("LEDGER_FLUSH_INTERVAL_MS", default=500)
+LEDGER_FLUSH_MAX_ROWS = get_env_int("LEDGER_FLUSH_MAX_ROWS", default=200)
+
+# Secret button press counts (coalesced in memory, upserted in batches)
+SECRET_BUTTON_FLUSH_INTERVAL_SECONDS = get_env_int("SECRET_BUTTON_FLUSH_INTERVAL_SECONDS", default=30)
+
+# Expired grocery sweeper
+GROCERY_SWEEP_INTERVAL_MINUTES = get_env_int("GROCERY_SWEEP_INTERVAL_MINUTES", default=15)
+GROCERY_SWEEP_BATCH_SIZE = get_env_int("GROCERY_SWEEP_BATCH_SIZE", default=500)
+
+# Nightly job check: how many "you're fired" DMs may be in flight at once
+FIRED_DM_CONCURRENCY = get_env_int("FIRED_DM_CONCURRENCY", default=5)
+
+# Clock-in history (user_work_log_history) keeps this many whole months before dropping partitions
+WORK_LOG_RETENTION_MONTHS = get_env_int("WORK_LOG_RETENTION_MONTHS", default=3)
 
 
 #IN GAME SETTINGS
@@ -44,9 +81,8 @@ GAME_RESPONSE_TIMEOUT = 10  # seconds to wait for user response in categories ga
 # Max guesses for riddle or other games (if applicable)
 MAX_GUESSES = 5
 
-# Message colors for embeds (optional convenience constants)
-from discord import Color
-COLOR_GREEN = Color.green()
-COLOR_RED = Color.red()
-COLOR_ORANGE = Color.orange()
-COLOR_TEAL = Color.teal()
+# Message colors for embeds, as plain ints (discord.Embed accepts them) so config doesn't import discord
+COLOR_GREEN = 0x2ECC71
+COLOR_RED = 0xE74C3C
+COLOR_ORANGE = 0xE67E22
+COLOR_TEAL = 0x1ABC9C
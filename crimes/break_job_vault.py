@@ -3,6 +3,8 @@ import random
 from datetime import timedelta, datetime
 import asyncio
 
+from finance import seize_checking
+
 
 COLOR_PRIMARY = 0x5865F2  # Discord blurple
 
@@ -210,7 +212,7 @@ class VaultGameView(discord.ui.View):
 
             try:
                 async with interaction.client.pool.acquire() as conn:
-                    await conn.execute("UPDATE user_finances SET checking_account_balance = 0 WHERE user_id = $1", self.user_id)
+                    await seize_checking(conn, self.user_id, reason="crime_seized", source=__name__)
                     await conn.execute("UPDATE users SET occupation_id = NULL WHERE user_id = $1", self.user_id)
                     await conn.execute(
                         "INSERT INTO user_criminal_record (user_id, date_of_offense, crime_id, crime_description, class) VALUES ($1, NOW(), 1, 'Theft', 'Misdemeanor')",
@@ -408,7 +410,7 @@ class SnitchConfirmView(discord.ui.View):
 
                     try:
                         async with self.parent.bot.pool.acquire() as conn:
-                            await conn.execute("UPDATE user_finances SET checking_account_balance = 0 WHERE user_id = $1", self.parent.user_id)
+                            await seize_checking(conn, self.parent.user_id, reason="crime_seized", source=__name__)
                             await conn.execute("UPDATE users SET occupation_id = NULL WHERE user_id = $1", self.parent.user_id)
                             await conn.execute(
                                 "INSERT INTO user_criminal_record (user_id, date_of_offense, crime_id, crime_description, class) VALUES ($1, NOW(), 1, 'Theft', 'Misdemeanor')",
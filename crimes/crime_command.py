@@ -8,6 +8,8 @@ from datetime import timedelta
 from datetime import datetime
 import asyncio
 
+from finance import credit, seize_checking
+
 
 class CrimeCommands(commands.Cog):
     def __init__(self, bot):
@@ -96,23 +98,7 @@ class CrimeCommands(commands.Cog):
                 payout = int(base_amount * multiplier)
 
                 try:
-                    async with self.bot.pool.acquire() as conn:
-                        row = await conn.fetchrow(
-                            "SELECT checking_account_balance FROM user_finances WHERE user_id = $1",
-                            interaction.user.id
-                        )
-                        if row:
-                            new_balance = row["checking_account_balance"] + payout
-                            await conn.execute(
-                                "UPDATE user_finances SET checking_account_balance = $1 WHERE user_id = $2",
-                                new_balance, interaction.user.id
-                            )
-                        else:
-                            new_balance = payout
-                            await conn.execute(
-                                "INSERT INTO user_finances (user_id, checking_account_balance) VALUES ($1, $2)",
-                                interaction.user.id, payout
-                            )
+                    await credit(self.bot.pool, interaction.user.id, payout, reason="crime_payout", source=__name__)
                 except Exception as e:
                     print(f"[ERROR] Exception during payout DB update: {e}")
 
@@ -145,10 +131,7 @@ class CrimeCommands(commands.Cog):
             if vault_view.outcome in ("Caught", "failure"):
                 try:
                     async with self.bot.pool.acquire() as conn:
-                        await conn.execute(
-                            "UPDATE user_finances SET checking_account_balance = 0 WHERE user_id = $1",
-                            interaction.user.id
-                        )
+                        await seize_checking(conn, interaction.user.id, reason="crime_seized", source=__name__)
                         await conn.execute(
                             "UPDATE users SET occupation_id = NULL WHERE user_id = $1",
                             interaction.user.id
@@ -62,7 +62,7 @@ class TheftLocationDropdown(discord.ui.Select):
         print(f"[DEBUG][TheftLocationDropdown] User {interaction.user} selected location: {location}")
 
         if location == "Rob your job":
-            pool = self.parent_view.bot.pool  # or use globals.pool if needed
+            pool = self.parent_view.bot.pool  # or use db_pool.get_pool() if needed
             user_id = interaction.user.id
 
             async with pool.acquire() as conn:
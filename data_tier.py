@@ -1,5 +1,5 @@
-# ✅ Seeds the grocery types
-async def seed_grocery_types(pool):
+# ✅ Seeds the grocery types (run by migrations/0007_seed_grocery_catalog.py)
+async def seed_grocery_types(conn):
     category_map = {
         "produce": 1,
         "dairy": 2,
@@ -36,25 +36,22 @@ async def seed_grocery_types(pool):
         {"name": "Wine", "emoji": "🍷", "cost": 12, "category": "beverages"},
     ]
 
-    async with pool.acquire() as conn:
-        for item in grocery_types:
-            category_id = category_map[item["category"].lower()]
-            await conn.execute(
-                """
-                INSERT INTO cd_grocery_type (name, category_id, cost, emoji)
-                VALUES ($1, $2, $3, $4)
-                ON CONFLICT (name) DO NOTHING
-                """,
-                item["name"],
-                category_id,
-                item["cost"],
-                item["emoji"],
-            )
+    await conn.executemany(
+        """
+        INSERT INTO cd_grocery_type (name, category_id, cost, emoji)
+        VALUES ($1, $2, $3, $4)
+        ON CONFLICT (name) DO NOTHING
+        """,
+        [
+            (item["name"], category_map[item["category"].lower()], item["cost"], item["emoji"])
+            for item in grocery_types
+        ],
+    )
     print("✅ Seeded grocery types with emojis, categories, and costs.")
 
 
-# ✅ Seeds the grocery categories
-async def seed_grocery_categories(pool):
+# ✅ Seeds the grocery categories (run by migrations/0007_seed_grocery_catalog.py)
+async def seed_grocery_categories(conn):
     grocery_categories = [
         ("Produce", "🍎"),
         ("Dairy", "🥛"),
@@ -63,17 +60,14 @@ async def seed_grocery_categories(pool):
         ("Beverages", "🥤"),
     ]
 
-    async with pool.acquire() as conn:
-        for name, emoji in grocery_categories:
-            await conn.execute(
-                """
-                INSERT INTO cd_grocery_category (name, emoji)
-                VALUES ($1, $2)
-                ON CONFLICT (name) DO NOTHING
-                """,
-                name,
-                emoji,
-            )
+    await conn.executemany(
+        """
+        INSERT INTO cd_grocery_category (name, emoji)
+        VALUES ($1, $2)
+        ON CONFLICT (name) DO NOTHING
+        """,
+        grocery_categories,
+    )
     print("✅ Seeded grocery categories with emojis.")
 
 
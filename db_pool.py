@@ -1,24 +1,78 @@
-import asyncpg
+# db_pool.py
+# The bot's one asyncpg pool: creation and per-connection setup.
+# The schema itself is managed by migrate.py.
+#
+# main.py calls `create_pool()` once at startup; everything else gets the pool
+# from `get_pool()`. Sizes, lifetimes, statement cache and timeouts come from
+# config.py. Every new connection runs `init_connection`, which registers the
+# JSON codecs; asyncpg's per-connection statement cache fills on first use.
+
+import contextlib
+import json
 import ssl
-import os
-from config import DATABASE_URL
+
+import asyncpg
+
+from perf import InstrumentedPool
+from config import (
+    DATABASE_URL,
+    DB_POOL_MIN_SIZE,
+    DB_POOL_MAX_SIZE,
+    DB_POOL_MAX_INACTIVE_SECONDS,
+    DB_STATEMENT_CACHE_SIZE,
+    DB_COMMAND_TIMEOUT_SECONDS,
+    DB_STATEMENT_TIMEOUT_MS,
+)
+
+_pool = None
+
+
+async def init_connection(conn):
+    for type_name in ("json", "jsonb"):
+        await conn.set_type_codec(type_name, encoder=json.dumps, decoder=json.loads, schema="pg_catalog")
+
 
 async def create_pool():
+    global _pool
+    if _pool is not None:
+        return _pool
+
     ssl_context = ssl.create_default_context()
     ssl_context.check_hostname = False
     ssl_context.verify_mode = ssl.CERT_NONE
-    return await asyncpg.create_pool(DATABASE_URL, ssl=ssl_context)
+    raw_pool = await asyncpg.create_pool(
+        DATABASE_URL,
+        ssl=ssl_context,
+        min_size=DB_POOL_MIN_SIZE,
+        max_size=DB_POOL_MAX_SIZE,
+        max_inactive_connection_lifetime=DB_POOL_MAX_INACTIVE_SECONDS,
+        statement_cache_size=DB_STATEMENT_CACHE_SIZE,
+        command_timeout=DB_COMMAND_TIMEOUT_SECONDS,
+        server_settings={"statement_timeout": str(DB_STATEMENT_TIMEOUT_MS)},
+        init=init_connection,
+    )
+    # Acquire wait, hold time and per-call-site query latency, tagged by command (see perf.py)
+    _pool = InstrumentedPool(raw_pool)
+    print(f"✅ Database pool created (min {DB_POOL_MIN_SIZE}, max {DB_POOL_MAX_SIZE}).")
+    return _pool
+
 
-async def init_db(pool): 
-    async with pool.acquire() as conn:
-        await conn.execute('''
-            CREATE TABLE IF NOT EXISTS users (
-                user_id BIGINT PRIMARY KEY,
-                user_name TEXT,
-                last_seen TIMESTAMP
-            );
-        ''')
+def get_pool():
+    if _pool is None:
+        raise RuntimeError("Database pool is not ready yet; create_pool() has not run.")
+    return _pool
 
 
+async def close_pool():
+    global _pool
+    pool, _pool = _pool, None
+    if pool is not None:
+        await pool.close()
 
 
+@contextlib.asynccontextmanager
+async def statement_timeout(conn, timeout_ms: int):
+    """Run a block in a transaction with its own server-side statement_timeout (e.g. nightly jobs)."""
+    async with conn.transaction():
+        await conn.execute(f"SET LOCAL statement_timeout = {int(timeout_ms)}")
+        yield conn
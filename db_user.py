@@ -1,18 +1,26 @@
 import json
-import asyncpg
 import datetime
 import traceback
 from datetime import datetime, timedelta
- 
+
+from user_cache import known_users
+from reference_data import catalog
+from finance import debit
+from ledger import ledger
+
 
 #------------ADD USER TO DB IF MISSING AND RUN COMMAND = TRUE--------------
 async def ensure_user_exists(pool, user_id: int, user_name: str, guild_id: int | None):
-    print(f"🔎 ensure_user_exists called for {user_name} ({user_id}) in guild {guild_id}")
-
     if guild_id is None:
         print(f"❌ Skipping user insert: guild_id is None for user {user_name}")
         return
 
+    # Repeat users are answered from memory; only cache misses touch the DB.
+    if known_users.contains(user_id, guild_id):
+        return
+
+    print(f"🔎 ensure_user_exists called for {user_name} ({user_id}) in guild {guild_id}")
+
     try:
         existing = await pool.fetchval("""
             SELECT 1 FROM users WHERE user_id = $1 AND guild_id = $2
@@ -22,6 +30,7 @@ async def ensure_user_exists(pool, user_id: int, user_name: str, guild_id: int |
 
         if existing:
             print(f"ℹ️ User already exists in DB: {user_name} ({user_id}) in guild {guild_id}")
+            known_users.add(user_id, guild_id)
             return
 
         result = await pool.execute("""
@@ -33,6 +42,7 @@ async def ensure_user_exists(pool, user_id: int, user_name: str, guild_id: int |
         """, user_id, user_name, guild_id)
 
         print(f"✅ DB Insert result: {result}")
+        known_users.add(user_id, guild_id)
 
         if result == "INSERT 0 0":
             print(f"⚠️ Insert skipped due to conflict (user likely exists): {user_name} ({user_id}) in guild {guild_id}")
@@ -41,37 +51,15 @@ async def ensure_user_exists(pool, user_id: int, user_name: str, guild_id: int |
         print(f"❌ Exception during insert: {e}")
 
 
-import asyncio
-import asyncpg
-import os
-
-DATABASE_URL = os.getenv("DATABASE_URL")  # Or hardcode your connection string here
-
-async def add_unique_constraint():
-    conn = await asyncpg.connect(DATABASE_URL)
-    try:
-        await conn.execute("""
-            ALTER TABLE users
-            ADD CONSTRAINT users_user_id_guild_id_unique UNIQUE (user_id, guild_id);
-        """)
-        print("✅ Unique constraint added on (user_id, guild_id).")
-    except asyncpg.exceptions.DuplicateObjectError:
-        print("⚠️ Unique constraint already exists.")
-    except Exception as e:
-        print(f"❌ Error adding unique constraint: {e}")
-    finally:
-        await conn.close()
-
-if __name__ == "__main__":
-    asyncio.run(add_unique_constraint())
-
-
+# ---------- USERS TABLE (Profile Info) ----------
+GET_USER_SQL = "SELECT * FROM users WHERE user_id = $1"
 
 
-# ---------- USERS TABLE (Profile Info) ----------
-async def get_user(pool, user_id: int):
+async def get_user(pool, user_id: int, uow=None):
+    if uow is not None:
+        return await uow.load("user", user_id, lambda: get_user(pool, user_id))
     async with pool.acquire() as conn:
-        row = await conn.fetchrow('SELECT * FROM users WHERE user_id = $1', user_id)
+        row = await conn.fetchrow(GET_USER_SQL, user_id)
         if row:
             return dict(row)  # <-- converts asyncpg Record to a full dictionary
         return None
@@ -126,7 +114,9 @@ async def upsert_user_finances(pool, user_id: int, finances: dict):
         )
 
 
-async def get_user_finances(pool, user_id: int):
+async def get_user_finances(pool, user_id: int, uow=None):
+    if uow is not None:
+        return await uow.load("finances", user_id, lambda: get_user_finances(pool, user_id))
     async with pool.acquire() as conn:
         row = await conn.fetchrow(
             "SELECT * FROM user_finances WHERE user_id = $1",
@@ -143,23 +133,36 @@ async def get_user_finances(pool, user_id: int):
 
 
 # ---------- USER_GROCERY_INVENTORY ----------
+# $1 user_id, $2 now (naive UTC, same clock the expirations are stamped with)
+GROCERY_STASH_SQL = """
+    SELECT grocery_type_id, grocery_category_id, quantity, expiration_date
+    FROM user_grocery_inventory
+    WHERE user_id = $1 AND sold_at IS NULL
+      AND (expiration_date IS NULL OR expiration_date >= $2)
+"""
+
+
 async def get_grocery_stash(pool, user_id):
     async with pool.acquire() as conn:
-        rows = await conn.fetch("""
-            SELECT 
-                cgc.name AS category,
-                cgc.emoji AS category_emoji,
-                cgt.name AS item_name,
-                cgt.emoji AS item_emoji,
-                ugi.quantity,
-                ugi.expiration_date
-            FROM user_grocery_inventory ugi 
-            JOIN cd_grocery_type cgt ON cgt.id = ugi.grocery_type_id
-            JOIN cd_grocery_category cgc ON cgc.id = ugi.grocery_category_id
-            WHERE ugi.user_id = $1 AND ugi.sold_at IS NULL
-            ORDER BY cgc.name, cgt.name;
-        """, user_id)
-    return rows
+        rows = await conn.fetch(GROCERY_STASH_SQL, user_id, datetime.utcnow())
+
+    # Names and emojis come from the cached catalog instead of joining cd_grocery_*
+    stash = []
+    for row in rows:
+        grocery = catalog.get("cd_grocery_type", "id", row["grocery_type_id"])
+        category = catalog.get("cd_grocery_category", "id", row["grocery_category_id"])
+        if grocery is None or category is None:
+            continue
+        stash.append({
+            "category": category["name"],
+            "category_emoji": category["emoji"],
+            "item_name": grocery["name"],
+            "item_emoji": grocery["emoji"],
+            "quantity": row["quantity"],
+            "expiration_date": row["expiration_date"],
+        })
+    stash.sort(key=lambda item: (item["category"], item["item_name"]))
+    return stash
 
 #-------------USER RESALE OF VEHICLE-------------
 async def fetch_vehicle_with_pricing(pool, user_id, vehicle_id: int):
@@ -172,51 +175,52 @@ async def fetch_vehicle_with_pricing(pool, user_id, vehicle_id: int):
     record = await pool.fetchrow(sql, vehicle_id)
     return record
 
-async def get_user_achievements(pool, user_id: int):
-    query = """
+USER_ACHIEVEMENTS_SQL = """
     SELECT achievement_emoji, achievement_name, achievement_description
     FROM user_achievements
     WHERE user_id = $1
-    """
+"""
+
+
+async def get_user_achievements(pool, user_id: int):
     async with pool.acquire() as conn:
-        rows = await conn.fetch(query, user_id)
+        rows = await conn.fetch(USER_ACHIEVEMENTS_SQL, user_id)
     return rows
 
-async def can_user_own_vehicle(user_id: int, vehicle_type_id: int, conn) -> bool:
-    # Get the class_type for the requested vehicle (e.g., 'car' or 'bike')
-    row = await conn.fetchrow("""
-        SELECT class_type
-        FROM cd_vehicle_type
-        WHERE id = $1
-    """, vehicle_type_id)
+# class_type -> (limit without a garage, limit with one)
+VEHICLE_CLASS_LIMITS = {
+    "car": (1, 5),
+    "bike": (2, 5),
+}
 
-    if not row or not row['class_type']:
-        return False  # Unknown or undefined class type
+# Owned count comes from user_vehicle_class_counts, kept current by a trigger on user_vehicle_inventory
+VEHICLE_LIMIT_SQL = """
+    SELECT
+        COALESCE((SELECT vehicles FROM user_vehicle_class_counts WHERE user_id = $1 AND class_type = $2), 0) AS owned,
+        COALESCE((SELECT has_garage FROM users WHERE user_id = $1), FALSE) AS has_garage
+"""
 
-    class_type = row['class_type'].lower()  # Make sure to lowercase to match DB
 
-    count = await conn.fetchval("""
-        SELECT COUNT(*)
-        FROM user_vehicle_inventory uvi
-        JOIN cd_vehicle_type cvt ON uvi.vehicle_type_id = cvt.id
-        WHERE uvi.user_id = $1 AND LOWER(cvt.class_type) = $2
-    """, user_id, class_type)
+def vehicle_class(vehicle_type_id: int) -> str | None:
+    # Get the class_type for the vehicle (e.g., 'car' or 'bike') from the cached catalog
+    row = catalog.get("cd_vehicle_type", "id", vehicle_type_id)
+    if not row or not row['class_type']:
+        return None
+    return row['class_type'].lower()
 
-    if count is None:
-        count = 0
 
-    has_garage_row = await conn.fetchrow("SELECT has_garage FROM users WHERE user_id = $1", user_id)
-    has_garage = has_garage_row['has_garage'] if has_garage_row else False
+def vehicle_class_limit(class_type: str, has_garage: bool) -> int:
+    without_garage, with_garage = VEHICLE_CLASS_LIMITS.get(class_type, (0, 0))
+    return with_garage if has_garage else without_garage
 
-    car_limit = 5 if has_garage else 1
-    bike_limit = 5 if has_garage else 2
 
-    if class_type == "car":
-        return count < car_limit
-    elif class_type == "bike":
-        return count < bike_limit
-    else:
-        return False  # Unsupported class type
+async def can_user_own_vehicle(user_id: int, vehicle_type_id: int, conn) -> bool:
+    class_type = vehicle_class(vehicle_type_id)
+    if class_type not in VEHICLE_CLASS_LIMITS:
+        return False  # Unknown or unsupported class type
+
+    row = await conn.fetchrow(VEHICLE_LIMIT_SQL, user_id, class_type)
+    return row['owned'] < vehicle_class_limit(class_type, row['has_garage'])
 
 
 async def update_last_used_vehicle(pool, user_id: int, vehicle_id: int | None, vehicle_status: str | None = None, location_id: int | None = None):
@@ -251,8 +255,19 @@ async def update_last_used_vehicle(pool, user_id: int, vehicle_id: int | None, v
         print(f"[ERROR] update_last_used_vehicle failed: {e}")
 
  
-async def add_grocery_to_stash(pool, user_id: int, item: dict):
-    """Add or update grocery item in user's stash, resetting expiration, with cap."""
+GROCERY_FRIDGE_CAP = 10
+
+FRIDGE_FULL_MESSAGE = "🧊 Easy there, chef. Your fridge is so full, even Tetris gave up."
+CANNOT_AFFORD_MESSAGE = "💸 You can’t afford that! Get your bread up. Or just buy bread."
+
+
+async def add_grocery_to_stash(pool, user_id: int, item: dict, quantity: int = 1, cost=0):
+    """
+    Add `quantity` of an item to the user's stash, resetting its expiration, with the fridge cap.
+    When `cost` is given it is debited in the same transaction, so a full fridge
+    never charges and a failed charge never stocks the fridge.
+    Returns (item_quantity, fridge_total). Raises ValueError with a user-facing message.
+    """
     grocery_type_id = item["id"]
     grocery_category_id = item["category_id"]
     shelf_life_days = item.get("shelf_life", 0)
@@ -262,38 +277,52 @@ async def add_grocery_to_stash(pool, user_id: int, item: dict):
 
     async with pool.acquire() as conn:
         try:
-            # Check total inventory quantity
-            total_quantity = await conn.fetchval("""
-                SELECT COALESCE(SUM(quantity), 0)
-                FROM user_grocery_inventory
-                WHERE user_id = $1 AND sold_at IS NULL
-            """, user_id)
-
-            if total_quantity >= 10:
-                raise ValueError("🧊 Easy there, chef. Your fridge is so full, even Tetris gave up.")
-
-            # Check if this item already exists
-            existing = await conn.fetchrow("""
-                SELECT id, quantity
-                FROM user_grocery_inventory
-                WHERE user_id = $1 AND grocery_type_id = $2 AND sold_at IS NULL
-            """, user_id, grocery_type_id)
-
-            if existing:
-                await conn.execute("""
-                    UPDATE user_grocery_inventory
-                    SET quantity = quantity + 1,
-                        expiration_date = $1,
-                        created_at = $2
-                    WHERE id = $3
-                """, expiration_date, now, existing["id"])
-            else:
-                await conn.execute("""
-                    INSERT INTO user_grocery_inventory (
-                        user_id, grocery_type_id, grocery_category_id,
-                        quantity, created_at, expiration_date
-                    ) VALUES ($1, $2, $3, 1, $4, $5)
-                """, user_id, grocery_type_id, grocery_category_id, now, expiration_date)
+            async with conn.transaction():
+                # Serialize fridge changes per user: a statement's snapshot predates any
+                # row lock it takes, so the cap check needs the lock held beforehand.
+                await conn.execute(
+                    "SELECT pg_advisory_xact_lock(hashtextextended('grocery_fridge:' || $1::bigint, 0))",
+                    user_id
+                )
+
+                row = await conn.fetchrow("""
+                    WITH fridge AS (
+                        SELECT COALESCE(SUM(quantity), 0) AS total
+                        FROM user_grocery_inventory
+                        WHERE user_id = $1 AND sold_at IS NULL
+                    ), upserted AS (
+                        INSERT INTO user_grocery_inventory (
+                            user_id, grocery_type_id, grocery_category_id,
+                            quantity, created_at, expiration_date
+                        )
+                        SELECT $1, $2, $3, $4::int, $5, $6
+                        FROM fridge
+                        WHERE fridge.total + $4::int <= $7
+                        ON CONFLICT (user_id, grocery_type_id) WHERE sold_at IS NULL
+                        DO UPDATE SET
+                            quantity = user_grocery_inventory.quantity + EXCLUDED.quantity,
+                            expiration_date = EXCLUDED.expiration_date,
+                            created_at = EXCLUDED.created_at
+                        RETURNING quantity
+                    )
+                    SELECT (SELECT quantity FROM upserted) AS quantity,
+                           (SELECT total FROM fridge) AS fridge_total
+                """, user_id, grocery_type_id, grocery_category_id, quantity, now, expiration_date, GROCERY_FRIDGE_CAP)
+
+                if row["quantity"] is None:
+                    raise ValueError(FRIDGE_FULL_MESSAGE)
+
+                balance = None
+                if cost:
+                    balance = await debit(conn, user_id, cost, require_funds=True,
+                                          reason="grocery_purchase", source=__name__, record=False)
+                    if balance is None:
+                        raise ValueError(CANNOT_AFFORD_MESSAGE)
+
+            # Only once the fridge transaction has committed
+            if balance is not None:
+                ledger.record(user_id, -cost, balance, "grocery_purchase", __name__)
+            return row["quantity"], row["fridge_total"] + quantity
         except Exception as e:
             print(f"[ERROR in add_grocery_to_stash]: {e}")
             raise  # re-raise so the caller also sees it
@@ -0,0 +1,151 @@
+# finance.py
+# Atomic balance mutations for user_finances.checking_account_balance.
+#
+# Every helper is a single UPDATE/INSERT ... RETURNING, so it costs one round
+# trip, never loses a concurrent update, and hands back the new balance.
+# `pool` may be an asyncpg pool or a connection (e.g. inside a transaction).
+#
+# Each successful movement is also queued for user_ledger with a short
+# `reason` code and the `source` module (callers pass `source=__name__`).
+# The ledger writes on its own connection, so a caller inside a transaction
+# that can still roll back passes `record=False` to credit/debit/seize_checking
+# and calls ledger.record itself once the transaction has committed.
+
+from ledger import ledger
+
+CREDIT_SQL = """
+    INSERT INTO user_finances (user_id, checking_account_balance)
+    VALUES ($1, $2)
+    ON CONFLICT (user_id) DO UPDATE SET
+        checking_account_balance = user_finances.checking_account_balance + EXCLUDED.checking_account_balance
+    RETURNING checking_account_balance
+"""
+
+DEBIT_SQL = """
+    UPDATE user_finances
+    SET checking_account_balance = checking_account_balance - $2
+    WHERE user_id = $1
+      AND (NOT $3 OR checking_account_balance >= $2)
+    RETURNING checking_account_balance
+"""
+
+
+async def credit(pool, user_id: int, amount, reason: str = "unspecified", source: str | None = None,
+                 record: bool = True):
+    """Add `amount` to checking, creating the finances row if needed. Returns the new balance."""
+    balance = await pool.fetchval(CREDIT_SQL, user_id, amount)
+    if record:
+        ledger.record(user_id, amount, balance, reason, source)
+    return balance
+
+
+async def debit(pool, user_id: int, amount, require_funds: bool = False,
+                reason: str = "unspecified", source: str | None = None, record: bool = True):
+    """
+    Subtract `amount` from checking.
+    Returns the new balance, or None if the user has no finances row or
+    `require_funds` is set and the balance would go negative.
+    """
+    balance = await pool.fetchval(DEBIT_SQL, user_id, amount, require_funds)
+    if balance is not None and record:
+        ledger.record(user_id, -amount, balance, reason, source)
+    return balance
+
+
+async def transfer(pool, from_user_id: int, to_user_id: int, amount, require_funds: bool = True,
+                   reason: str = "transfer", source: str | None = None):
+    """
+    Move `amount` between two checking accounts in one statement, creating the
+    recipient's finances row if needed.
+    Returns (from_balance, to_balance), or None if nothing moved.
+    """
+    if from_user_id == to_user_id:
+        raise ValueError("Cannot transfer money to the same user.")
+
+    row = await pool.fetchrow(
+        """
+        WITH debited AS (
+            UPDATE user_finances
+            SET checking_account_balance = checking_account_balance - $3
+            WHERE user_id = $1
+              AND (NOT $4 OR checking_account_balance >= $3)
+            RETURNING checking_account_balance
+        ), credited AS (
+            INSERT INTO user_finances (user_id, checking_account_balance)
+            SELECT $2, $3 FROM debited
+            ON CONFLICT (user_id) DO UPDATE SET
+                checking_account_balance = user_finances.checking_account_balance + EXCLUDED.checking_account_balance
+            RETURNING checking_account_balance
+        )
+        SELECT d.checking_account_balance AS from_balance,
+               c.checking_account_balance AS to_balance
+        FROM debited d, credited c
+        """,
+        from_user_id, to_user_id, amount, require_funds
+    )
+    if row is None:
+        return None
+    ledger.record(from_user_id, -amount, row["from_balance"], reason, source)
+    ledger.record(to_user_id, amount, row["to_balance"], reason, source)
+    return row["from_balance"], row["to_balance"]
+
+
+async def seize_checking(pool, user_id: int, reason: str = "seized", source: str | None = None,
+                         record: bool = True):
+    """Zero out checking. Returns the amount taken (0 if there was nothing to take)."""
+    seized = await pool.fetchval(
+        """
+        UPDATE user_finances uf
+        SET checking_account_balance = 0
+        FROM (
+            SELECT user_id, checking_account_balance
+            FROM user_finances
+            WHERE user_id = $1
+            FOR UPDATE
+        ) old
+        WHERE uf.user_id = old.user_id
+        RETURNING old.checking_account_balance
+        """,
+        user_id
+    )
+    if not seized:
+        return 0
+    if record:
+        ledger.record(user_id, -seized, 0, reason, source)
+    return seized
+
+
+async def deposit_to_savings(pool, user_id: int, amount, reason: str = "savings_deposit", source: str | None = None):
+    """Move `amount` from checking to savings. Returns (checking, savings), or None if checking is short."""
+    row = await pool.fetchrow(
+        """
+        UPDATE user_finances
+        SET checking_account_balance = checking_account_balance - $2,
+            savings_account_balance = COALESCE(savings_account_balance, 0) + $2
+        WHERE user_id = $1 AND checking_account_balance >= $2
+        RETURNING checking_account_balance, savings_account_balance
+        """,
+        user_id, amount
+    )
+    if row is None:
+        return None
+    ledger.record(user_id, -amount, row["checking_account_balance"], reason, source)
+    return row["checking_account_balance"], row["savings_account_balance"]
+
+
+async def withdraw_from_savings(pool, user_id: int, amount, reason: str = "savings_withdrawal", source: str | None = None):
+    """Move `amount` from savings to checking. Returns (checking, savings), or None if savings is short."""
+    row = await pool.fetchrow(
+        """
+        UPDATE user_finances
+        SET savings_account_balance = savings_account_balance - $2,
+            checking_account_balance = COALESCE(checking_account_balance, 0) + $2
+        WHERE user_id = $1 AND savings_account_balance >= $2
+        RETURNING checking_account_balance, savings_account_balance
+        """,
+        user_id, amount
+    )
+    if row is None:
+        return None
+    ledger.record(user_id, amount, row["checking_account_balance"], reason, source)
+    return row["checking_account_balance"], row["savings_account_balance"]
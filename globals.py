@@ -1,2 +0,0 @@
-# globals.py
-pool = None  # This is a placeholder, will be assigned later
@@ -0,0 +1,51 @@
+# grocery_catalog.py
+# Grocery catalog grouped by category, built from the cached cd_grocery_* tables.
+#
+# The grouping is rebuilt only when either table's catalog version changes,
+# so /market, /shop groceries and the grocery stash all share one structure
+# and none of them query the catalog tables.
+
+from reference_data import catalog
+
+_cache = {"version": None, "by_category": (), "by_name": ()}
+
+
+def _versions():
+    return catalog.version("cd_grocery_category"), catalog.version("cd_grocery_type")
+
+
+def _rebuild():
+    items_by_category = {}
+    for row in catalog.rows("cd_grocery_type"):
+        items_by_category.setdefault(row["category_id"], []).append({
+            "id": row["id"],
+            "emoji": row["emoji"],
+            "name": row["name"],
+            "cost": row["cost"],
+            "shelf_life": row["shelf_life"],
+            "category_id": row["category_id"],
+        })
+
+    by_category = []
+    for category in sorted(catalog.rows("cd_grocery_category"), key=lambda c: c["name"]):
+        items = sorted(items_by_category.get(category["id"], []), key=lambda i: i["name"])
+        by_category.append((category["name"], tuple(items)))
+
+    all_items = [item for _, items in by_category for item in items]
+    _cache["by_category"] = tuple(by_category)
+    _cache["by_name"] = tuple(sorted(all_items, key=lambda i: i["name"]))
+    _cache["version"] = _versions()
+
+
+def get_market_catalog():
+    """((category_name, (item, ...)), ...) ordered by category then item name. Treat as read-only."""
+    if _cache["version"] != _versions():
+        _rebuild()
+    return _cache["by_category"]
+
+
+def get_grocery_items():
+    """Every grocery item ordered by name."""
+    if _cache["version"] != _versions():
+        _rebuild()
+    return _cache["by_name"]
@@ -0,0 +1,83 @@
+import time
+from datetime import datetime
+
+from discord.ext import commands, tasks
+
+import metrics
+from perf import set_tag
+from config import GROCERY_SWEEP_INTERVAL_MINUTES, GROCERY_SWEEP_BATCH_SIZE
+
+# Stop a single run after this many batches; the next run picks up the rest.
+MAX_BATCHES_PER_RUN = 50
+
+# Moves one batch of expired live groceries into the archive table.
+# SKIP LOCKED keeps the sweeper out of the way of a purchase touching the same rows.
+SWEEP_BATCH_SQL = """
+    WITH batch AS (
+        SELECT id
+        FROM user_grocery_inventory
+        WHERE sold_at IS NULL AND expiration_date < $2
+        ORDER BY expiration_date
+        LIMIT $1
+        FOR UPDATE SKIP LOCKED
+    ), moved AS (
+        DELETE FROM user_grocery_inventory ugi
+        USING batch
+        WHERE ugi.id = batch.id
+        RETURNING ugi.id, ugi.user_id, ugi.grocery_type_id, ugi.grocery_category_id,
+                  ugi.quantity, ugi.created_at, ugi.expiration_date
+    )
+    INSERT INTO user_grocery_inventory_expired (
+        id, user_id, grocery_type_id, grocery_category_id,
+        quantity, created_at, expiration_date, swept_at
+    )
+    SELECT id, user_id, grocery_type_id, grocery_category_id,
+           quantity, created_at, expiration_date, NOW()
+    FROM moved
+"""
+
+
+class GrocerySweeper(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+        self.sweep_expired_groceries.start()
+
+    def cog_unload(self):
+        self.sweep_expired_groceries.cancel()
+
+    async def sweep_once(self):
+        started = time.perf_counter()
+        now = datetime.utcnow()  # same clock add_grocery_to_stash stamps expirations with
+        swept = 0
+
+        for _ in range(MAX_BATCHES_PER_RUN):
+            status = await self.bot.pool.execute(SWEEP_BATCH_SQL, GROCERY_SWEEP_BATCH_SIZE, now)
+            moved = int(status.split()[-1])  # "INSERT 0 <n>"
+            swept += moved
+            if moved < GROCERY_SWEEP_BATCH_SIZE:
+                break
+
+        duration = time.perf_counter() - started
+        metrics.inc("grocery_sweep_runs")
+        metrics.inc("grocery_sweep_rows", swept)
+        metrics.set_gauge("grocery_sweep_last_rows", swept)
+        metrics.set_gauge("grocery_sweep_last_duration_seconds", round(duration, 3))
+        print(f"🧹 Grocery sweep archived {swept} expired items in {duration:.2f}s")
+        return swept
+
+    @tasks.loop(minutes=GROCERY_SWEEP_INTERVAL_MINUTES)
+    async def sweep_expired_groceries(self):
+        set_tag("grocery_sweeper")
+        try:
+            await self.sweep_once()
+        except Exception as e:
+            metrics.inc("grocery_sweep_errors")
+            print(f"❌ Grocery sweep failed: {e}")
+
+    @sweep_expired_groceries.before_loop
+    async def before_sweep_expired_groceries(self):
+        await self.bot.wait_until_ready()
+
+
+async def setup(bot):
+    await bot.add_cog(GrocerySweeper(bot))
@@ -1,9 +1,10 @@
 import discord
 from discord.ui import View, Button, Select
 from discord import Interaction
-from db_user import get_user_finances, upsert_user_finances, add_grocery_to_stash
+from db_user import add_grocery_to_stash, GROCERY_FRIDGE_CAP
 
 ITEMS_PER_PAGE = 3
+BULK_BUY_QUANTITY = 3
 
 class CategorySelect(Select):
     def __init__(self, control_view: "GroceryMarketView"):
@@ -82,7 +83,7 @@ class GroceryMarketView(View):
         self.add_item(self.prev_button)
         self.add_item(self.next_button)
 
-        # Row 2, 3, 4: Buy buttons (1 per row to avoid overflow)
+        # Row 2, 3, 4: Buy one / buy several buttons (one item per row to avoid overflow)
         start = self.current_page * ITEMS_PER_PAGE
         end = start + ITEMS_PER_PAGE
         page_items = self.categories_with_items[self.current_category_index][1][start:end]
@@ -92,34 +93,29 @@ class GroceryMarketView(View):
             buy_button.callback = self.make_buy_callback(item)
             self.add_item(buy_button)
 
+            bulk_button = Button(
+                label=f"Buy {BULK_BUY_QUANTITY} (${item['cost'] * BULK_BUY_QUANTITY})",
+                style=discord.ButtonStyle.primary,
+                row=2 + i
+            )
+            bulk_button.callback = self.make_buy_callback(item, BULK_BUY_QUANTITY)
+            self.add_item(bulk_button)
+
 
-    def make_buy_callback(self, item):
+    def make_buy_callback(self, item, quantity: int = 1):
         async def callback(interaction: Interaction):
             if interaction.user.id != self.user_id:
                 await interaction.response.send_message("This isn’t your market view.", ephemeral=True)
                 return
 
-            finances = await get_user_finances(self.bot.pool, self.user_id)
-            balance = finances.get("checking_account_balance", 0)
-
-            if balance < item['cost']:
-                await interaction.response.send_message(
-                    "💸 You can’t afford that! Get your bread up. Or just buy bread.",
-                    ephemeral=True
-                )
-                return
-
-            new_balance = balance - item['cost']
-            await upsert_user_finances(self.bot.pool, self.user_id, {
-                "checking_account_balance": new_balance,
-                "savings_account_balance": finances.get("savings_account_balance", 0),
-                "debt_balance": finances.get("debt_balance", 0),
-                "last_paycheck_claimed": finances.get("last_paycheck_claimed"),
-            })
-            print(f"[DEBUG] User {self.user_id} is trying to add item to stash: {item}")
+            total_cost = item['cost'] * quantity
+            print(f"[DEBUG] User {self.user_id} is trying to add {quantity}x item to stash: {item}")
 
             try:
-                await add_grocery_to_stash(self.bot.pool, self.user_id, item)
+                # Charges total_cost in the same transaction as the fridge update
+                item_quantity, fridge_total = await add_grocery_to_stash(
+                    self.bot.pool, self.user_id, item, quantity=quantity, cost=total_cost
+                )
             except ValueError as e:
                 await interaction.response.send_message(str(e), ephemeral=True)
                 return
@@ -129,7 +125,8 @@ class GroceryMarketView(View):
                 return
 
             await interaction.response.send_message(
-                f"{item['emoji']} **{item['name']}** added to your stash for ${item['cost']:,}!",
+                f"{quantity}x {item['emoji']} **{item['name']}** added to your stash for ${total_cost:,}! "
+                f"(You now have {item_quantity}, fridge {fridge_total}/{GROCERY_FRIDGE_CAP})",
                 ephemeral=True
             )
 
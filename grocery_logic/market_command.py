@@ -4,20 +4,30 @@ from discord import app_commands, Interaction
 from discord.ui import View, Button, Select
 import asyncio
 
-ITEMS_PER_PAGE = 20
+from grocery_logic.grocery_catalog import get_market_catalog
 
-class ItemButton(Button):
-    def __init__(self, item, user_id, bot):
-        super().__init__(label=f"Accept (${item['cost']})", style=discord.ButtonStyle.success)
-        self.item = item
-        self.user_id = user_id
-        self.bot = bot
+ITEMS_PER_PAGE = 20  # Discord allows at most 25 options in the item select
+
+class ItemSelect(Select):
+    def __init__(self, control_view: "ControlView", page_items):
+        self.control_view = control_view
+        self.page_items = page_items
+        options = [
+            discord.SelectOption(
+                label=f"{item['name']} (${item['cost']})"[:100],
+                emoji=item['emoji'] or None,
+                value=str(i)
+            )
+            for i, item in enumerate(page_items)
+        ]
+        super().__init__(placeholder="Pick an item to buy...", options=options, row=1)
 
     async def callback(self, interaction: Interaction):
-        if interaction.user.id != self.user_id:
+        if interaction.user.id != self.control_view.user_id:
             await interaction.response.send_message("This isn’t your market view.", ephemeral=True)
             return
-        await interaction.response.send_message(f"Bought {self.item['emoji']} **{self.item['name']}** for ${self.item['cost']}!", ephemeral=True)
+        item = self.page_items[int(self.values[0])]
+        await interaction.response.send_message(f"Bought {item['emoji']} **{item['name']}** for ${item['cost']}!", ephemeral=True)
 
 
 class CategorySelect(Select):
@@ -35,86 +45,72 @@ class CategorySelect(Select):
             return
         self.control_view.current_category_index = int(self.values[0])
         self.control_view.current_page = 0
-        await self.control_view.send_item_messages()
-        await interaction.response.defer()
+        await self.control_view.render(interaction)
 
 
 class ControlView(View):
-    def __init__(self, user_id, bot, categories_with_items, channel, main_message):
+    """Whole market page in one message; navigation edits that message in place."""
+
+    def __init__(self, user_id, bot, categories_with_items):
         super().__init__(timeout=300)
         self.user_id = user_id
         self.bot = bot
         self.categories_with_items = categories_with_items
         self.current_category_index = 0
         self.current_page = 0
-        self.channel = channel
-        self.main_message = main_message
-        self.item_messages = []
+        self.interaction = None
 
-        self.prev_button = Button(label="⬅️ Prev", style=discord.ButtonStyle.secondary)
-        self.next_button = Button(label="Next ➡️", style=discord.ButtonStyle.secondary)
+        self.prev_button = Button(label="⬅️ Prev", style=discord.ButtonStyle.secondary, row=2)
+        self.next_button = Button(label="Next ➡️", style=discord.ButtonStyle.secondary, row=2)
         self.prev_button.callback = self.prev_page
         self.next_button.callback = self.next_page
 
         self.category_select = CategorySelect(self)
-        self.add_item(self.category_select)
-
-    def build_nav_view(self):
-        view = View()
-        self.prev_button.disabled = self.current_page == 0
-        category_name, groceries = self.categories_with_items[self.current_category_index]
-        total_items = len(groceries)
-        max_page = max(0, (total_items - 1) // ITEMS_PER_PAGE)
-        self.next_button.disabled = self.current_page == max_page
-        view.add_item(self.prev_button)
-        view.add_item(self.next_button)
-        return view
-
-    async def send_item_messages(self):
-        for msg in self.item_messages:
-            try:
-                await msg.delete()
-            except:
-                pass
-        self.item_messages = []
+        self.build_components()
 
-        if hasattr(self, 'footer_message') and self.footer_message:
-            try:
-                await self.footer_message.delete()
-            except:
-                pass
-            self.footer_message = None
+    def max_page(self):
+        _, groceries = self.categories_with_items[self.current_category_index]
+        return max(0, (len(groceries) - 1) // ITEMS_PER_PAGE)
 
-        category_name, groceries = self.categories_with_items[self.current_category_index]
-        total_items = len(groceries)
-        max_page = max(0, (total_items - 1) // ITEMS_PER_PAGE)
+    def page_items(self):
+        _, groceries = self.categories_with_items[self.current_category_index]
         start = self.current_page * ITEMS_PER_PAGE
-        end = start + ITEMS_PER_PAGE
-        page_items = groceries[start:end]
-
-        for idx, item in enumerate(page_items, start=1 + self.current_page * ITEMS_PER_PAGE):
-            content = (
-                f"{item['emoji']} {item['name']}\n"
-                f"├ Price: ${item['cost']}\n"
-                f"├ Expires: {item['shelf_life']} days\n"
-            )
-            view = View()
-            view.add_item(ItemButton(item, self.user_id, self.bot))
-            msg = await self.channel.send(content=content, view=view)
-            self.item_messages.append(msg)
+        return groceries[start:start + ITEMS_PER_PAGE]
 
+    def build_components(self):
+        self.clear_items()
+        self.add_item(self.category_select)
+
+        page_items = self.page_items()
+        if page_items:
+            self.add_item(ItemSelect(self, page_items))
 
-        footer_text = self.build_main_message_text()
-        footer_view = self.build_nav_view()
-        footer_view.add_item(self.category_select)
-        self.footer_message = await self.channel.send(content=footer_text, view=footer_view)
+        self.prev_button.disabled = self.current_page == 0
+        self.next_button.disabled = self.current_page == self.max_page()
+        self.add_item(self.prev_button)
+        self.add_item(self.next_button)
 
     def build_main_message_text(self):
         total_categories = len(self.categories_with_items)
-        category_name, groceries = self.categories_with_items[self.current_category_index]
-        total_items = len(groceries)
-        max_page = max(0, (total_items - 1) // ITEMS_PER_PAGE)
-        return f"🛒 **{category_name} Market**\nPage {self.current_page + 1} / {max_page + 1} — Category {self.current_category_index + 1} / {total_categories}"
+        category_name, _ = self.categories_with_items[self.current_category_index]
+
+        lines = [f"🛒 **{category_name} Market**", ""]
+        for item in self.page_items():
+            lines.append(f"{item['emoji']} **{item['name']}** — ${item['cost']} · expires in {item['shelf_life']} days")
+        if len(lines) == 2:
+            lines.append("Nothing on the shelves here right now.")
+        lines.append("")
+        lines.append(f"Page {self.current_page + 1} / {self.max_page() + 1} — Category {self.current_category_index + 1} / {total_categories}")
+        return "\n".join(lines)
+
+    async def send(self, interaction: Interaction):
+        self.interaction = interaction
+        await interaction.response.send_message(content=self.build_main_message_text(), view=self)
+
+    async def render(self, interaction: Interaction):
+        # One API call per navigation: answer the component interaction by editing its message
+        self.build_components()
+        await interaction.response.edit_message(content=self.build_main_message_text(), view=self)
 
     async def prev_page(self, interaction: Interaction):
         if interaction.user.id != self.user_id:
@@ -122,31 +118,24 @@ class ControlView(View):
             return
         if self.current_page > 0:
             self.current_page -= 1
-            await self.send_item_messages()
-            await interaction.response.defer()
+        await self.render(interaction)
 
     async def next_page(self, interaction: Interaction):
         if interaction.user.id != self.user_id:
             await interaction.response.send_message("This isn’t your market view.", ephemeral=True)
             return
-        _, groceries = self.categories_with_items[self.current_category_index]
-        total_items = len(groceries)
-        max_page = max(0, (total_items - 1) // ITEMS_PER_PAGE)
-        if self.current_page < max_page:
+        if self.current_page < self.max_page():
             self.current_page += 1
-            await self.send_item_messages()
-            await interaction.response.defer()
+        await self.render(interaction)
 
     async def on_timeout(self):
-        for msg in self.item_messages:
+        for child in self.children:
+            child.disabled = True
+        if self.interaction:
             try:
-                await msg.delete()
-            except:
+                await self.interaction.edit_original_response(view=self)
+            except discord.HTTPException:
                 pass
-        if self.main_message:
-            for child in self.children:
-                child.disabled = True
-            await self.main_message.edit(view=self)
 
 
 class GroceryCog(commands.Cog):
@@ -155,37 +144,13 @@ class GroceryCog(commands.Cog):
 
     @app_commands.command(name="market", description="Browse and buy groceries")
     async def market(self, interaction: discord.Interaction):
-        async with self.bot.pool.acquire() as conn:
-            categories = await conn.fetch("SELECT id, name, emoji FROM cd_grocery_category ORDER BY name")
-            categories_with_items = []
-            for category in categories:
-                groceries = await conn.fetch(
-                    """
-                    SELECT id, name, emoji, cost, shelf_life
-                    FROM cd_grocery_type
-                    WHERE category_id = $1
-                    ORDER BY name
-                    """,
-                    category["id"]
-                )
-                formatted_items = [
-                    {
-                        "id": item["id"],
-                        "emoji": item["emoji"],
-                        "name": item["name"],
-                        "cost": item["cost"],
-                        "shelf_life": item["shelf_life"],
-                        "category_id": category["id"],
-                    }
-                    for item in groceries
-                ]
-                categories_with_items.append((category["name"], formatted_items))
-
-        await interaction.response.defer(ephemeral=False)
-        main_msg = await interaction.followup.send("Loading market...", ephemeral=False)
-
-        view = ControlView(interaction.user.id, self.bot, categories_with_items, interaction.channel, main_msg)
-        await view.send_item_messages()
+        categories_with_items = get_market_catalog()
+        if not categories_with_items:
+            await interaction.response.send_message("🛒 The market is closed — no groceries are stocked right now.", ephemeral=True)
+            return
+
+        view = ControlView(interaction.user.id, self.bot, categories_with_items)
+        await view.send(interaction)
 
 
 async def setup(bot: commands.Bot):
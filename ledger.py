@@ -0,0 +1,123 @@
+# ledger.py
+# Append-only record of every checking-account movement (user_ledger).
+#
+# finance.py calls `ledger.record(...)` after each successful balance change.
+# Rows are buffered in memory and written with a single COPY every
+# LEDGER_FLUSH_INTERVAL_MS or once LEDGER_FLUSH_MAX_ROWS are queued, so
+# auditing never adds a round trip to the command that moved the money.
+
+import asyncio
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import metrics
+from perf import set_tag
+from config import LEDGER_FLUSH_INTERVAL_MS, LEDGER_FLUSH_MAX_ROWS
+
+LEDGER_COLUMNS = ("user_id", "delta", "balance_after", "reason", "source", "created_at")
+
+
+def _money(value):
+    if value is None:
+        return None
+    return value if isinstance(value, Decimal) else Decimal(str(value))
+
+
+class LedgerWriter:
+    def __init__(self, flush_interval_ms: int, max_rows: int):
+        self.flush_interval = flush_interval_ms / 1000
+        self.max_rows = max_rows
+        # Rows beyond this are dropped (and counted) if the DB is unreachable for a long time.
+        self.max_buffered = max_rows * 50
+        self.pool = None
+        self._buffer = []
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task = None
+
+    def start(self, pool):
+        self.pool = pool
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+            print(f"✅ Ledger writer started (flush every {self.flush_interval * 1000:.0f}ms or {self.max_rows} rows).")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    def record(self, user_id: int, delta, balance_after, reason: str, source: str | None = None):
+        if len(self._buffer) >= self.max_buffered:
+            metrics.inc("ledger_rows_dropped")
+            print(f"❌ Ledger buffer full, dropping entry for user {user_id} ({reason})")
+            return
+
+        self._buffer.append((
+            user_id,
+            _money(delta),
+            _money(balance_after),
+            reason,
+            source,
+            datetime.now(timezone.utc),
+        ))
+        metrics.set_gauge("ledger_buffered_rows", len(self._buffer))
+        if len(self._buffer) >= self.max_rows:
+            self._wakeup.set()
+
+    async def flush(self):
+        async with self._flush_lock:
+            if not self._buffer or self.pool is None:
+                return 0
+
+            rows, self._buffer = self._buffer, []
+            try:
+                async with self.pool.acquire() as conn:
+                    await conn.copy_records_to_table("user_ledger", records=rows, columns=LEDGER_COLUMNS)
+            except Exception as e:
+                print(f"❌ Ledger flush of {len(rows)} rows failed, will retry: {e}")
+                metrics.inc("ledger_flush_errors")
+                # Put them back in front of anything recorded meanwhile, within the buffer bound
+                keep = max(0, self.max_buffered - len(self._buffer))
+                if len(rows) > keep:
+                    metrics.inc("ledger_rows_dropped", len(rows) - keep)
+                    print(f"❌ Ledger buffer full, dropping {len(rows) - keep} entries")
+                self._buffer[:0] = rows[:keep]
+                return 0
+            finally:
+                metrics.set_gauge("ledger_buffered_rows", len(self._buffer))
+
+            metrics.inc("ledger_rows_written", len(rows))
+            return len(rows)
+
+    async def _run(self):
+        set_tag("ledger_flush")
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+
+ledger = LedgerWriter(LEDGER_FLUSH_INTERVAL_MS, LEDGER_FLUSH_MAX_ROWS)
+
+
+async def fetch_ledger_page(pool, user_id: int, before_id: int | None = None, limit: int = 10):
+    """Newest-first page of a user's ledger; pass the last row's id as before_id for the next page."""
+    return await pool.fetch(
+        """
+        SELECT id, delta, balance_after, reason, source, created_at
+        FROM user_ledger
+        WHERE user_id = $1
+          AND ($2::BIGINT IS NULL OR id < $2)
+        ORDER BY id DESC
+        LIMIT $3
+        """,
+        user_id, before_id, limit
+    )
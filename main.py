@@ -1,76 +1,85 @@
 # --- Standard Library ---
 import os
-import ssl
 import json
 import asyncio
 from datetime import datetime
 from collections import defaultdict
 
+# Imported first so the boot waterfall includes everything below
+from startup import startup, load_extensions
+
 # --- Third-Party ---
-import asyncpg
 import discord
 from discord.ext import commands
 from discord import app_commands
 
-from db_user import add_unique_constraint
-
 # --- Local Imports ---
-from config import DISCORD_BOT_TOKEN, DATABASE_URL
-from db_pool import init_db
+from config import DISCORD_BOT_TOKEN, METRICS_PORT, DEV_GUILD_ID
+from command_sync import sync_command_tree
+from db_pool import create_pool, get_pool, close_pool
+from migrate import run_migrations
 from embeds import embed_message, COLOR_RED
-from views import TravelButtons  # renamed import to match change
 
 # New import for user DB functions
 from db_user import ensure_user_exists
+from user_cache import warm_known_users
+from ledger import ledger
+from Easter_eggs.button_presses import presses
+from reference_data import catalog
+import metrics
+from perf import set_tag
 
 # Rename imports to avoid name conflicts
 from Bot_commands.commands import register_commands as register_general_commands
 from Bot_commands.travel_command import register_commands as register_travel_commands
 from Bot_commands.lifecheck_command import register_commands as register_lifecheck_commands
-
-from data_tier import (
-    seed_grocery_types,
-    seed_grocery_categories,
-    
-  
-)
-
-import globals
+from Bot_commands.perf_command import register_commands as register_perf_commands, TaggedCommandTree
 
 # Bot Setup
 intents = discord.Intents.default()
 intents.message_content = True
 intents.members = True  # <<< Needed to receive member info and join events!
-bot = commands.Bot(command_prefix="!", intents=intents)
+bot = commands.Bot(command_prefix="!", intents=intents, tree_cls=TaggedCommandTree)
 tree = bot.tree
 
 
 
 async def setup_database():
-    await init_db(globals.pool)
-    await seed_grocery_categories(globals.pool)
-    await seed_grocery_types(globals.pool)
-    
-
-
-
-
-async def create_pool():
-    ssl_context = ssl.create_default_context()
-    ssl_context.check_hostname = False
-    ssl_context.verify_mode = ssl.CERT_NONE
-    globals.pool = await asyncpg.create_pool(DATABASE_URL, ssl=ssl_context)
-    bot.pool = globals.pool  # Make pool accessible to cogs via bot.pool
-    print("✅ Database connection pool created.")
+    pool = get_pool()
+    with startup.phase("migrations"):
+        await run_migrations(pool)  # also seeds the grocery catalog on first run
+    with startup.phase("catalog"):
+        await catalog.start(pool)
+    with startup.phase("known users"):
+        await warm_known_users(pool)
+    ledger.start(pool)
+    presses.start(pool)
 
 
 # Entrypoint
 async def main():
-    await create_pool()
-    await add_unique_constraint()
+    startup.mark("imports")
+    with startup.phase("create_pool"):
+        bot.pool = await create_pool()  # Cogs still reach it via bot.pool
     await setup_database()
+    metrics_server = None
+    if METRICS_PORT:
+        try:
+            metrics_server = await metrics.start_server("127.0.0.1", METRICS_PORT)
+        except OSError as e:
+            # e.g. another instance still holds the port during a rolling restart
+            print(f"⚠️ Metrics endpoint disabled, could not bind port {METRICS_PORT}: {e}")
     print("✅ Starting bot...")
-    await bot.start(DISCORD_BOT_TOKEN)
+    try:
+        await bot.start(DISCORD_BOT_TOKEN)
+    finally:
+        if metrics_server is not None:
+            metrics_server.close()
+        # Write out any buffered press counts and ledger rows before the pool goes away
+        await presses.stop()
+        await ledger.stop()
+        await catalog.stop()
+        await close_pool()
 
 
 @bot.tree.error
@@ -85,6 +94,12 @@ async def on_app_command_error(interaction: discord.Interaction, error):
         print(f"Failed to send error message: {e}")
 
 
+@bot.before_invoke
+async def tag_prefix_command(ctx):
+    # Prefix commands skip the app command tree; tag their queries here (see perf.py)
+    set_tag(ctx.command.qualified_name)
+
+
 @bot.event
 async def on_ready():
     print(f"✅ Logged in as {bot.user} (ID: {bot.user.id})")
@@ -93,32 +108,27 @@ async def on_ready():
 @bot.event
 async def setup_hook():
     print("🛠️ setup_hook starting...")
+    startup.mark("discord login")
 
     # Register commands from all modules
-    register_general_commands(tree)
-    register_travel_commands(tree)
-    await register_lifecheck_commands(bot)
-
-    # Load your cog extensions - extensions can access pool via bot.pool
-    await bot.load_extension("Bot_commands.bank_commands")
-    await bot.load_extension("Bot_occupations.occupations_commands")
-    await bot.load_extension("Bot_occupations.career_path_command")
-    await bot.load_extension("Easter_eggs.secretbutton")
-    await bot.load_extension("Achievements.user_achievements")
-    await bot.load_extension("crimes.crime_command")
-    await bot.load_extension("grocery_logic.market_command")
-
-
+    with startup.phase("register commands"):
+        register_general_commands(tree)
+        register_travel_commands(tree)
+        register_perf_commands(tree)
+        await register_lifecheck_commands(bot)
 
-    
+    # Load your cog extensions (startup.EXTENSIONS) - extensions can access pool via bot.pool
+    await load_extensions(bot)
 
+    # Every command is registered by now; only talk to Discord if the tree changed
     try:
-        synced = await tree.sync()
-        print(f"✅ Synced {len(synced)} slash commands.")
+        with startup.phase("command sync"):
+            await sync_command_tree(tree, get_pool(), DEV_GUILD_ID)
     except Exception as e:
         print(f"❌ Error syncing commands in setup_hook: {e}")
 
     print("🛠️ setup_hook finished.")
+    startup.print_waterfall()
 
 
 @bot.event
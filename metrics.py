@@ -0,0 +1,139 @@
+# metrics.py
+# In-process counters, gauges and latency histograms. Everything here is plain
+# Python so any module can bump a counter without awaiting anything;
+# render_text() produces the Prometheus-style text that the metrics scraper
+# reads, served on localhost by start_server().
+
+import asyncio
+import bisect
+import threading
+
+_lock = threading.Lock()
+_counters: dict[str, float] = {}
+_gauges: dict[str, float] = {}
+_histograms: dict[tuple, "Histogram"] = {}  # (name, ((label, value), ...)) -> Histogram
+
+# Seconds; sized for DB calls (sub-millisecond lookups up to a stuck nightly job)
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)  # last slot is +Inf
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(BUCKETS, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th observation (max for the +Inf bucket)."""
+        target = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if n and seen >= target:
+                return BUCKETS[i] if i < len(BUCKETS) else self.max
+        return 0.0
+
+    def copy(self) -> "Histogram":
+        other = Histogram()
+        other.counts = list(self.counts)
+        other.count, other.total, other.max = self.count, self.total, self.max
+        return other
+
+
+def inc(name: str, amount: float = 1):
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + amount
+
+
+def set_gauge(name: str, value: float):
+    with _lock:
+        _gauges[name] = value
+
+
+def observe(name: str, value: float, **labels):
+    key = (name, tuple(sorted(labels.items())))
+    with _lock:
+        hist = _histograms.get(key)
+        if hist is None:
+            hist = _histograms[key] = Histogram()
+        hist.observe(value)
+
+
+def histograms(name: str) -> list[tuple[dict, Histogram]]:
+    """Copies of every labelled histogram recorded under `name`."""
+    with _lock:
+        return [(dict(labels), hist.copy()) for (n, labels), hist in _histograms.items() if n == name]
+
+
+def get(name: str, default: float = 0):
+    with _lock:
+        if name in _counters:
+            return _counters[name]
+        return _gauges.get(name, default)
+
+
+def snapshot() -> dict:
+    with _lock:
+        return {"counters": dict(_counters), "gauges": dict(_gauges)}
+
+
+def render_text() -> str:
+    snap = snapshot()
+    lines = []
+    for name, value in sorted(snap["counters"].items()):
+        lines.append(f"# TYPE {name} counter")
+        lines.append(f"{name} {value}")
+    for name, value in sorted(snap["gauges"].items()):
+        lines.append(f"# TYPE {name} gauge")
+        lines.append(f"{name} {value}")
+
+    with _lock:
+        hists = sorted(((key, hist.copy()) for key, hist in _histograms.items()), key=lambda item: item[0])
+    typed = set()
+    for (name, labels), hist in hists:
+        if name not in typed:
+            lines.append(f"# TYPE {name} histogram")
+            typed.add(name)
+        label_text = ",".join(f'{k}="{v}"' for k, v in labels)
+        prefix = label_text + "," if label_text else ""
+        cumulative = 0
+        for bound, n in zip(BUCKETS + ("+Inf",), hist.counts):
+            cumulative += n
+            lines.append(f'{name}_bucket{{{prefix}le="{bound}"}} {cumulative}')
+        lines.append(f"{name}_sum{{{label_text}}} {hist.total}")
+        lines.append(f"{name}_count{{{label_text}}} {hist.count}")
+    return "\n".join(lines) + "\n"
+
+
+async def start_server(host: str, port: int):
+    """Serve render_text() over plain HTTP. Bind to localhost; there is no auth."""
+    async def handle(reader, writer):
+        try:
+            # Whatever the request is, the answer is the metrics page
+            await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), timeout=5)
+            body = render_text().encode()
+            writer.write(
+                b"HTTP/1.0 200 OK\r\n"
+                b"Content-Type: text/plain; version=0.0.4\r\n"
+                + f"Content-Length: {len(body)}\r\n\r\n".encode()
+                + body
+            )
+            await writer.drain()
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle, host, port)
+    print(f"📈 Metrics endpoint on http://{host}:{port}/metrics")
+    return server
@@ -0,0 +1,153 @@
+# migrate.py
+# Versioned schema migrations.
+#
+# Files in migrations/ are named NNNN_description.sql or NNNN_description.py
+# and applied in version order; schema_version records what has run. A .py
+# migration defines `async def up(conn)`. Each migration runs in its own
+# transaction together with its schema_version row, unless its first line is
+#
+#     -- migrate: no-transaction
+#
+# or, for a .py migration, it sets IN_TRANSACTION = False (needed for CREATE
+# INDEX CONCURRENTLY). Such .sql files are split on ";" and run one statement
+# at a time, so keep them to plain statements. Runners on several machines
+# take a Postgres advisory lock, so only one applies anything. When nothing is
+# pending, startup costs a single SELECT.
+#
+#   python migrate.py    apply pending migrations and exit
+
+import asyncio
+import importlib.util
+import os
+import re
+
+import asyncpg
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "migrations")
+MIGRATION_LOCK_KEY = "lifehustle:schema_migrations"
+NO_TRANSACTION_HEADER = "-- migrate: no-transaction"
+
+_FILE_PATTERN = re.compile(r"^(\d+)_(\w+)\.(sql|py)$")
+
+
+class Migration:
+    def __init__(self, version: int, name: str, path: str):
+        self.version = version
+        self.name = name
+        self.path = path
+        self._module = None
+
+    @property
+    def module(self):
+        if self._module is None:
+            spec = importlib.util.spec_from_file_location(f"migrations.m{self.version:04d}", self.path)
+            self._module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(self._module)
+        return self._module
+
+    @property
+    def in_transaction(self) -> bool:
+        if not self.path.endswith(".sql"):
+            return getattr(self.module, "IN_TRANSACTION", True)
+        with open(self.path, encoding="utf-8") as f:
+            return f.readline().strip().lower() != NO_TRANSACTION_HEADER
+
+    async def apply(self, conn):
+        if self.path.endswith(".sql"):
+            with open(self.path, encoding="utf-8") as f:
+                sql = f.read()
+            if self.in_transaction:
+                await conn.execute(sql)
+                return
+            # A multi-statement string would run as one implicit transaction
+            for statement in sql.split(";"):
+                if _strip_comments(statement):
+                    await conn.execute(statement)
+            return
+        await self.module.up(conn)
+
+
+def _strip_comments(sql: str) -> str:
+    return "\n".join(line for line in sql.splitlines() if not line.strip().startswith("--")).strip()
+
+
+def discover_migrations(directory: str = MIGRATIONS_DIR) -> list[Migration]:
+    migrations = {}
+    for filename in os.listdir(directory):
+        match = _FILE_PATTERN.match(filename)
+        if not match:
+            continue
+        version = int(match.group(1))
+        if version in migrations:
+            raise RuntimeError(f"Two migrations share version {version}: {migrations[version].path} and {filename}")
+        migrations[version] = Migration(version, match.group(2), os.path.join(directory, filename))
+    return [migrations[v] for v in sorted(migrations)]
+
+
+async def current_version(conn) -> int:
+    try:
+        return await conn.fetchval("SELECT COALESCE(MAX(version), 0) FROM schema_version")
+    except asyncpg.exceptions.UndefinedTableError:
+        return 0
+
+
+async def run_migrations(pool, migrations: list[Migration] | None = None) -> int:
+    """Apply pending migrations; returns how many ran."""
+    migrations = discover_migrations() if migrations is None else migrations
+    latest = migrations[-1].version if migrations else 0
+
+    async with pool.acquire() as conn:
+        # Warm restart: one round trip and we're done
+        if await current_version(conn) >= latest:
+            return 0
+
+        # Migrations and waiting on another instance's lock may outlast the interactive statement_timeout
+        await conn.execute("SET statement_timeout = 0")
+        await conn.execute("SELECT pg_advisory_lock(hashtextextended($1, 0))", MIGRATION_LOCK_KEY)
+        try:
+            await conn.execute("""
+                CREATE TABLE IF NOT EXISTS schema_version (
+                    version INTEGER PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    applied_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+                )
+            """)
+            # Re-read under the lock: another instance may have applied some already
+            applied = {row["version"] for row in await conn.fetch("SELECT version FROM schema_version")}
+            pending = [m for m in migrations if m.version not in applied]
+
+            for migration in pending:
+                print(f"🧱 Applying migration {migration.version:04d}_{migration.name}...")
+                if migration.in_transaction:
+                    async with conn.transaction():
+                        await migration.apply(conn)
+                        await _mark_applied(conn, migration)
+                else:
+                    await migration.apply(conn)
+                    await _mark_applied(conn, migration)
+            print(f"✅ Schema at version {latest} ({len(pending)} migration(s) applied).")
+            return len(pending)
+        finally:
+            await conn.execute("SELECT pg_advisory_unlock(hashtextextended($1, 0))", MIGRATION_LOCK_KEY)
+            await conn.execute("RESET statement_timeout")
+
+
+async def _mark_applied(conn, migration: Migration):
+    await conn.execute(
+        "INSERT INTO schema_version (version, name) VALUES ($1, $2)",
+        migration.version, migration.name
+    )
+
+
+async def main():
+    from db_pool import create_pool, close_pool
+
+    pool = await create_pool()
+    try:
+        await run_migrations(pool)
+    finally:
+        await close_pool()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,16 @@
+-- users is created by the original schema; make sure it exists and that
+-- ensure_user_exists can upsert on (user_id, guild_id).
+CREATE TABLE IF NOT EXISTS users (
+    user_id BIGINT PRIMARY KEY,
+    user_name TEXT,
+    last_seen TIMESTAMP
+);
+
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_constraint WHERE conname = 'users_user_id_guild_id_unique'
+    ) THEN
+        ALTER TABLE users ADD CONSTRAINT users_user_id_guild_id_unique UNIQUE (user_id, guild_id);
+    END IF;
+END $$;
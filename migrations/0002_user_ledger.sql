@@ -0,0 +1,13 @@
+-- Append-only money ledger, written in batches by ledger.LedgerWriter
+CREATE TABLE IF NOT EXISTS user_ledger (
+    id BIGSERIAL PRIMARY KEY,
+    user_id BIGINT NOT NULL,
+    delta NUMERIC(14, 2) NOT NULL,
+    balance_after NUMERIC(14, 2),
+    reason TEXT NOT NULL,
+    source TEXT,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS user_ledger_user_id_id_idx
+ON user_ledger (user_id, id DESC);
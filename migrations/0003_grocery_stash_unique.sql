@@ -0,0 +1,24 @@
+-- One live stash row per (user, grocery type) so add_grocery_to_stash can upsert.
+-- Merge any duplicates left by the old read-then-write path first.
+WITH dupes AS (
+    SELECT user_id, grocery_type_id, MIN(id) AS keep_id, SUM(quantity) AS total
+    FROM user_grocery_inventory
+    WHERE sold_at IS NULL
+    GROUP BY user_id, grocery_type_id
+    HAVING COUNT(*) > 1
+), merged AS (
+    UPDATE user_grocery_inventory ugi
+    SET quantity = d.total
+    FROM dupes d
+    WHERE ugi.id = d.keep_id
+)
+DELETE FROM user_grocery_inventory ugi
+USING dupes d
+WHERE ugi.user_id = d.user_id
+  AND ugi.grocery_type_id = d.grocery_type_id
+  AND ugi.sold_at IS NULL
+  AND ugi.id <> d.keep_id;
+
+CREATE UNIQUE INDEX IF NOT EXISTS user_grocery_inventory_live_item_uidx
+ON user_grocery_inventory (user_id, grocery_type_id)
+WHERE sold_at IS NULL;
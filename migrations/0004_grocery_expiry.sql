@@ -0,0 +1,11 @@
+-- Expired groceries are moved to user_grocery_inventory_expired in batches by grocery_logic.grocery_sweeper
+CREATE INDEX IF NOT EXISTS user_grocery_inventory_live_expiration_idx
+ON user_grocery_inventory (expiration_date)
+WHERE sold_at IS NULL;
+
+CREATE TABLE IF NOT EXISTS user_grocery_inventory_expired (
+    LIKE user_grocery_inventory INCLUDING DEFAULTS
+);
+
+ALTER TABLE user_grocery_inventory_expired
+ADD COLUMN IF NOT EXISTS swept_at TIMESTAMPTZ NOT NULL DEFAULT NOW();
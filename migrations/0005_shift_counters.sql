@@ -0,0 +1,38 @@
+-- Per-day shift counters (see shift_log.py); reads are a primary-key lookup
+CREATE TABLE IF NOT EXISTS user_shift_daily (
+    user_id BIGINT NOT NULL,
+    day DATE NOT NULL,
+    shifts INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (user_id, day)
+);
+
+-- Append-only clock-in history, one partition per month; old months are dropped, never deleted
+CREATE TABLE IF NOT EXISTS user_work_log_history (
+    user_id BIGINT NOT NULL,
+    work_timestamp TIMESTAMPTZ NOT NULL DEFAULT NOW()
+) PARTITION BY RANGE (work_timestamp);
+
+-- This month and next, named like shift_log._partition_name; the nightly job keeps rolling forward
+DO $$
+DECLARE
+    this_month DATE := date_trunc('month', NOW() AT TIME ZONE 'UTC')::date;
+    month_start DATE;
+BEGIN
+    FOR i IN 0..1 LOOP
+        month_start := (this_month + make_interval(months => i))::date;
+        EXECUTE format(
+            'CREATE TABLE IF NOT EXISTS %I PARTITION OF user_work_log_history FOR VALUES FROM (%L) TO (%L)',
+            'user_work_log_history_y' || to_char(month_start, 'YYYY') || 'm' || to_char(month_start, 'MM'),
+            month_start,
+            (month_start + INTERVAL '1 month')::date
+        );
+    END LOOP;
+END $$;
+
+-- Carry over today's shifts from the old user_work_log so counts don't reset mid-day
+INSERT INTO user_shift_daily (user_id, day, shifts)
+SELECT user_id, (work_timestamp AT TIME ZONE 'UTC')::date, COUNT(*)
+FROM user_work_log
+WHERE work_timestamp >= date_trunc('day', NOW() AT TIME ZONE 'UTC')
+GROUP BY 1, 2
+ON CONFLICT (user_id, day) DO NOTHING;
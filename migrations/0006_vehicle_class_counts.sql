@@ -0,0 +1,44 @@
+-- Per-user vehicle counts by class, so the ownership limit check is one primary-key lookup
+CREATE TABLE IF NOT EXISTS user_vehicle_class_counts (
+    user_id BIGINT NOT NULL,
+    class_type TEXT NOT NULL,
+    vehicles INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (user_id, class_type)
+);
+
+CREATE OR REPLACE FUNCTION maintain_user_vehicle_class_counts() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('DELETE', 'UPDATE') THEN
+        UPDATE user_vehicle_class_counts c
+        SET vehicles = c.vehicles - 1
+        FROM cd_vehicle_type t
+        WHERE t.id = OLD.vehicle_type_id
+          AND c.user_id = OLD.user_id
+          AND c.class_type = LOWER(t.class_type);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO user_vehicle_class_counts (user_id, class_type, vehicles)
+        SELECT NEW.user_id, LOWER(t.class_type), 1
+        FROM cd_vehicle_type t
+        WHERE t.id = NEW.vehicle_type_id AND t.class_type IS NOT NULL
+        ON CONFLICT (user_id, class_type) DO UPDATE
+        SET vehicles = user_vehicle_class_counts.vehicles + 1;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Rebuild the counts under a lock so nothing slips in between the recount and the trigger
+LOCK TABLE user_vehicle_inventory IN SHARE ROW EXCLUSIVE MODE;
+DROP TRIGGER IF EXISTS user_vehicle_class_counts_trg ON user_vehicle_inventory;
+CREATE TRIGGER user_vehicle_class_counts_trg
+AFTER INSERT OR DELETE OR UPDATE OF user_id, vehicle_type_id ON user_vehicle_inventory
+FOR EACH ROW EXECUTE FUNCTION maintain_user_vehicle_class_counts();
+
+DELETE FROM user_vehicle_class_counts;
+INSERT INTO user_vehicle_class_counts (user_id, class_type, vehicles)
+SELECT uvi.user_id, LOWER(t.class_type), COUNT(*)
+FROM user_vehicle_inventory uvi
+JOIN cd_vehicle_type t ON t.id = uvi.vehicle_type_id
+WHERE t.class_type IS NOT NULL
+GROUP BY 1, 2;
@@ -0,0 +1,9 @@
+# Grocery categories and types; the rows themselves live in data_tier.py.
+# New groceries need a new migration that calls the seeders again (they skip existing names).
+
+from data_tier import seed_grocery_categories, seed_grocery_types
+
+
+async def up(conn):
+    await seed_grocery_categories(conn)
+    await seed_grocery_types(conn)
@@ -0,0 +1,6 @@
+-- Small key/value store for bot bookkeeping (e.g. command_sync's command tree hash)
+CREATE TABLE IF NOT EXISTS bot_state (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
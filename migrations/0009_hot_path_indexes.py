@@ -0,0 +1,34 @@
+# Indexes for the hot per-user predicates, built CONCURRENTLY so live traffic keeps writing.
+#
+# Left out on purpose because an existing index already covers them:
+#   user_grocery_inventory (user_id) WHERE sold_at IS NULL  -> user_grocery_inventory_live_item_uidx (0003)
+#   user_achievements (user_id)                             -> UNIQUE (user_id, achievement_id)
+#   user_work_log (user_id, work_timestamp)                 -> no longer read; see user_shift_daily (0005)
+#   cd_travel_summaries (travel_type)                       -> served from the catalog cache, never queried
+# scripts/explain_hot_queries.py checks that the hot statements use an index.
+
+IN_TRANSACTION = False
+
+INDEXES = {
+    # get_user_vehicles, the stash, sell-all (user_id) and /lifecheck's vehicle in use (user_id, vehicle_status)
+    "user_vehicle_inventory_user_id_status_idx": "user_vehicle_inventory (user_id, vehicle_status)",
+    # Snake breakroom helper lookup: occupation_id = 61 AND guild_id = $1
+    "users_occupation_id_guild_id_idx": "users (occupation_id, guild_id)",
+}
+
+
+async def up(conn):
+    for name, target in INDEXES.items():
+        # A failed concurrent build leaves an INVALID index that IF NOT EXISTS would then keep forever
+        valid = await conn.fetchval(
+            """
+            SELECT i.indisvalid
+            FROM pg_index i
+            JOIN pg_class c ON c.oid = i.indexrelid
+            WHERE c.relname = $1
+            """,
+            name
+        )
+        if valid is False:
+            await conn.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+        await conn.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {target}")
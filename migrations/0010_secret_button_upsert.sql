@@ -0,0 +1,27 @@
+-- Easter_eggs.button_presses flushes press counts with ON CONFLICT (user_id),
+-- which needs user_id to be unique.
+CREATE TABLE IF NOT EXISTS user_secret_button (
+    user_id BIGINT PRIMARY KEY,
+    times_pressed INTEGER NOT NULL DEFAULT 0,
+    last_used TIMESTAMP
+);
+
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1
+        FROM pg_index i
+        JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = i.indkey[0]
+        WHERE i.indrelid = 'user_secret_button'::regclass
+          AND i.indisunique
+          AND i.indnkeyatts = 1
+          AND a.attname = 'user_id'
+    ) THEN
+        -- The old check-then-insert could race; keep the furthest-along row per user
+        DELETE FROM user_secret_button a
+        USING user_secret_button b
+        WHERE a.user_id = b.user_id
+          AND (COALESCE(a.times_pressed, 0), a.ctid) < (COALESCE(b.times_pressed, 0), b.ctid);
+        CREATE UNIQUE INDEX user_secret_button_user_id_uidx ON user_secret_button (user_id);
+    END IF;
+END $$;
@@ -0,0 +1,168 @@
+# perf.py
+# Where the database time goes, broken down by command.
+#
+# db_pool wraps the asyncpg pool in InstrumentedPool, which records into
+# metrics histograms:
+#   db_pool_acquire_wait_seconds{tag}   time spent waiting for a free connection
+#   db_pool_hold_seconds{tag}           time a connection was checked out
+#   db_query_seconds{tag, site}         each execute/fetch*, per calling function
+#
+# `tag` is the slash command (set by Bot_commands.perf_command.TaggedCommandTree)
+# or a background loop that called set_tag(); anything else is "untagged",
+# e.g. button callbacks, whose `site` still says where the query came from.
+
+import contextlib
+import contextvars
+import sys
+import time
+
+import metrics
+
+_tag = contextvars.ContextVar("perf_tag", default="untagged")
+
+
+def current_tag() -> str:
+    return _tag.get()
+
+
+def set_tag(tag: str):
+    """Tag everything the current task does from here on; returns a token for reset_tag()."""
+    return _tag.set(tag)
+
+
+def reset_tag(token):
+    _tag.reset(token)
+
+
+@contextlib.contextmanager
+def tagged(tag: str):
+    token = _tag.set(tag)
+    try:
+        yield
+    finally:
+        _tag.reset(token)
+
+
+def _call_site() -> str:
+    # First frame outside this module, as "module.function"
+    frame = sys._getframe(1)
+    while frame is not None and frame.f_globals.get("__name__") == __name__:
+        frame = frame.f_back
+    if frame is None:
+        return "unknown"
+    return f"{frame.f_globals.get('__name__', '?')}.{frame.f_code.co_name}"
+
+
+class InstrumentedConnection:
+    """Times the query methods and hands everything else (transaction(), listeners...) to the real connection."""
+
+    __slots__ = ("raw", "_acquired_at", "_tag")
+
+    def __init__(self, raw, acquired_at: float, tag: str):
+        self.raw = raw
+        self._acquired_at = acquired_at
+        self._tag = tag
+
+    def __getattr__(self, name):
+        return getattr(self.raw, name)
+
+    async def _timed(self, method: str, args, kwargs):
+        site = _call_site()
+        started = time.perf_counter()
+        try:
+            return await getattr(self.raw, method)(*args, **kwargs)
+        finally:
+            metrics.observe("db_query_seconds", time.perf_counter() - started, tag=current_tag(), site=site)
+
+    async def execute(self, *args, **kwargs):
+        return await self._timed("execute", args, kwargs)
+
+    async def executemany(self, *args, **kwargs):
+        return await self._timed("executemany", args, kwargs)
+
+    async def fetch(self, *args, **kwargs):
+        return await self._timed("fetch", args, kwargs)
+
+    async def fetchrow(self, *args, **kwargs):
+        return await self._timed("fetchrow", args, kwargs)
+
+    async def fetchval(self, *args, **kwargs):
+        return await self._timed("fetchval", args, kwargs)
+
+    async def copy_records_to_table(self, *args, **kwargs):
+        return await self._timed("copy_records_to_table", args, kwargs)
+
+
+class _AcquireContext:
+    # Like asyncpg's: works with `async with pool.acquire()` and `conn = await pool.acquire()`
+    __slots__ = ("_pool", "_timeout", "_conn")
+
+    def __init__(self, pool, timeout):
+        self._pool = pool
+        self._timeout = timeout
+        self._conn = None
+
+    def __await__(self):
+        return self._pool._acquire(self._timeout).__await__()
+
+    async def __aenter__(self):
+        self._conn = await self._pool._acquire(self._timeout)
+        return self._conn
+
+    async def __aexit__(self, *exc):
+        conn, self._conn = self._conn, None
+        await self._pool.release(conn)
+
+
+class InstrumentedPool:
+    def __init__(self, pool):
+        self.raw = pool
+
+    def __getattr__(self, name):
+        return getattr(self.raw, name)
+
+    def acquire(self, *, timeout=None):
+        return _AcquireContext(self, timeout)
+
+    async def _acquire(self, timeout):
+        tag = current_tag()
+        started = time.perf_counter()
+        raw = await self.raw.acquire(timeout=timeout)
+        acquired = time.perf_counter()
+        metrics.observe("db_pool_acquire_wait_seconds", acquired - started, tag=tag)
+        self._update_gauges()
+        return InstrumentedConnection(raw, acquired, tag)
+
+    async def release(self, conn, *, timeout=None):
+        if isinstance(conn, InstrumentedConnection):
+            metrics.observe("db_pool_hold_seconds", time.perf_counter() - conn._acquired_at, tag=conn._tag)
+            conn = conn.raw
+        # A raw connection (e.g. from a termination listener) goes back untimed
+        await self.raw.release(conn, timeout=timeout)
+        self._update_gauges()
+
+    def _update_gauges(self):
+        size = self.raw.get_size()
+        metrics.set_gauge("db_pool_size", size)
+        metrics.set_gauge("db_pool_in_use", size - self.raw.get_idle_size())
+
+    # Pool-level shortcuts, routed through acquire() so they are timed too
+    async def execute(self, *args, **kwargs):
+        async with self.acquire() as conn:
+            return await conn.execute(*args, **kwargs)
+
+    async def executemany(self, *args, **kwargs):
+        async with self.acquire() as conn:
+            return await conn.executemany(*args, **kwargs)
+
+    async def fetch(self, *args, **kwargs):
+        async with self.acquire() as conn:
+            return await conn.fetch(*args, **kwargs)
+
+    async def fetchrow(self, *args, **kwargs):
+        async with self.acquire() as conn:
+            return await conn.fetchrow(*args, **kwargs)
+
+    async def fetchval(self, *args, **kwargs):
+        async with self.acquire() as conn:
+            return await conn.fetchval(*args, **kwargs)
@@ -0,0 +1,192 @@
+# reference_data.py
+# In-memory copy of the static cd_* catalog tables.
+#
+# Every table in CATALOG_TABLES is loaded once at startup into a tuple of
+# asyncpg Records. A statement-level trigger on each table sends
+# pg_notify('cd_catalog_changed', <table>) and the listener reloads just that
+# table, bumps its version and tells subscribers (see `on_refresh`).
+# Commands read from `catalog` and never query these tables directly.
+
+import asyncio
+from types import MappingProxyType
+
+import asyncpg
+
+import metrics
+from perf import tagged
+
+NOTIFY_CHANNEL = "cd_catalog_changed"
+
+CATALOG_TABLES = (
+    "cd_locations",
+    "cd_vehicle_type",
+    "cd_vehicle_condition",
+    "cd_vehicle_colors",
+    "cd_vehicle_appearance",
+    "cd_grocery_category",
+    "cd_grocery_type",
+    "cd_occupations",
+    "cd_travel_summaries",
+    "cd_user_achievements",
+)
+
+# Seconds to wait before re-attaching the listener after its connection drops
+LISTENER_RETRY_SECONDS = 5
+
+
+class ReferenceData:
+    def __init__(self, tables):
+        self.tables = tuple(tables)
+        self.pool = None
+        self._rows = {}
+        self._versions = {table: 0 for table in self.tables}
+        self._indexes = {}
+        self._subscribers = []
+        self._listen_conn = None
+        self._tasks = set()
+
+    # ---------- Reads ----------
+    def rows(self, table: str) -> tuple:
+        return self._rows.get(table, ())
+
+    def version(self, table: str) -> int:
+        return self._versions.get(table, 0)
+
+    def index(self, table: str, column: str):
+        """Read-only {value: row} map on `column`, rebuilt when the table's version changes."""
+        version = self.version(table)
+        cached = self._indexes.get((table, column))
+        if cached is None or cached[0] != version:
+            mapping = MappingProxyType({row[column]: row for row in self.rows(table)})
+            cached = (version, mapping)
+            self._indexes[(table, column)] = cached
+        return cached[1]
+
+    def get(self, table: str, column: str, value):
+        return self.index(table, column).get(value)
+
+    def on_refresh(self, callback):
+        """Register callback(table) to run after a table is (re)loaded."""
+        self._subscribers.append(callback)
+        return callback
+
+    # ---------- Loading ----------
+    async def start(self, pool):
+        self.pool = pool
+        async with pool.acquire() as conn:
+            await install_catalog_triggers(conn, self.tables)
+        await self.refresh()
+        await self._listen()
+
+    async def stop(self):
+        conn, self._listen_conn = self._listen_conn, None
+        if conn is not None:
+            try:
+                await conn.remove_listener(NOTIFY_CHANNEL, self._on_notify)
+            finally:
+                await self.pool.release(conn)
+
+    async def refresh(self, table: str | None = None):
+        tables = self.tables if table is None else (table,)
+        with tagged("catalog_refresh"):
+            await self._load(tables)
+
+    async def _load(self, tables):
+        async with self.pool.acquire() as conn:
+            for name in tables:
+                try:
+                    rows = await conn.fetch(f"SELECT * FROM {name} ORDER BY 1")
+                except asyncpg.exceptions.UndefinedTableError:
+                    print(f"⚠️ Catalog table {name} does not exist, skipping.")
+                    continue
+                self._rows[name] = tuple(rows)
+                self._versions[name] += 1
+                metrics.inc("catalog_reloads")
+                print(f"📚 Loaded {len(rows)} rows from {name} (v{self._versions[name]})")
+                for callback in self._subscribers:
+                    try:
+                        callback(name)
+                    except Exception as e:
+                        print(f"❌ Catalog subscriber failed for {name}: {e}")
+
+    # ---------- LISTEN/NOTIFY ----------
+    async def _listen(self):
+        conn = await self.pool.acquire()
+        try:
+            await conn.add_listener(NOTIFY_CHANNEL, self._on_notify)
+        except Exception:
+            await self.pool.release(conn)
+            raise
+        conn.add_termination_listener(self._on_listener_lost)
+        self._listen_conn = conn
+        print(f"✅ Listening on {NOTIFY_CHANNEL} for catalog changes.")
+
+    def _spawn(self, coro):
+        task = asyncio.get_running_loop().create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _on_notify(self, connection, pid, channel, payload):
+        if payload in self.tables:
+            print(f"🔔 Catalog change in {payload}, reloading.")
+            self._spawn(self.refresh(payload))
+
+    def _on_listener_lost(self, connection):
+        print("⚠️ Catalog listener connection lost, reconnecting.")
+        self._listen_conn = None
+        self._spawn(self._relisten(connection))
+
+    async def _relisten(self, lost_conn):
+        try:
+            await self.pool.release(lost_conn)
+        except Exception:
+            pass
+        while self._listen_conn is None:
+            await asyncio.sleep(LISTENER_RETRY_SECONDS)
+            try:
+                await self._listen()
+                # Anything could have changed while we weren't listening
+                await self.refresh()
+            except Exception as e:
+                print(f"❌ Failed to re-attach catalog listener: {e}")
+
+
+async def install_catalog_triggers(conn, tables):
+    # One catalog query on a warm restart; DDL (and its ACCESS EXCLUSIVE lock) only for missing triggers
+    missing = await conn.fetch(
+        """
+        SELECT t.name
+        FROM unnest($1::text[]) AS t(name)
+        WHERE to_regclass(t.name) IS NOT NULL
+          AND NOT EXISTS (
+              SELECT 1 FROM pg_trigger
+              WHERE tgrelid = to_regclass(t.name) AND tgname = 'cd_catalog_changed'
+          )
+        """,
+        list(tables)
+    )
+    if not missing:
+        return
+
+    await conn.execute(f"""
+        CREATE OR REPLACE FUNCTION notify_cd_catalog_changed() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify('{NOTIFY_CHANNEL}', TG_TABLE_NAME);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    for row in missing:
+        table = row["name"]
+        try:
+            await conn.execute(f"""
+                CREATE TRIGGER cd_catalog_changed
+                AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table}
+                FOR EACH STATEMENT EXECUTE FUNCTION notify_cd_catalog_changed()
+            """)
+            print(f"🔔 Installed change trigger on {table}")
+        except asyncpg.exceptions.DuplicateObjectError:
+            pass  # Another instance got there first
+
+
+catalog = ReferenceData(CATALOG_TABLES)
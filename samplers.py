@@ -0,0 +1,90 @@
+# samplers.py
+# O(1) weighted random picks (Walker/Vose alias method).
+#
+# AliasSampler is built once from (item, weight) pairs; every draw after that
+# is one random index plus one coin flip, no matter how many items there are.
+#
+# `samplers` keeps named groups of samplers that are derived from catalog
+# tables. A group is rebuilt whenever one of its tables is reloaded (see
+# reference_data.catalog.on_refresh), so callers never touch the database:
+#
+#     samplers.register("travel_outcomes", ("cd_travel_summaries",), build)
+#     row = samplers.sample("travel_outcomes", ("car", True))
+
+import random
+
+from reference_data import catalog
+
+
+class AliasSampler:
+    def __init__(self, items, weights):
+        pairs = [(item, float(weight)) for item, weight in zip(items, weights) if weight and weight > 0]
+        if not pairs:
+            raise ValueError("AliasSampler needs at least one positive weight.")
+
+        self.items = tuple(item for item, _ in pairs)
+        n = len(pairs)
+        total = sum(weight for _, weight in pairs)
+        scaled = [weight * n / total for _, weight in pairs]
+
+        self._prob = [1.0] * n
+        self._alias = list(range(n))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s = small.pop()
+            l = large.pop()
+            self._prob[s] = scaled[s]
+            self._alias[s] = l
+            scaled[l] = (scaled[l] + scaled[s]) - 1.0
+            (small if scaled[l] < 1.0 else large).append(l)
+        # Whatever is left is 1.0 up to float error
+        for i in small + large:
+            self._prob[i] = 1.0
+
+    @classmethod
+    def uniform(cls, items):
+        items = list(items)
+        return cls(items, [1] * len(items))
+
+    @classmethod
+    def from_mapping(cls, weights: dict):
+        return cls(list(weights.keys()), list(weights.values()))
+
+    def sample(self, rng=random):
+        i = rng.randrange(len(self.items))
+        return self.items[i] if rng.random() < self._prob[i] else self.items[self._alias[i]]
+
+    def __len__(self):
+        return len(self.items)
+
+
+class SamplerRegistry:
+    def __init__(self):
+        self._groups = {}   # name -> {key: AliasSampler}
+        self._builders = {}  # name -> (tables, build)
+
+    def register(self, name: str, tables, build):
+        """`build()` returns {key: AliasSampler}; it runs now and whenever one of `tables` reloads."""
+        self._builders[name] = (tuple(tables), build)
+        self._rebuild(name)
+
+    def sample(self, name: str, key, default=None):
+        sampler = self._groups.get(name, {}).get(key)
+        return sampler.sample() if sampler is not None else default
+
+    def _rebuild(self, name: str):
+        _, build = self._builders[name]
+        try:
+            self._groups[name] = build()
+        except Exception as e:
+            print(f"❌ Failed to build sampler group {name}: {e}")
+
+    def on_catalog_refresh(self, table: str):
+        for name, (tables, _) in self._builders.items():
+            if table in tables:
+                self._rebuild(name)
+
+
+samplers = SamplerRegistry()
+catalog.on_refresh(samplers.on_catalog_refresh)
@@ -0,0 +1,114 @@
+# explain_hot_queries.py
+# Regression check: every hot statement must be able to use an index.
+#
+# Runs EXPLAIN (not ANALYZE, nothing executes) on each statement in HOT_QUERIES
+# with enable_seqscan off. With sequential scans disabled the planner only
+# picks one when no usable index exists, so any "Seq Scan" in the plan means a
+# missing or unusable index. Exits 1 if any statement fails, so it can gate CI.
+# Point it at a migrated, seeded local database:
+#
+#   python scripts/explain_hot_queries.py
+#   python scripts/explain_hot_queries.py --migrate --verbose
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Bot_commands.lifecheck_command import VEHICLE_IN_USE_SQL  # noqa: E402
+from Bot_occupations.occupation_mini_games.snake_breakroom import HELPER_LOOKUP_SQL  # noqa: E402
+from db_pool import close_pool, create_pool  # noqa: E402
+from db_user import GET_USER_SQL, GROCERY_STASH_SQL, USER_ACHIEVEMENTS_SQL, VEHICLE_LIMIT_SQL  # noqa: E402
+from finance import CREDIT_SQL, DEBIT_SQL  # noqa: E402
+from migrate import run_migrations  # noqa: E402
+from shift_log import RECORD_SHIFT_SQL, SHIFTS_ON_SQL  # noqa: E402
+from travel_service import TRANSIT_TRIP_SQL  # noqa: E402
+from vehicle_logic import SELL_ALL_VEHICLES_SQL, USER_VEHICLES_SQL  # noqa: E402
+from vehicle_purchase import PURCHASE_VEHICLE_SQL  # noqa: E402
+
+USER_ID = 1
+GUILD_ID = 1
+
+# (label, sql, params); every statement is the constant its call site runs
+HOT_QUERIES = (
+    ("finance.credit", CREDIT_SQL, (USER_ID, 10)),
+    ("finance.debit", DEBIT_SQL, (USER_ID, 10, True)),
+    ("travel_service.transit_trip", TRANSIT_TRIP_SQL, (USER_ID, 10, 0, 1)),
+    ("vehicle_purchase.purchase_vehicle", PURCHASE_VEHICLE_SQL,
+     (USER_ID, "car", 1, 5, 100, 1, "Red", "Shiny", "ABC-123", "Brand New", 0, 0.85)),
+    ("db_user.can_user_own_vehicle", VEHICLE_LIMIT_SQL, (USER_ID, "car")),
+    ("vehicle_logic.liquidate_fleet", SELL_ALL_VEHICLES_SQL, (USER_ID,)),
+    ("shift_log.record_shift", RECORD_SHIFT_SQL, (USER_ID,)),
+    ("shift_log.shifts_on", SHIFTS_ON_SQL, (USER_ID, datetime.utcnow().date())),
+    ("vehicle_logic.get_user_vehicles", USER_VEHICLES_SQL, (USER_ID,)),
+    ("lifecheck vehicle in use", VEHICLE_IN_USE_SQL, (USER_ID,)),
+    ("db_user.get_grocery_stash", GROCERY_STASH_SQL, (USER_ID, datetime.utcnow())),
+    ("snake_breakroom helper lookup", HELPER_LOOKUP_SQL, (GUILD_ID, USER_ID)),
+    ("db_user.get_user_achievements", USER_ACHIEVEMENTS_SQL, (USER_ID,)),
+    ("db_user.get_user", GET_USER_SQL, (USER_ID,)),
+)
+
+
+def seq_scans(plan: dict) -> list[str]:
+    found = []
+    if plan.get("Node Type") == "Seq Scan":
+        found.append(plan.get("Relation Name", "?"))
+    for child in plan.get("Plans", ()):
+        found.extend(seq_scans(child))
+    return found
+
+
+async def explain(conn, sql, params):
+    tr = conn.transaction()
+    await tr.start()
+    try:
+        await conn.execute("SET LOCAL enable_seqscan = off")
+        raw = await conn.fetchval("EXPLAIN (FORMAT JSON) " + sql, *params)
+    finally:
+        await tr.rollback()
+    plan = raw if isinstance(raw, list) else json.loads(raw)
+    return plan[0]["Plan"]
+
+
+async def run(args):
+    pool = await create_pool()
+    failures = 0
+    try:
+        if args.migrate:
+            await run_migrations(pool)
+        async with pool.acquire() as conn:
+            for label, sql, params in HOT_QUERIES:
+                try:
+                    plan = await explain(conn, sql, params)
+                except Exception as e:
+                    failures += 1
+                    print(f"ERROR {label}: {e}")
+                    continue
+                scanned = seq_scans(plan)
+                if scanned:
+                    failures += 1
+                    print(f"FAIL  {label}: sequential scan on {', '.join(sorted(set(scanned)))}")
+                else:
+                    print(f"ok    {label}")
+                if args.verbose:
+                    print(json.dumps(plan, indent=2))
+    finally:
+        await close_pool()
+
+    print(f"\n{len(HOT_QUERIES) - failures}/{len(HOT_QUERIES)} hot statements use indexes.")
+    return 1 if failures else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fail if any hot statement falls back to a sequential scan.")
+    parser.add_argument("--migrate", action="store_true", help="apply pending migrations first")
+    parser.add_argument("--verbose", action="store_true", help="print every plan")
+    sys.exit(asyncio.run(run(parser.parse_args())))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+# pool_starvation.py
+# Load test: does /bank view stay responsive while many clock-ins are pending?
+#
+# Runs N clock-ins through the real CareerPath phase functions (start_shift,
+# shift_bonus, settle_shift) with a stubbed mini-game that waits `--think`
+# seconds, while a probe repeatedly runs the /bank view balance query and
+# records its latency. Two modes:
+#
+#   held   - the old clockin shape: one pool connection held from phase 1,
+#            across the mini-game, through settling pay
+#   phased - what CareerPath.clockin does now: phase 1 on its own checkout,
+#            no connection during the game, settle on a fresh checkout
+#
+# It writes: the clock-in users (ids after --user-id) are given --occupation-id,
+# and each clock-in logs a shift and pays them. Point it at a dev database.
+#
+#   python scripts/pool_starvation.py --mode held
+#   python scripts/pool_starvation.py --mode phased --clockins 50 --think 10
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Bot_occupations.career_path_command import settle_shift, shift_bonus, start_shift  # noqa: E402
+from db_pool import close_pool, create_pool  # noqa: E402
+from ledger import ledger  # noqa: E402
+
+BANK_VIEW_SQL = """
+    SELECT checking_account_balance, savings_account_balance
+    FROM user_finances
+    WHERE user_id = $1
+"""
+
+
+async def stub_minigame(think):
+    await asyncio.sleep(think)  # the player reading and clicking
+    return {"result": "neutral", "bonus": 0, "message": "stub"}
+
+
+async def clockin_held(pool, user_id, think):
+    async with pool.acquire() as conn:
+        shift, _ = await start_shift(conn, user_id)
+        result = await stub_minigame(think)
+        await settle_shift(conn, user_id, float(shift["pay_rate"]), shift_bonus(result))
+
+
+async def clockin_phased(pool, user_id, think):
+    async with pool.acquire() as conn:
+        shift, _ = await start_shift(conn, user_id)
+    result = await stub_minigame(think)
+    await settle_shift(pool, user_id, float(shift["pay_rate"]), shift_bonus(result))
+
+
+async def give_jobs(pool, user_ids, occupation_id):
+    await pool.execute(
+        """
+        INSERT INTO users (user_id, occupation_id, occupation_needs_warning)
+        SELECT id, $2, FALSE FROM unnest($1::bigint[]) AS id
+        ON CONFLICT (user_id) DO UPDATE
+        SET occupation_id = EXCLUDED.occupation_id, occupation_needs_warning = FALSE
+        """,
+        user_ids, occupation_id
+    )
+
+
+async def probe_bank_view(pool, user_id, stop, samples, timeout):
+    while not stop.is_set():
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(pool.fetchrow(BANK_VIEW_SQL, user_id), timeout)
+            samples.append(time.perf_counter() - started)
+        except asyncio.TimeoutError:
+            samples.append(float("inf"))
+        await asyncio.sleep(0.1)
+
+
+def summarize(label, samples):
+    finished = sorted(s for s in samples if s != float("inf"))
+    timeouts = len(samples) - len(finished)
+    if not finished:
+        print(f"{label}: {len(samples)} probes, all timed out")
+        return
+    p95 = finished[min(len(finished) - 1, int(len(finished) * 0.95))]
+    print(
+        f"{label}: {len(samples)} probes, "
+        f"median {statistics.median(finished) * 1000:.1f} ms, "
+        f"p95 {p95 * 1000:.1f} ms, "
+        f"max {finished[-1] * 1000:.1f} ms, "
+        f"timeouts {timeouts}"
+    )
+
+
+async def run(args):
+    pool = await create_pool()
+    ledger.start(pool)
+    try:
+        clockin = clockin_held if args.mode == "held" else clockin_phased
+        user_ids = [args.user_id + i + 1 for i in range(args.clockins)]
+        await give_jobs(pool, user_ids, args.occupation_id)
+
+        baseline = []
+        stop = asyncio.Event()
+        probe = asyncio.create_task(probe_bank_view(pool, args.user_id, stop, baseline, args.probe_timeout))
+        await asyncio.sleep(2)
+        stop.set()
+        await probe
+        summarize("idle", baseline)
+
+        loaded = []
+        stop = asyncio.Event()
+        probe = asyncio.create_task(probe_bank_view(pool, args.user_id, stop, loaded, args.probe_timeout))
+        started = time.perf_counter()
+        await asyncio.gather(*(clockin(pool, user_id, args.think) for user_id in user_ids))
+        elapsed = time.perf_counter() - started
+        stop.set()
+        await probe
+        summarize(f"{args.clockins} pending clock-ins ({args.mode})", loaded)
+        print(f"clock-ins finished in {elapsed:.1f}s (pool max size {pool.get_max_size()})")
+    finally:
+        await ledger.stop()
+        await close_pool()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure /bank view latency while clock-ins are pending.")
+    parser.add_argument("--mode", choices=("held", "phased"), default="phased")
+    parser.add_argument("--clockins", type=int, default=50)
+    parser.add_argument("--think", type=float, default=10.0, help="seconds of mini-game time per clock-in")
+    parser.add_argument("--user-id", type=int, default=1, help="user probed by /bank view; clock-ins use the ids after it")
+    parser.add_argument("--occupation-id", type=int, default=1, help="cd_occupations id given to the clock-in users")
+    parser.add_argument("--probe-timeout", type=float, default=5.0)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+# travel_benchmark.py
+# Benchmark: round trips and latency per subway/bus trip, old path vs travel_service.
+#
+# "legacy" replays, verbatim and in order, the statements the old
+# handle_travel transit branch issued for a trip with a neutral outcome:
+#   db_user.get_user, vehicle_logic.get_user_vehicles, db_user.get_user_finances,
+#   utilities.charge_user (get_user_finances + upsert_user_finances),
+#   views.select_weighted_travel_outcome, get_user_finances again, the two
+#   cd_locations lookups, UPDATE users, and the debug get_user afterwards.
+# Outcome effects are left out on both arms (service runs with effect 0), since
+# a non-neutral outcome only added another charge_user/reward_user pair.
+# "service" runs travel_service.TRANSIT_TRIP_SQL once per trip.
+#
+# Every trip runs inside a transaction that is rolled back, so balances and
+# locations are left untouched. Point it at a dev database and an existing user:
+#
+#   python scripts/travel_benchmark.py --user-id 1234 --trips 500
+
+import argparse
+import asyncio
+import datetime
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db_pool import close_pool, create_pool  # noqa: E402
+from travel_service import TRANSIT_FARES, TRANSIT_TRIP_SQL  # noqa: E402
+
+# Statements below are copied from the pre-travel_service helpers named above.
+GET_USER_SQL = 'SELECT * FROM users WHERE user_id = $1'
+
+GET_USER_VEHICLES_SQL = """
+    SELECT
+        cvt.name AS vehicle_type,
+        uvi.vehicle_type_id,
+        uvi.color,
+        uvi.appearance_description,
+        uvi.plate_number,
+        uvi.condition,
+        uvi.travel_count,
+        uvi.resale_value,
+        uvi.resale_percent,
+        cvt.class_type,
+        uvi.location_id,
+        uvi.id
+    FROM user_vehicle_inventory uvi
+    JOIN cd_vehicle_type cvt ON cvt.id = uvi.vehicle_type_id
+    WHERE uvi.user_id = $1
+    ORDER BY uvi.id
+    """
+
+GET_USER_FINANCES_SQL = "SELECT * FROM user_finances WHERE user_id = $1"
+
+UPSERT_USER_FINANCES_SQL = '''
+            INSERT INTO user_finances (user_id, checking_account_balance, savings_account_balance, debt_balance, last_paycheck_claimed)
+            VALUES ($1, $2, $3, $4, $5)
+            ON CONFLICT (user_id) DO UPDATE SET
+                checking_account_balance = EXCLUDED.checking_account_balance,
+                savings_account_balance = EXCLUDED.savings_account_balance,
+                debt_balance = EXCLUDED.debt_balance,
+                last_paycheck_claimed = EXCLUDED.last_paycheck_claimed
+        '''
+
+TRAVEL_OUTCOMES_SQL = """
+            SELECT id, description, effect_amount, effect_type
+            FROM cd_travel_summaries
+            WHERE travel_type = $1
+            """
+
+LOCATION_NAME_SQL = "SELECT location_name FROM cd_locations WHERE cd_location_id = $1"
+
+MOVE_USER_SQL = "UPDATE users SET current_location = $1 WHERE user_id = $2"
+
+
+async def legacy_charge_user(conn, user_id, amount):
+    # utilities.charge_user: read the row, then write every column back
+    finances = await conn.fetchrow(GET_USER_FINANCES_SQL, user_id)
+    last_claim = finances["last_paycheck_claimed"]
+    if last_claim is None:
+        last_claim = datetime.datetime.fromtimestamp(0, tz=datetime.timezone.utc)
+    await conn.execute(
+        UPSERT_USER_FINANCES_SQL,
+        user_id,
+        finances["checking_account_balance"] - amount,
+        finances["savings_account_balance"],
+        finances["debt_balance"],
+        last_claim,
+    )
+
+
+async def legacy_trip(conn, args):
+    fare = TRANSIT_FARES[args.method]
+    user = await conn.fetchrow(GET_USER_SQL, args.user_id)
+    await conn.fetch(GET_USER_VEHICLES_SQL, args.user_id)
+    await conn.fetchrow(GET_USER_FINANCES_SQL, args.user_id)
+    await legacy_charge_user(conn, args.user_id, fare)
+    await conn.fetch(TRAVEL_OUTCOMES_SQL, args.method)
+    await conn.fetchrow(GET_USER_FINANCES_SQL, args.user_id)
+    await conn.fetchrow(LOCATION_NAME_SQL, user["current_location"])
+    await conn.fetchrow(LOCATION_NAME_SQL, args.to_location)
+    await conn.execute(MOVE_USER_SQL, args.to_location, args.user_id)
+    await conn.fetchrow(GET_USER_SQL, args.user_id)
+    return 11
+
+
+async def service_trip(conn, args):
+    await conn.fetchrow(TRANSIT_TRIP_SQL, args.user_id, TRANSIT_FARES[args.method], 0, args.to_location)
+    return 1
+
+
+def percentile(sorted_samples, pct):
+    index = min(len(sorted_samples) - 1, int(len(sorted_samples) * pct / 100))
+    return sorted_samples[index]
+
+
+async def measure(pool, label, trip, args):
+    samples = []
+    queries = 0
+    async with pool.acquire() as conn:
+        for _ in range(args.warmup):
+            tr = conn.transaction()
+            await tr.start()
+            await trip(conn, args)
+            await tr.rollback()
+        for _ in range(args.trips):
+            tr = conn.transaction()
+            await tr.start()
+            started = time.perf_counter()
+            queries += await trip(conn, args)
+            samples.append(time.perf_counter() - started)
+            await tr.rollback()
+
+    samples.sort()
+    print(
+        f"{label:8} queries/trip {queries / args.trips:4.1f}  "
+        f"p50 {percentile(samples, 50) * 1000:7.2f} ms  "
+        f"p99 {percentile(samples, 99) * 1000:7.2f} ms"
+    )
+
+
+async def run(args):
+    pool = await create_pool()
+    try:
+        await measure(pool, "legacy", legacy_trip, args)
+        await measure(pool, "service", service_trip, args)
+    finally:
+        await close_pool()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare per-trip cost of the old and new transit travel paths.")
+    parser.add_argument("--user-id", type=int, required=True)
+    parser.add_argument("--method", choices=sorted(TRANSIT_FARES), default="subway")
+    parser.add_argument("--to-location", type=int, default=1)
+    parser.add_argument("--trips", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=20)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
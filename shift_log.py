@@ -0,0 +1,94 @@
+# shift_log.py
+# Shift bookkeeping for clock-ins.
+#
+# user_shift_daily(user_id, day, shifts) is the counter every shift-count read
+# uses: clock-in bumps it with one upsert and readers do a primary-key lookup.
+# The raw clock-in rows go to user_work_log_history, an append-only table
+# range-partitioned by month, so retention is a DROP of old partitions instead
+# of a nightly mass DELETE. Days are UTC dates.
+
+from datetime import date, datetime, timezone
+
+import metrics
+
+HISTORY_TABLE = "user_work_log_history"
+
+RECORD_SHIFT_SQL = """
+    WITH logged AS (
+        INSERT INTO user_work_log_history (user_id, work_timestamp)
+        VALUES ($1, NOW())
+    )
+    INSERT INTO user_shift_daily (user_id, day, shifts)
+    VALUES ($1, (NOW() AT TIME ZONE 'UTC')::date, 1)
+    ON CONFLICT (user_id, day) DO UPDATE SET shifts = user_shift_daily.shifts + 1
+    RETURNING shifts
+"""
+
+
+def utc_today() -> date:
+    return datetime.now(timezone.utc).date()
+
+
+def _month_start(day: date, offset: int = 0) -> date:
+    months = day.year * 12 + (day.month - 1) + offset
+    return date(months // 12, months % 12 + 1, 1)
+
+
+def _partition_name(month: date) -> str:
+    return f"{HISTORY_TABLE}_y{month.year}m{month.month:02d}"
+
+
+async def record_shift(pool, user_id: int) -> int:
+    """Log one shift and return how many the user has worked today (UTC)."""
+    return await pool.fetchval(RECORD_SHIFT_SQL, user_id)
+
+
+SHIFTS_ON_SQL = "SELECT shifts FROM user_shift_daily WHERE user_id = $1 AND day = $2"
+
+
+async def shifts_on(pool, user_id: int, day: date | None = None) -> int:
+    shifts = await pool.fetchval(SHIFTS_ON_SQL, user_id, day or utc_today())
+    return shifts or 0
+
+
+async def ensure_history_partitions(conn, months_ahead: int = 1):
+    """Create this month's partition and the next `months_ahead` ones if missing."""
+    this_month = _month_start(utc_today())
+    for offset in range(months_ahead + 1):
+        start = _month_start(this_month, offset)
+        end = _month_start(this_month, offset + 1)
+        await conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {_partition_name(start)}
+            PARTITION OF {HISTORY_TABLE}
+            FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')
+        """)
+
+
+async def drop_expired_history_partitions(conn, keep_months: int):
+    """Drop monthly partitions that end before the retention window. Returns the dropped names."""
+    cutoff = _month_start(utc_today(), -keep_months)
+    rows = await conn.fetch(
+        """
+        SELECT c.relname
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        JOIN pg_class p ON p.oid = i.inhparent
+        WHERE p.relname = $1
+        """,
+        HISTORY_TABLE
+    )
+    dropped = []
+    for row in rows:
+        name = row["relname"]
+        try:
+            year, month = name.rsplit("_y", 1)[1].split("m")
+            month_start = date(int(year), int(month), 1)
+        except ValueError:
+            continue
+        if _month_start(month_start, 1) <= cutoff:
+            await conn.execute(f"DROP TABLE IF EXISTS {name}")
+            dropped.append(name)
+    if dropped:
+        metrics.inc("work_log_partitions_dropped", len(dropped))
+        print(f"🗑️ Dropped work log partitions: {', '.join(dropped)}")
+    return dropped
@@ -1,10 +1,9 @@
 import discord
 from discord.ui import Button, View
 from discord import ButtonStyle
-import random
-import string
-import time
-from datetime import datetime
+
+from reference_data import catalog
+from vehicle_purchase import purchase_vehicle
 
 # Placeholder functions/constants — replace with your real implementations
 def embed_message(title, description, color=None):
@@ -21,16 +20,13 @@ class TransportationShopButtons(View):
         self.pool = pool  # save pool for use later
 
     async def setup_buttons(self):
-        async with self.pool.acquire() as conn:
-            rows = await conn.fetch("SELECT id, emoji, name, cost FROM cd_vehicle_type ORDER BY cost ASC")
-
-            for row in rows:
-                vehicle_id = row["id"]
-                name = row["name"]
-                emoji = row["emoji"]
-                cost = row["cost"]
+        for row in sorted(catalog.rows("cd_vehicle_type"), key=lambda v: v["cost"]):
+            vehicle_id = row["id"]
+            name = row["name"]
+            emoji = row["emoji"]
+            cost = row["cost"]
 
-                self.add_item(VehicleButton(vehicle_id, name, emoji, cost, self.pool))
+            self.add_item(VehicleButton(vehicle_id, name, emoji, cost, self.pool))
 
 
 class VehicleButton(Button):
@@ -50,72 +46,27 @@ class VehicleButton(Button):
         await interaction.response.defer(ephemeral=True)
         user_id = interaction.user.id
 
-        async with self.pool.acquire() as conn:
-            user = await conn.fetchrow("SELECT checking_account_balance FROM user_finances WHERE user_id = $1", user_id)
-
-            if not user or user["checking_account_balance"] < self.cost:
-                return await interaction.followup.send(embed=embed_message(
-                    "❌ Not Enough Funds",
-                    f"You need ${self.cost:,} to buy this {self.name}.",
-                    COLOR_RED
-                ), ephemeral=True)
-
-            # Fetch vehicle details
-            vehicle = await conn.fetchrow(
-                """
-                SELECT cvc.description AS condition, cvc.resale_percent
-                FROM cd_vehicle_type cvt
-                JOIN cd_vehicle_condition cvc ON cvc.vehicle_type_id = cvt.id
-                WHERE cvt.id = $1
-                """,
-                self.vehicle_id
-            )
-
-            if not vehicle:
-                return await interaction.followup.send(embed=embed_message(
-                    "❌ Vehicle not found.",
-                    "",
-                    COLOR_RED
-                ), ephemeral=True)
-
-            # Compute resale value
-            resale_percent = vehicle["resale_percent"] or 0.25
-            resale_value = int(self.cost * resale_percent)
-
-            # Randomized attributes
-            color = random.choice(["Red", "Blue", "Black", "White", "Green", "Silver"])
-            appearance = random.choice([
-                "still smells like a dealership",
-                "gleams under the sun",
-                "has tinted windows",
-                "rides smoother than silk",
-                "looks like it just got waxed"
-            ])
-            plate = ''.join(random.choices(string.ascii_uppercase + string.digits, k=7))
-            condition = "pristine" if vehicle["condition"] == "new" else vehicle["condition"]
-            travel_count = 0 if condition != "beater" else random.randint(150, 192)
-            created_at = datetime.utcnow()
-
-            # Always assign breakdown_threshold randomly 200-250 for all cars
-            breakdown_threshold = random.randint(200, 250)
+        # Same locked limit check, debit and insert as the /shop command
+        item = {"type": self.name, "vehicle_type_id": self.vehicle_id}
+        purchase = await purchase_vehicle(self.pool, user_id, item, self.cost)
 
-            # Deduct money
-            await conn.execute(
-                "UPDATE user_finances SET checking_account_balance = checking_account_balance - $1 WHERE user_id = $2",
-                self.cost, user_id
-            )
+        if purchase["status"] == "limit":
+            return await interaction.followup.send(embed=embed_message(
+                "🚫 Vehicle Limit Reached",
+                "You have reached your vehicle limit! Purchase garage space to store more.",
+                COLOR_RED
+            ), ephemeral=True)
 
-            # Add to inventory
-            await conn.execute("""
-                INSERT INTO user_vehicle_inventory 
-                    (user_id, vehicle_type_id, color, appearance_description, plate_number, condition, travel_count, resale_value, created_at, sold_at, breakdown_threshold)
-                VALUES 
-                    ($1, $2, $3, $4, $5, $6, $7, $8, $9, NULL, $10)
-            """, user_id, self.vehicle_id, color, appearance, plate, condition, travel_count, resale_value, created_at, breakdown_threshold)
+        if purchase["status"] == "funds":
+            return await interaction.followup.send(embed=embed_message(
+                "❌ Not Enough Funds",
+                f"You need ${self.cost:,} to buy this {self.name}.",
+                COLOR_RED
+            ), ephemeral=True)
 
         await interaction.followup.send(embed=embed_message(
             "✅ Vehicle Purchased!",
-            f"You bought a {color} {self.name} {self.emoji} with license plate `{plate}`.\n"
-            f"It {appearance} and is in **{condition}** condition.",
+            f"You bought a {purchase['color']} {self.name} {self.emoji} with license plate `{purchase['plate_number']}`.\n"
+            f"It {purchase['appearance_description']} and is in **{purchase['condition']}** condition.",
             COLOR_GREEN
         ), ephemeral=True)
@@ -0,0 +1,73 @@
+# startup.py
+# Boot timing and cog loading.
+#
+# `startup` records when each boot phase started and finished; main.py prints
+# print_waterfall() at the end of setup_hook so boot time can be compared
+# release to release. load_extensions() loads the cogs one at a time and times
+# each bot.load_extension call, which executes the cog module (paying for its
+# imports) and runs its setup(). The setup()s do no awaited I/O, so running
+# them concurrently would not save anything.
+
+import contextlib
+import time
+
+import metrics
+
+_boot_started = time.perf_counter()  # main.py imports this module first
+
+EXTENSIONS = (
+    "Bot_commands.bank_commands",
+    "Bot_occupations.occupations_commands",
+    "Bot_occupations.career_path_command",
+    "Easter_eggs.secretbutton",
+    "Achievements.user_achievements",
+    "crimes.crime_command",
+    "grocery_logic.market_command",
+    "grocery_logic.grocery_sweeper",
+)
+
+WATERFALL_WIDTH = 40
+
+
+class StartupTimer:
+    def __init__(self, started: float):
+        self.started = started
+        self.phases = []  # (label, start, end), seconds since boot
+
+    def record(self, label: str, start: float, end: float):
+        self.phases.append((label, start - self.started, end - self.started))
+
+    def mark(self, label: str):
+        """Record a phase that ran from the end of the previous one (or boot) until now."""
+        start = self.started + (max(end for _, _, end in self.phases) if self.phases else 0.0)
+        self.record(label, start, time.perf_counter())
+
+    @contextlib.contextmanager
+    def phase(self, label: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(label, start, time.perf_counter())
+
+    def print_waterfall(self):
+        if not self.phases:
+            return
+        total = max(end for _, _, end in self.phases)
+        scale = WATERFALL_WIDTH / total if total > 0 else 0
+        label_width = max(len(label) for label, _, _ in self.phases)
+        print(f"🚀 Startup waterfall ({total:.2f}s):")
+        for label, start, end in sorted(self.phases, key=lambda p: p[1]):
+            offset = int(start * scale)
+            bar = "█" * max(1, int(end * scale) - offset)
+            print(f"   {label:<{label_width}} {start:7.3f}s {end - start:7.3f}s |{' ' * offset}{bar}")
+        metrics.set_gauge("startup_seconds", round(total, 3))
+
+
+startup = StartupTimer(_boot_started)
+
+
+async def load_extensions(bot, names=EXTENSIONS):
+    for name in names:
+        with startup.phase(f"load {name}"):
+            await bot.load_extension(name)
@@ -0,0 +1,82 @@
+# travel_service.py
+# Transit (subway/bus) trips as a single database round trip.
+#
+# The outcome is sampled in memory beforehand (views.select_weighted_travel_outcome)
+# and location names come from the catalog cache, so the only statement a trip
+# needs is TRANSIT_TRIP_SQL: it checks funds, charges the fare, applies the
+# outcome's effect and moves the user, all atomically.
+
+from ledger import ledger
+from reference_data import catalog
+
+TRANSIT_FARES = {"subway": 10, "bus": 5}
+
+# $1 user_id, $2 fare, $3 outcome effect (may be negative), $4 destination location id.
+# A negative effect is only applied if the user can still cover it after the fare.
+# Returns one row; `charged` is false (and nothing changed) when the fare can't be paid.
+TRANSIT_TRIP_SQL = """
+    WITH acct AS (
+        SELECT checking_account_balance - $2::numeric AS after_fare
+        FROM user_finances
+        WHERE user_id = $1 AND checking_account_balance >= $2::numeric
+        FOR UPDATE
+    ), charged AS (
+        UPDATE user_finances f
+        SET checking_account_balance = acct.after_fare
+            + CASE WHEN $3::numeric < 0 AND acct.after_fare < -$3::numeric THEN 0 ELSE $3::numeric END
+        FROM acct
+        WHERE f.user_id = $1
+        RETURNING f.checking_account_balance AS balance,
+                  f.checking_account_balance - acct.after_fare AS applied_effect
+    ), prev AS (
+        SELECT current_location FROM users WHERE user_id = $1
+    ), moved AS (
+        UPDATE users u
+        SET current_location = $4
+        FROM charged
+        WHERE u.user_id = $1
+        RETURNING u.user_id
+    )
+    SELECT
+        c.balance IS NOT NULL AS charged,
+        COALESCE(c.balance, (SELECT checking_account_balance FROM user_finances WHERE user_id = $1)) AS balance,
+        COALESCE(c.applied_effect, 0) AS applied_effect,
+        p.current_location AS old_location_id
+    FROM (SELECT 1) one
+    LEFT JOIN charged c ON TRUE
+    LEFT JOIN prev p ON TRUE
+"""
+
+
+def location_name(location_id, default=None) -> str:
+    row = catalog.get("cd_locations", "cd_location_id", location_id)
+    if row:
+        return row["location_name"]
+    return default if default is not None else f"Location {location_id}"
+
+
+async def transit_trip(pool, user_id: int, method: str, destination_id: int, outcome=None) -> dict:
+    """
+    Run one subway/bus trip. Returns a dict with charged, fare, balance,
+    applied_effect, old/new location ids and names.
+    """
+    fare = TRANSIT_FARES[method]
+    effect = outcome.get("effect_amount", 0) if outcome else 0
+
+    row = await pool.fetchrow(TRANSIT_TRIP_SQL, user_id, fare, effect or 0, destination_id)
+    trip = {
+        "charged": row["charged"],
+        "fare": fare,
+        "balance": row["balance"] or 0,
+        "applied_effect": row["applied_effect"],
+        "old_location_id": row["old_location_id"],
+        "new_location_id": destination_id,
+        "old_location_name": location_name(row["old_location_id"]),
+        "new_location_name": location_name(destination_id),
+    }
+
+    if trip["charged"]:
+        ledger.record(user_id, -fare, trip["balance"] - trip["applied_effect"], "travel_fare", __name__)
+        if trip["applied_effect"]:
+            ledger.record(user_id, trip["applied_effect"], trip["balance"], "travel_outcome", __name__)
+    return trip
@@ -0,0 +1,80 @@
+# unit_of_work.py
+# Request-scoped read cache bound to a discord.Interaction.
+#
+# A single command often loads the same user row, finances or vehicle list
+# from several helpers. Each interaction gets one UnitOfWork; loads through
+# it hit the DB once and are served from memory afterwards, until the code
+# that writes the row calls `invalidate(...)`. Cached values are shared, so
+# treat them as read-only.
+
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+
+import metrics
+
+# Interactions whose handler never reached the end of `unit_of_work()` are
+# evicted oldest-first once this many are open.
+MAX_OPEN_UNITS = 1000
+
+_open_units = OrderedDict()
+
+
+class UnitOfWork:
+    def __init__(self, interaction_id: int, label: str | None = None):
+        self.interaction_id = interaction_id
+        self.label = label
+        self.queries = 0
+        self.hits = 0
+        self._depth = 0
+        self._cache = {}
+
+    async def load(self, kind: str, key, loader):
+        cache_key = (kind, key)
+        if cache_key in self._cache:
+            self.hits += 1
+            return self._cache[cache_key]
+
+        self.queries += 1
+        value = await loader()
+        self._cache[cache_key] = value
+        return value
+
+    def invalidate(self, kind: str, key=None):
+        """Drop one cached entry, or every entry of `kind` when key is None."""
+        if key is not None:
+            self._cache.pop((kind, key), None)
+            return
+        for cache_key in [k for k in self._cache if k[0] == kind]:
+            del self._cache[cache_key]
+
+    def log_summary(self):
+        metrics.inc("uow_queries", self.queries)
+        metrics.inc("uow_cache_hits", self.hits)
+        print(f"[uow] {self.label or 'interaction'} {self.interaction_id}: {self.queries} queries, {self.hits} served from cache")
+
+
+def for_interaction(interaction, label: str | None = None) -> UnitOfWork:
+    """Return the UnitOfWork for this interaction, creating it on first use."""
+    uow = _open_units.get(interaction.id)
+    if uow is None:
+        uow = UnitOfWork(interaction.id, label)
+        _open_units[interaction.id] = uow
+        while len(_open_units) > MAX_OPEN_UNITS:
+            _open_units.popitem(last=False)
+    elif label and uow.label is None:
+        uow.label = label
+    return uow
+
+
+@asynccontextmanager
+async def unit_of_work(interaction, label: str | None = None):
+    """Scope a handler to its interaction; the outermost exit logs counts and drops the cache."""
+    uow = for_interaction(interaction, label)
+    uow._depth += 1
+    try:
+        yield uow
+    finally:
+        uow._depth -= 1
+        if uow._depth == 0:
+            _open_units.pop(interaction.id, None)
+            uow.log_summary()
@@ -0,0 +1,82 @@
+# user_cache.py
+# Bounded LRU/TTL cache of (user_id, guild_id) pairs known to exist in `users`.
+# ensure_user_exists runs before every slash command, so a hit here means the
+# command costs zero DB work on that path.
+
+import time
+from collections import OrderedDict
+
+import metrics
+from config import KNOWN_USER_CACHE_SIZE, KNOWN_USER_CACHE_TTL_SECONDS
+
+
+class KnownUserCache:
+    def __init__(self, max_size: int, ttl_seconds: int):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[tuple[int, int], float] = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def contains(self, user_id: int, guild_id: int) -> bool:
+        key = (user_id, guild_id)
+        expires_at = self._entries.get(key)
+        if expires_at is None:
+            metrics.inc("known_user_cache_misses")
+            return False
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            metrics.inc("known_user_cache_expired")
+            metrics.inc("known_user_cache_misses")
+            return False
+        self._entries.move_to_end(key)
+        metrics.inc("known_user_cache_hits")
+        return True
+
+    def add(self, user_id: int, guild_id: int):
+        key = (user_id, guild_id)
+        self._entries[key] = time.monotonic() + self.ttl_seconds
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            metrics.inc("known_user_cache_evictions")
+        metrics.set_gauge("known_user_cache_size", len(self._entries))
+
+    def discard(self, user_id: int, guild_id: int):
+        self._entries.pop((user_id, guild_id), None)
+        metrics.set_gauge("known_user_cache_size", len(self._entries))
+
+    def clear(self):
+        self._entries.clear()
+        metrics.set_gauge("known_user_cache_size", 0)
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": metrics.get("known_user_cache_hits"),
+            "misses": metrics.get("known_user_cache_misses"),
+            "evictions": metrics.get("known_user_cache_evictions"),
+        }
+
+
+known_users = KnownUserCache(KNOWN_USER_CACHE_SIZE, KNOWN_USER_CACHE_TTL_SECONDS)
+
+
+async def warm_known_users(pool):
+    """Fill the cache from `users` at startup (most recently seen first)."""
+    rows = await pool.fetch(
+        """
+        SELECT user_id, guild_id
+        FROM users
+        WHERE guild_id IS NOT NULL
+        ORDER BY last_seen DESC NULLS LAST
+        LIMIT $1
+        """,
+        known_users.max_size,
+    )
+    # Oldest first so the most recently seen users end up at the MRU end.
+    for row in reversed(rows):
+        known_users.add(row["user_id"], row["guild_id"])
+    print(f"✅ Warmed known-user cache with {len(rows)} users.")
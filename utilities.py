@@ -8,9 +8,9 @@ import re
 
 import discord
 
-from db_user import get_user, upsert_user, get_user_finances, upsert_user_finances
-from globals import pool
+from db_user import get_user, upsert_user
 from embeds import embed_message, COLOR_RED
+from vehicle_flavor import random_appearance
 
 # ───────────────────────────────────────────────
 # VEHICLE CONDITION THRESHOLDS
@@ -68,19 +68,10 @@ async def update_vehicle_condition_and_description(pool, user_id, vehicle_id, ve
     new_cond_str, resale_percent = condition_and_resale_percent(travel_count, breakdown_threshold)
     new_cond_id = condition_map[new_cond_str]
 
-    # Fetch a new appearance description matching vehicle_type and new condition
-    async with pool.acquire() as conn:
-        desc_row = await conn.fetchrow(
-            """
-            SELECT description
-            FROM cd_vehicle_appearance
-            WHERE vehicle_type_id = $1 AND condition_id = $2
-            ORDER BY random() LIMIT 1
-            """,
-            vehicle_type_id, new_cond_id
-        )
-        description = desc_row["description"] if desc_row else "No description available."
+    # Pick a new appearance description matching vehicle_type and new condition
+    description = random_appearance(vehicle_type_id, new_cond_id)
 
+    async with pool.acquire() as conn:
         # Update the vehicle info in DB
         await conn.execute(
             """
@@ -161,35 +152,6 @@ def parse_amount(amount_str: str) -> int | None:
     except ValueError:
         return None
 
-# ───────────────────────────────────────────────
-# Other helper functions for balance update
-# ───────────────────────────────────────────────
-
-async def reward_user(pool, user_id, amount):
-    finances = await get_user_finances(pool, user_id)
-    if finances is None:
-        return   
-    finances["checking_account_balance"] += amount
-    await upsert_user_finances(pool, user_id, finances)
-
-async def charge_user(pool, user_id, amount):
-    finances = await get_user_finances(pool, user_id)
-    if finances is None:
-        return  # Or raise an error if you prefer
-    finances["checking_account_balance"] -= amount
-    await upsert_user_finances(pool, user_id, finances)
-
-async def update_balance(pool, user_id, delta):
-    async with pool.acquire() as conn:
-        await conn.execute(
-            """
-            UPDATE user_finances
-            SET checking_account_balance = checking_account_balance + $1
-            WHERE user_id = $2
-            """,
-            delta, user_id
-        )
-
 # ───────────────────────────────────────────────
 # Fetch user's vehicles from DB
 # ───────────────────────────────────────────────
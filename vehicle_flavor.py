@@ -0,0 +1,52 @@
+# vehicle_flavor.py
+# Random color and appearance text for vehicles, sampled in memory.
+#
+# The pools come from the cached cd_vehicle_colors / cd_vehicle_appearance
+# catalog tables and are rebuilt through the sampler registry whenever either
+# table reloads, so buying or wearing down a vehicle never spends a query on
+# flavor text.
+
+import random
+
+from reference_data import catalog
+from samplers import AliasSampler, samplers
+
+DEFAULT_COLOR = "Unknown Color"
+DEFAULT_APPEARANCE = "No description available."
+
+
+def _build_color_pools():
+    # Rows may be scoped to a vehicle type; unscoped rows form the shared pool (key None)
+    pools = {}
+    for row in catalog.rows("cd_vehicle_colors"):
+        text = row.get("description") or row.get("name")
+        if text:
+            pools.setdefault(row.get("vehicle_type_id"), []).append(text)
+    return {key: AliasSampler.uniform(texts) for key, texts in pools.items()}
+
+
+def _build_appearance_pools():
+    pools = {}
+    for row in catalog.rows("cd_vehicle_appearance"):
+        if row["description"]:
+            pools.setdefault((row["vehicle_type_id"], row["condition_id"]), []).append(row["description"])
+    return {key: AliasSampler.uniform(texts) for key, texts in pools.items()}
+
+
+samplers.register("vehicle_colors", ("cd_vehicle_colors",), _build_color_pools)
+samplers.register("vehicle_appearance", ("cd_vehicle_appearance",), _build_appearance_pools)
+
+
+def random_color(vehicle_type_id: int | None = None, default: str = DEFAULT_COLOR) -> str:
+    color = samplers.sample("vehicle_colors", vehicle_type_id)
+    if color is None and vehicle_type_id is not None:
+        color = samplers.sample("vehicle_colors", None)
+    return color or default
+
+
+def random_appearance(vehicle_type_id: int, condition_id: int, default: str = DEFAULT_APPEARANCE) -> str:
+    return samplers.sample("vehicle_appearance", (vehicle_type_id, condition_id)) or default
+
+
+def generate_random_plate() -> str:
+    return ''.join(random.choices("ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789", k=8))
@@ -1,18 +1,14 @@
-import random
 import discord
-from db_user import get_user, upsert_user, get_user_finances, upsert_user_finances
-from globals import pool
-from datetime import datetime, timezone
-
-# Base prices for resale calculation
-BASE_PRICES = {
-    1: 10000,    # Beater Car
-    2: 25000,    # Sedan Car
-    3: 100000,   # Sports Car
-    4: 75000,    # Pickup Truck
-    5: 2000,     # Bike
-    6: 18000     # Motorcycle
-}
+from db_user import get_user, upsert_user, vehicle_class
+from db_pool import get_pool
+from reference_data import catalog
+from vehicle_flavor import random_color, random_appearance
+from vehicle_purchase import purchase_vehicle
+from ledger import ledger
+
+# Sell-all embed lists at most this many vehicles before summarising the rest
+SELL_ALL_BREAKDOWN_LINES = 20
+
 # Condition → resale percent
 CONDITION_TO_PERCENT = {
     "Brand New": 0.85,
@@ -24,47 +20,21 @@ CONDITION_TO_PERCENT = {
 
 
 async def get_vehicle_type_name(conn, vehicle_type_id: int) -> str:
-    row = await conn.fetchrow(
-        "SELECT name FROM cd_vehicle_type WHERE id = $1", vehicle_type_id
-    )
+    row = catalog.get("cd_vehicle_type", "id", vehicle_type_id)
     return row["name"] if row else "Unknown Vehicle"
 
 
 async def get_condition_name(conn, condition_id: int) -> str:
-    row = await conn.fetchrow(
-        "SELECT name FROM cd_vehicle_condition WHERE id = $1", condition_id
-    )
+    row = catalog.get("cd_vehicle_condition", "id", condition_id)
     return row["name"] if row else "Unknown Condition"
 
 
 async def fetch_random_color(conn, vehicle_type_id: int) -> str:
-    row = await conn.fetchrow(
-        """
-        SELECT name FROM cd_vehicle_color
-        WHERE vehicle_type_id = $1
-        ORDER BY random()
-        LIMIT 1
-        """,
-        vehicle_type_id
-    )
-    return row['name'] if row else "Unknown Color"
+    return random_color(vehicle_type_id)
 
 
 async def fetch_appearance_description(conn, vehicle_type_id: int, condition_id: int) -> str:
-    row = await conn.fetchrow(
-        """
-        SELECT description FROM cd_vehicle_appearence
-        WHERE vehicle_type_id = $1 AND condition_id = $2
-        ORDER BY random()
-        LIMIT 1
-        """,
-        vehicle_type_id, condition_id
-    )
-    return row['description'] if row else "has an indescribable look"
-
-
-def generate_random_plate() -> str:
-    return ''.join(random.choices("ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789", k=8))
+    return random_appearance(vehicle_type_id, condition_id, default="has an indescribable look")
 
 
 async def handle_vehicle_purchase(
@@ -75,90 +45,41 @@ async def handle_vehicle_purchase(
     user_id = interaction.user.id
     vehicle_type_id = item.get("vehicle_type_id")
     print(f"[DEBUG] Starting purchase: user_id={user_id}, cost={cost}, vehicle_type_id={vehicle_type_id}")
+    pool = get_pool()
 
     user = await get_user(pool, user_id)
     if user is None:
         await interaction.response.send_message("You don't have an account yet. Use `/start`.", ephemeral=True)
         return
 
-    finances = await get_user_finances(pool, user_id)
-    if finances is None:
-        finances = {
-            "checking_account_balance": 0,
-            "savings_account_balance": 0,
-            "debt_balance": 0,
-            "last_paycheck_claimed": datetime.fromtimestamp(0, tz=timezone.utc)
-        }
-
-    if finances["checking_account_balance"] < cost:
-        await interaction.response.send_message(f"🚫 Not enough money to buy {item.get('type', 'that item')}.", ephemeral=True)
-        return
-
     if vehicle_type_id is None:
         await interaction.response.send_message("🚫 Internal error: No vehicle_type_id provided.", ephemeral=True)
         return
 
-    # Enforce ownership limits
-    if vehicle_type_id in (5, 6):  # Bike or Motorcycle
-        exists = await pool.fetchrow(
-            "SELECT 1 FROM user_vehicle_inventory WHERE user_id = $1 AND vehicle_type_id IN (5,6) LIMIT 1",
-            user_id
-        )
-        if exists:
-            await interaction.response.send_message("🚲 You already own a bike or motorcycle. You can't buy another one.", ephemeral=True)
-            return
-    else:
-        exists = await pool.fetchrow(
-            "SELECT 1 FROM user_vehicle_inventory WHERE user_id = $1 AND vehicle_type_id NOT IN (5,6) LIMIT 1",
-            user_id
-        )
-        if exists:
-            await interaction.response.send_message("🚗 You already own a car or truck. You can't buy another one.", ephemeral=True)
-            return
+    # Same locked limit check, debit and insert as the /shop buttons
+    purchase = await purchase_vehicle(pool, user_id, item, cost)
 
-    # Deduct funds from finances properly
-    finances["checking_account_balance"] -= cost
-    await upsert_user_finances(pool, user_id, finances)
-
-    plate = generate_random_plate()
-
-    # Condition and travel count logic
-    if vehicle_type_id == 1:  
-        condition_id = 4  # Poor Condition
-        travel_count = 151
-    else:
-        condition_id = 1  # Brand New
-        travel_count = 0
-
-    async with pool.acquire() as conn:
-        vehicle_type_name = await get_vehicle_type_name(conn, vehicle_type_id)
-        condition_name = await get_condition_name(conn, condition_id)
-        color = await fetch_random_color(conn, vehicle_type_id)
-        appearance_description = await fetch_appearance_description(conn, vehicle_type_id, condition_id)
-
-        resale_percent = CONDITION_TO_PERCENT.get(condition_name, 0.5)
-        resale_value = int(BASE_PRICES.get(vehicle_type_id, cost) * resale_percent)
-        print(f"[DEBUG] vehicle_type_id={vehicle_type_id}, resale_percent={resale_percent}, resale_value={resale_value}")
-        await conn.execute(
-            """
-            
-            INSERT INTO user_vehicle_inventory (
-                user_id, vehicle_type_id, plate_number, color, appearance_description,
-                condition, travel_count, resale_value, resale_percent, created_at, sold_at
-            ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, EXTRACT(EPOCH FROM NOW())::int, NULL)
-            """,
-            user_id, vehicle_type_id, plate, color, appearance_description,
-            condition_name, travel_count, resale_value, resale_percent
-        )
+    if purchase["status"] == "limit":
+        if vehicle_class(vehicle_type_id) == "bike":
+            await interaction.response.send_message("🚲 You've hit your bike limit. You can't buy another one.", ephemeral=True)
+        else:
+            await interaction.response.send_message("🚗 You've hit your car limit. You can't buy another one.", ephemeral=True)
+        return
+
+    if purchase["status"] == "funds":
+        await interaction.response.send_message(f"🚫 Not enough money to buy {item.get('type', 'that item')}.", ephemeral=True)
+        return
 
+    vehicle_type = catalog.get("cd_vehicle_type", "id", vehicle_type_id)
+    vehicle_type_name = vehicle_type["name"] if vehicle_type else "Unknown Vehicle"
     await interaction.response.send_message(
-        f"✅ You purchased a {color} {vehicle_type_name} ({condition_name}) with plate `{plate}` that {appearance_description}.",
+        f"✅ You purchased a {purchase['color']} {vehicle_type_name} ({purchase['condition']}) "
+        f"with plate `{purchase['plate_number']}` that {purchase['appearance_description']}.",
         ephemeral=True
     )
 
 
-async def get_user_vehicles(pool, user_id: int) -> list:
-    query = """
+USER_VEHICLES_SQL = """
     SELECT
         cvt.name AS vehicle_type,
         uvi.vehicle_type_id,
@@ -176,8 +97,13 @@ async def get_user_vehicles(pool, user_id: int) -> list:
     JOIN cd_vehicle_type cvt ON cvt.id = uvi.vehicle_type_id
     WHERE uvi.user_id = $1
     ORDER BY uvi.id
-    """
-    records = await pool.fetch(query, user_id)
+"""
+
+
+async def get_user_vehicles(pool, user_id: int, uow=None) -> list:
+    if uow is not None:
+        return await uow.load("vehicles", user_id, lambda: get_user_vehicles(pool, user_id))
+    records = await pool.fetch(USER_VEHICLES_SQL, user_id)
     return [dict(record) for record in records]
 
 
@@ -226,58 +152,77 @@ class ConfirmSellView(discord.ui.View):
         self.stop()
         await interaction.response.edit_message(content="> ❌ Sale cancelled.", view=None)
 
-async def sell_all_vehicles(interaction, user_id, vehicles, pool):
+# Deletes every vehicle the user owns and credits the summed resale in one statement.
+# Resale is cd_vehicle_type.cost * resale_percent (10% if unset), truncated to whole dollars.
+SELL_ALL_VEHICLES_SQL = """
+    WITH sold AS (
+        DELETE FROM user_vehicle_inventory uvi
+        USING cd_vehicle_type cvt
+        WHERE uvi.user_id = $1 AND cvt.id = uvi.vehicle_type_id
+        RETURNING uvi.id, cvt.name AS vehicle_type, cvt.emoji, uvi.color, uvi.condition,
+                  FLOOR(COALESCE(cvt.cost, 0) * COALESCE(uvi.resale_percent, 0.10))::bigint AS resale
+    ), total AS (
+        SELECT COUNT(*) AS sold_count, COALESCE(SUM(resale), 0) AS amount FROM sold
+    ), paid AS (
+        INSERT INTO user_finances (user_id, checking_account_balance)
+        SELECT $1, amount FROM total WHERE sold_count > 0
+        ON CONFLICT (user_id) DO UPDATE SET
+            checking_account_balance = user_finances.checking_account_balance + EXCLUDED.checking_account_balance
+        RETURNING checking_account_balance
+    )
+    SELECT
+        (SELECT json_agg(sold ORDER BY sold.id) FROM sold) AS breakdown,
+        total.amount AS total,
+        (SELECT checking_account_balance FROM paid) AS new_balance
+    FROM total
+"""
+
+
+def vehicle_resale_value(vehicle: dict) -> int:
+    """Resale for one vehicle dict (needs vehicle_type_id); same formula as SELL_ALL_VEHICLES_SQL."""
+    vehicle_type = catalog.get("cd_vehicle_type", "id", vehicle.get("vehicle_type_id"))
+    cost = vehicle_type["cost"] if vehicle_type and vehicle_type["cost"] is not None else 0
+    resale_percent = vehicle.get("resale_percent")
+    if resale_percent is None:
+        resale_percent = 0.10
+    return int(float(cost) * float(resale_percent))
+
+
+async def liquidate_fleet(pool, user_id: int):
+    """Sell all of a user's vehicles at once. Returns (breakdown, total, new_balance); breakdown is empty if nothing sold."""
+    row = await pool.fetchrow(SELL_ALL_VEHICLES_SQL, user_id)
+    breakdown = row["breakdown"] or []  # json_agg, decoded by the pool's json codec
+    total = row["total"]
+    if breakdown:
+        ledger.record(user_id, total, row["new_balance"], "vehicle_sale", __name__)
+    return breakdown, total, row["new_balance"]
+
+
+async def sell_all_vehicles(interaction, user_id, vehicles=None, pool=None):
+    """Sell the whole fleet, reply with a per-vehicle breakdown and return the total paid."""
+    pool = pool or get_pool()
     try:
-        if not vehicles:
-            await interaction.response.send_message("> You have no vehicles to sell.", ephemeral=True)
-            return 0  # Return 0 when no vehicles to sell
-
-        total_resale = 0
-        vehicle_ids = []
-
-        vehicles = await pool.fetch(
-            """
-            SELECT uvi.id, uvi.vehicle_type_id, uvi.resale_percent, cvt.cost
-            FROM user_vehicle_inventory uvi
-            JOIN cd_vehicle_type cvt ON uvi.vehicle_type_id = cvt.id
-            WHERE uvi.user_id = $1
-            ORDER BY uvi.id
-            """,
-            user_id
-        )
-
-        for vehicle in vehicles:
-            resale_percent = vehicle['resale_percent'] or 0.1  # fallback if null
-            cost = vehicle['cost'] or 0
-            resale = int(cost * resale_percent)
-            total_resale += resale
-            vehicle_ids.append(vehicle['id'])
-
-        # Delete all vehicles in one query
-        await pool.execute(
-            "DELETE FROM user_vehicle_inventory WHERE id = ANY($1::int[])",
-            vehicle_ids
-        )
-
-        from db_user import get_user_finances, upsert_user_finances
-        from datetime import datetime, timezone
-
-        finances = await get_user_finances(pool, user_id)
-        if finances is None:
-            finances = {
-                "checking_account_balance": 0,
-                "savings_account_balance": 0,
-                "debt_balance": 0,
-                "last_paycheck_claimed": datetime.fromtimestamp(0, tz=timezone.utc)
-            }
-
-        finances["checking_account_balance"] += total_resale
-        await upsert_user_finances(pool, user_id, finances)
-
-        await interaction.followup.send(
-            content=f"> ✅ You sold **ALL** your vehicles for a total of ${total_resale:,}.",
-            ephemeral=True  # or False, depending on what you want
+        breakdown, total, new_balance = await liquidate_fleet(pool, user_id)
+        if not breakdown:
+            await interaction.followup.send("> You have no vehicles to sell.", ephemeral=True)
+            return 0
+
+        lines = [
+            f"> {v['emoji'] or '🚗'} **{v['vehicle_type']}** ({v['color'] or 'Unknown'}, {v['condition'] or 'Unknown'}) — ${v['resale']:,}"
+            for v in breakdown[:SELL_ALL_BREAKDOWN_LINES]
+        ]
+        if len(breakdown) > SELL_ALL_BREAKDOWN_LINES:
+            lines.append(f"> …and {len(breakdown) - SELL_ALL_BREAKDOWN_LINES} more")
+        lines.append("")
+        lines.append(f"> Total: **${total:,}** · New balance: **${new_balance:,.2f}**")
+
+        embed = discord.Embed(
+            title=f"✅ Sold {len(breakdown)} vehicle{'s' if len(breakdown) != 1 else ''}",
+            description="\n".join(lines),
+            color=discord.Color.green()
         )
+        await interaction.followup.send(embed=embed, ephemeral=True)
+        return total
 
     except Exception as e:
         print(f"Error in sell_all_vehicles: {e}")
@@ -294,4 +239,5 @@ async def sell_all_vehicles(interaction, user_id, vehicles, pool):
             await interaction.followup.send(
                 "> ❌ Something went wrong while selling all your vehicles. Please try again later.",
                 ephemeral=True
-            )
\ No newline at end of file
+            )
+        return 0
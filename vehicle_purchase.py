@@ -0,0 +1,121 @@
+# vehicle_purchase.py
+# Shop vehicle purchase as one atomic statement.
+#
+# Flavor text, plate and condition label are picked in memory first (catalog
+# cache + vehicle_flavor samplers). PURCHASE_VEHICLE_SQL then checks the
+# per-class limit, debits the price, inserts the vehicle and points
+# last_used_vehicle at it; if any guard fails nothing is written, so money
+# can never be taken without a car being delivered.
+
+import random
+
+from db_user import VEHICLE_CLASS_LIMITS, vehicle_class
+from ledger import ledger
+from reference_data import catalog
+from vehicle_flavor import generate_random_plate, random_appearance, random_color
+
+BIKE_PLATES = ["ZOOM", "WHOAH", "SPOKEME", "TIRED-LOL", "RIDEME", "SLOWAF", "WHEEE", "B-ROKE", "RDHOG", "2POOR4CAR"]
+
+# $1 user_id, $2 class_type, $3 limit without garage, $4 limit with garage, $5 price,
+# $6 vehicle_type_id, $7 color, $8 appearance, $9 plate, $10 condition label,
+# $11 travel_count, $12 resale_percent
+PURCHASE_VEHICLE_SQL = """
+    WITH limits AS (
+        SELECT
+            COALESCE((SELECT vehicles FROM user_vehicle_class_counts WHERE user_id = $1 AND class_type = $2), 0)
+                < CASE WHEN COALESCE((SELECT has_garage FROM users WHERE user_id = $1), FALSE) THEN $4::int ELSE $3::int END
+                AS allowed
+    ), charged AS (
+        UPDATE user_finances f
+        SET checking_account_balance = f.checking_account_balance - $5::numeric
+        FROM limits
+        WHERE f.user_id = $1
+          AND limits.allowed
+          AND f.checking_account_balance >= $5::numeric
+        RETURNING f.checking_account_balance
+    ), bought AS (
+        INSERT INTO user_vehicle_inventory (
+            user_id, vehicle_type_id, color, appearance_description, plate_number, condition, travel_count, created_at, resale_percent
+        )
+        SELECT $1, $6, $7, $8, $9, $10, $11, NOW(), $12
+        FROM charged
+        RETURNING id
+    ), last_used AS (
+        UPDATE users u
+        SET last_used_vehicle = bought.id
+        FROM bought
+        WHERE u.user_id = $1
+    )
+    SELECT
+        limits.allowed,
+        charged.checking_account_balance AS new_balance,
+        bought.id AS vehicle_id,
+        (SELECT checking_account_balance FROM user_finances WHERE user_id = $1) AS balance_before
+    FROM limits
+    LEFT JOIN charged ON TRUE
+    LEFT JOIN bought ON TRUE
+"""
+
+
+def condition_label(condition_id: int, default: str = "Unknown") -> str:
+    for row in catalog.rows("cd_vehicle_condition"):
+        if row.get("condition_id", row.get("id")) == condition_id:
+            return row.get("description") or row.get("name") or default
+    return default
+
+
+async def purchase_vehicle(pool, user_id: int, item: dict, cost) -> dict:
+    """
+    Buy a shop vehicle. Returns a dict whose `status` is "ok", "limit" or "funds",
+    plus the vehicle details and balance the confirmation embed needs.
+    """
+    vehicle_type_id = item["vehicle_type_id"]
+    class_type = vehicle_class(vehicle_type_id)
+    if class_type not in VEHICLE_CLASS_LIMITS:
+        return {"status": "limit"}
+    without_garage, with_garage = VEHICLE_CLASS_LIMITS[class_type]
+
+    if item["type"] == "Beater Car":
+        condition_id = 4
+        travel_count = random.randint(151, 195)
+        resale_percent = 0.3
+    else:
+        condition_id = 1
+        travel_count = 0
+        resale_percent = 0.85
+
+    purchase = {
+        "status": "ok",
+        "color": random_color(vehicle_type_id, default="Unknown"),
+        "plate_number": random.choice(BIKE_PLATES) if item["type"] == "Bike" else generate_random_plate(),
+        "condition": condition_label(condition_id),
+        "appearance_description": random_appearance(vehicle_type_id, condition_id, default="No description available"),
+        "travel_count": travel_count,
+        "resale_percent": resale_percent,
+    }
+
+    async with pool.acquire() as conn:
+        async with conn.transaction():
+            # Same per-user serialization as the grocery fridge: the limit check reads a
+            # snapshot, so two concurrent buys must not both see the old count.
+            await conn.execute(
+                "SELECT pg_advisory_xact_lock(hashtextextended('vehicle_purchase:' || $1::bigint, 0))",
+                user_id
+            )
+            row = await conn.fetchrow(
+                PURCHASE_VEHICLE_SQL,
+                user_id, class_type, without_garage, with_garage, cost,
+                vehicle_type_id, purchase["color"], purchase["appearance_description"], purchase["plate_number"],
+                purchase["condition"], travel_count, resale_percent
+            )
+
+    if not row["allowed"]:
+        purchase["status"] = "limit"
+    elif row["vehicle_id"] is None:
+        purchase["status"] = "funds"
+        purchase["balance"] = row["balance_before"] or 0
+    else:
+        purchase["vehicle_id"] = row["vehicle_id"]
+        purchase["balance"] = row["new_balance"]
+        ledger.record(user_id, -cost, row["new_balance"], "vehicle_purchase", __name__)
+    return purchase
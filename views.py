@@ -3,28 +3,20 @@ from discord.ui import View, Button, Select
 from discord import Interaction, Embed, Color
 from embeds import embed_message, COLOR_GREEN, COLOR_RED
 import traceback
-from db_user import get_user, upsert_user, get_user_finances, upsert_user_finances
+from db_user import get_user, upsert_user
 import utilities
 import vehicle_logic
-import globals  # Make sure pool is initialized here
-import random
+from db_pool import get_pool
 from datetime import datetime, time
-from vehicle_logic import ConfirmSellView, sell_all_vehicles
-from Bot_commands.lifecheck_command import get_mock_weather_dynamic
-from utilities import charge_user, reward_user
+from vehicle_logic import ConfirmSellView, sell_all_vehicles, vehicle_resale_value
+from weather import get_mock_weather_dynamic
+from finance import credit, debit
 from vehicle_logic import get_user_vehicles
+from unit_of_work import unit_of_work
+from reference_data import catalog
+from samplers import AliasSampler, samplers
 
 
-# Fixed base prices by vehicle type
-BASE_PRICES = {
-    "Bike": 2000,
-    "Motorcycle": 18000,
-    "Beater Car": 10000,
-    "Sedan Car": 25000,
-    "Sports Car": 100000,
-    "Pickup Truck": 75000
-}
-
 class SellButton(Button):
     def __init__(self, vehicle, parent_view):
         vehicle_id = vehicle.get("id")
@@ -76,12 +68,7 @@ class SellFromStashView(View):
         desc = vehicle.get("tag") or vehicle.get("color", "Unknown")
         condition = vehicle.get("condition", "Unknown")
 
-        base_price = BASE_PRICES.get(vehicle.get("type"), 0)
-        resale_percent = vehicle.get("resale_percent")
-        if resale_percent is None:
-            resale_percent = 0.10  # fallback to 10%
-
-        resale = int(base_price * resale_percent)
+        resale = vehicle_resale_value(vehicle)
 
         return f"Sell {emoji} {desc} ({condition}) - ${resale:,}"
 
@@ -103,11 +90,9 @@ class SellFromStashView(View):
         if confirm_view.value is None:
             await interaction.followup.send("⏳ Sale confirmation timed out.", ephemeral=True)
         elif confirm_view.value:  # user confirmed
-            total_sale = await sell_all_vehicles(interaction, self.user_id, self.vehicles, globals.pool)
+            # One statement sells the fleet and credits the total; it replies with the breakdown
+            await sell_all_vehicles(interaction, self.user_id, self.vehicles, get_pool())
             self.vehicles.clear()
-            finances = await get_user_finances(globals.pool, self.user_id)
-            new_balance = finances.get("checking_account_balance", 0)
-            await interaction.followup.send(f"✅ All vehicles sold for **${total_sale:,}**. Your new balance is **${new_balance:,}**.", ephemeral=True)
 
 
     async def start_sell_flow(self, interaction: Interaction, vehicle, vehicle_id):
@@ -161,7 +146,7 @@ class SellFromStashView(View):
                 return
 
             # Delete vehicle by ID
-            await globals.pool.execute(
+            await get_pool().execute(
                 "DELETE FROM user_vehicle_inventory WHERE id = $1",
                 self.pending_vehicle_id
             )
@@ -169,22 +154,9 @@ class SellFromStashView(View):
             # Remove vehicle from local stash list
             self.vehicles = [v for v in self.vehicles if v.get("id") != self.pending_vehicle_id]
 
-            base_price = BASE_PRICES.get(self.pending_vehicle.get("type"), 0)
-            resale_percent = self.pending_vehicle.get("resale_percent", 0.10)
-            resale = int(base_price * resale_percent)
+            resale = vehicle_resale_value(self.pending_vehicle)
 
-            finances = await get_user_finances(globals.pool, self.user_id)
-            if finances is None:
-                from datetime import timezone
-                finances = {
-                    "checking_account_balance": 0,
-                    "savings_account_balance": 0,
-                    "debt_balance": 0,
-                    "last_paycheck_claimed": datetime.fromtimestamp(0, tz=timezone.utc)
-                }
-
-            finances["checking_account_balance"] += resale
-            await upsert_user_finances(globals.pool, self.user_id, finances)
+            await credit(get_pool(), self.user_id, resale, reason="vehicle_sale", source=__name__)
 
             sold_type = self.pending_vehicle.get("type", "vehicle")
             condition = self.pending_vehicle.get("condition", "Unknown")
@@ -242,21 +214,7 @@ class TravelButtons(View):
                 print(f"[ERROR] Failed to edit message when disabling buttons: {e}")
 
     async def charge_user(self, pool, user_id: int, amount: int):
-        finances = await get_user_finances(pool, user_id)
-        if finances is None:
-            finances = {
-                "checking_account_balance": 0,
-                "savings_account_balance": 0,
-                "debt_balance": 0,
-                "last_paycheck_claimed": datetime.fromtimestamp(0)
-            }
-
-        if finances["checking_account_balance"] >= amount:
-            finances["checking_account_balance"] -= amount
-            await upsert_user_finances(pool, user_id, finances)
-            return True
-        else:
-            return False
+        return await debit(pool, user_id, amount, require_funds=True, reason="travel_fare", source=__name__) is not None
 
     @discord.ui.button(label="Car 🚗 ($10)", style=discord.ButtonStyle.danger, custom_id="travel_car")
     async def car_button(self, interaction: Interaction, button: Button):
@@ -264,7 +222,7 @@ class TravelButtons(View):
             from Bot_commands.travel_command import handle_travel
 
             user_id = interaction.user.id
-            pool = globals.pool
+            pool = get_pool()
             cost = 10
 
             if not await self.charge_user(pool, user_id, cost):
@@ -273,7 +231,8 @@ class TravelButtons(View):
                 return
 
             await interaction.response.defer()
-            await handle_travel(interaction, "car", self.user_travel_location)
+            async with unit_of_work(interaction, "travel_car"):
+                await handle_travel(interaction, "car", self.user_travel_location)
             await self.disable_all_items()
         except Exception:
             import traceback
@@ -307,7 +266,7 @@ class TravelButtons(View):
                 return
 
             user_id = interaction.user.id
-            pool = globals.pool
+            pool = get_pool()
             cost = 10
 
             if not await self.charge_user(pool, user_id, cost):
@@ -316,7 +275,8 @@ class TravelButtons(View):
                 return
 
             await interaction.response.defer()
-            await handle_travel(interaction, "bike", self.user_travel_location)
+            async with unit_of_work(interaction, "travel_bike"):
+                await handle_travel(interaction, "bike", self.user_travel_location)
             await self.disable_all_items()
         except Exception:
             import traceback
@@ -332,7 +292,8 @@ class TravelButtons(View):
         try:
             from Bot_commands.travel_command import handle_travel
             await interaction.response.defer()
-            await handle_travel(interaction, "subway", self.user_travel_location)
+            async with unit_of_work(interaction, "travel_subway"):
+                await handle_travel(interaction, "subway", self.user_travel_location)
             await self.disable_all_items()
         except Exception:
             import traceback
@@ -348,7 +309,8 @@ class TravelButtons(View):
         try:
             from Bot_commands.travel_command import handle_travel
             await interaction.response.defer()
-            await handle_travel(interaction, "bus", self.user_travel_location)
+            async with unit_of_work(interaction, "travel_bus"):
+                await handle_travel(interaction, "bus", self.user_travel_location)
             await self.disable_all_items()
         except Exception:
             import traceback
@@ -372,55 +334,35 @@ class TravelButtons(View):
                 print(f"[ERROR] Failed to edit message on timeout: {e}")
 
 
-async def select_weighted_travel_outcome(pool, travel_type):
-    now = datetime.now().time()
-    day_start = time(6, 0)
-    day_end = time(18, 0)
-    is_day = day_start <= now <= day_end
-
-    if is_day:
-        weights = {
-            "neutral": 0.5,
-            "loss": 0.15,
-            "gain": 0.35,
-        }
-    else:
-        weights = {
-            "neutral": 0.5,
-            "loss": 0.35,
-            "gain": 0.15,
-        }
-    print(f"[DEBUG] Fetching travel outcomes for: {travel_type}")
-    async with pool.acquire() as conn:
-        rows = await conn.fetch(
-            """
-            SELECT id, description, effect_amount, effect_type
-            FROM cd_travel_summaries
-            WHERE travel_type = $1
-            """,
-            travel_type
-        )
+# Effect-type weights by time of day; each row's own probability scales these
+TRAVEL_EFFECT_WEIGHTS = {
+    True: {"neutral": 0.5, "loss": 0.15, "gain": 0.35},   # day (06:00-18:00)
+    False: {"neutral": 0.5, "loss": 0.35, "gain": 0.15},  # night
+}
+
 
-    weighted_choices = []
-    for row in rows:
-        eff_type = row["effect_type"]
-        # DB stored probability per row, multiply by adjusted weights
-        base_prob = row.get("probability", 1.0)
-        weight = weights.get(eff_type, 0) * base_prob
-        if weight > 0:
-            weighted_choices.append((row, weight))
+def build_travel_outcome_samplers():
+    rows_by_type = {}
+    for row in catalog.rows("cd_travel_summaries"):
+        rows_by_type.setdefault(row["travel_type"], []).append(row)
 
-    if not weighted_choices:
-        return None
+    built = {}
+    for travel_type, rows in rows_by_type.items():
+        for is_day, weights in TRAVEL_EFFECT_WEIGHTS.items():
+            # DB stored probability per row, multiply by adjusted weights
+            row_weights = [weights.get(row["effect_type"], 0) * row.get("probability", 1.0) for row in rows]
+            if any(w > 0 for w in row_weights):
+                built[(travel_type, is_day)] = AliasSampler(rows, row_weights)
+    return built
 
-    total_weight = sum(w for _, w in weighted_choices)
-    r = random.uniform(0, total_weight)
-    upto = 0
-    for row, w in weighted_choices:
-        if upto + w >= r:
-            return row
-        upto += w
-    return weighted_choices[-1][0]
+
+samplers.register("travel_outcomes", ("cd_travel_summaries",), build_travel_outcome_samplers)
+
+
+def select_weighted_travel_outcome(travel_type):
+    now = datetime.now().time()
+    is_day = time(6, 0) <= now <= time(18, 0)
+    return samplers.sample("travel_outcomes", (travel_type, is_day))
 
 
 from discord.ui import View, Button
@@ -441,21 +383,18 @@ class RetrieveVehicleView(View):
 
     @discord.ui.button(label="Retrieve Vehicle for $20", style=discord.ButtonStyle.success, custom_id="retrieve_confirm")
     async def confirm_button(self, interaction: discord.Interaction, button: Button):
-        pool = globals.pool
+        pool = get_pool()
         user_id = interaction.user.id
 
-        finances = await get_user_finances(pool, user_id)
-        balance = finances.get("checking_account_balance", 0)
+        # Charge user (fails without touching the balance if they can't afford it)
+        balance = await debit(pool, user_id, self.fee, require_funds=True, reason="vehicle_retrieval", source=__name__)
 
-        if balance < self.fee:
+        if balance is None:
             await interaction.response.send_message("❌ You don't have enough money to retrieve your vehicle.", ephemeral=True)
             self.value = False
             self.stop()
             return
 
-        # Charge user
-        await charge_user(pool, user_id, self.fee)
-
         # Update vehicle location to user's current location
         await pool.execute(
             "UPDATE user_vehicle_inventory SET location_id = $1 WHERE id = $2 AND user_id = $3",
@@ -486,37 +425,32 @@ class VehicleUseButton(Button):
         
         try:
             await interaction.response.defer(ephemeral=True)
-            vehicles = await get_user_vehicles(globals.pool, interaction.user.id)
 
             if interaction.user.id != self.user_id:
                 await interaction.followup.send("❌ This isn't your vehicle menu.", ephemeral=True)
                 return
 
-            pool = globals.pool
+            pool = get_pool()
             user_id = interaction.user.id
 
-            # Get vehicle's current location
-            vehicle_location_row = await pool.fetchrow(
-                "SELECT location_id FROM user_vehicle_inventory WHERE id = $1 AND user_id = $2",
-                self.vehicle['id'], user_id
-            )
-            vehicle_location = vehicle_location_row["location_id"] if vehicle_location_row else None
-
-            # Get user's current location
-            user_row = await pool.fetchrow("SELECT current_location FROM users WHERE user_id = $1", user_id)
-            user_location = user_row["current_location"] if user_row else None
-
-            # ✅ Use proper travel handler (enforces last_used_vehicle, breakdowns, updates)
-            from Bot_commands.travel_command import handle_travel_with_vehicle
-
-            await handle_travel_with_vehicle(
-                interaction=interaction,
-                vehicle=self.vehicle,
-                method=self.method,
-                user_travel_location=self.user_travel_location,
-                previous_location=user_location,
-                vehicles=vehicles   
-            )
+            async with unit_of_work(interaction, f"travel_{self.method}_vehicle") as uow:
+                vehicles = await get_user_vehicles(pool, user_id, uow=uow)
+
+                # Get user's current location (handle_travel_with_vehicle reuses this row)
+                user = await get_user(pool, user_id, uow=uow)
+                user_location = user.get("current_location") if user else None
+
+                # ✅ Use proper travel handler (enforces last_used_vehicle, breakdowns, updates)
+                from Bot_commands.travel_command import handle_travel_with_vehicle
+
+                await handle_travel_with_vehicle(
+                    interaction=interaction,
+                    vehicle=self.vehicle,
+                    method=self.method,
+                    user_travel_location=self.user_travel_location,
+                    previous_location=user_location,
+                    vehicles=vehicles   
+                )
 
 
         except Exception:
@@ -540,9 +474,9 @@ class VehicleUseView(View):
             self.add_item(VehicleUseButton(vehicle, method, user_id, user_travel_location))
 
     @classmethod
-    async def create(cls, user_id: int, vehicles: list, method: str, user_travel_location: int):
-        pool = globals.pool
-        user = await get_user(pool, user_id)
+    async def create(cls, user_id: int, vehicles: list, method: str, user_travel_location: int, uow=None):
+        pool = get_pool()
+        user = await get_user(pool, user_id, uow=uow)
         current_location = user.get("current_location")
 
 